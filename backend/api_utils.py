@@ -3,16 +3,29 @@ API utilities for interacting with the Dispatcharr API.
 
 This module provides authentication, request handling, and helper functions
 for communicating with the Dispatcharr API endpoints.
+
+All requests go through a single pooled ``requests.Session``. Concurrent
+work (pagination, bulk channel updates) uses thread pools that share this
+session, so there is one HTTP client and one connection pool for both
+serial and parallel code paths.
 """
 
 import os
 import json
+import base64
 import logging
 import sys
-from typing import Dict, List, Optional, Any
+import time
+import math
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, Iterator, List, Optional, Any, Tuple
+import orjson
 import requests
 from pathlib import Path
 from dotenv import load_dotenv, set_key
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 env_path = Path('.') / '.env'
 
@@ -21,15 +34,207 @@ env_path = Path('.') / '.env'
 if env_path.exists():
     load_dotenv(dotenv_path=env_path)
 
+# Shared HTTP session so every call to Dispatcharr reuses pooled
+# keep-alive connections instead of opening a new TCP/TLS connection.
+_SESSION = requests.Session()
+_SESSION.headers.update({
+    "Accept": "application/json",
+    "Content-Type": "application/json"
+})
+# Transient failures (429/5xx, connection errors) are retried here with
+# exponential backoff, honoring Retry-After. POST is not retried since
+# creating channels is not idempotent. 401 is handled by _request(),
+# which needs to swap the token. The final response is returned rather
+# than raised so callers still see the server's error body.
+_RETRY_POLICY = Retry(
+    total=5,
+    backoff_factor=0.5,
+    status_forcelist=[429, 500, 502, 503, 504],
+    allowed_methods=frozenset(["GET", "PATCH"]),
+    respect_retry_after_header=True,
+    raise_on_status=False
+)
+_ADAPTER = HTTPAdapter(
+    pool_connections=10,
+    pool_maxsize=50,
+    max_retries=_RETRY_POLICY
+)
+_SESSION.mount("http://", _ADAPTER)
+_SESSION.mount("https://", _ADAPTER)
+
+
+# Cached auth headers so the token is not re-validated with an extra
+# HTTP call on every request. Invalidated on 401 via _refresh_token().
+_cached_headers: Optional[Dict[str, str]] = None
+_cached_token_exp: float = 0.0
+# Serializes logins so concurrent 401s trigger a single token refresh
+_LOGIN_LOCK = threading.Lock()
+
+# Endpoint paths relative to the Dispatcharr base URL
+_EP_TOKEN = "/api/accounts/token/"
+_EP_CHANNELS = "/api/channels/channels/"
+_EP_CHANNEL = _EP_CHANNELS + "{}/"
+_EP_CHANNEL_STREAMS = _EP_CHANNEL + "streams/"
+_EP_CHANNEL_FROM_STREAM = _EP_CHANNELS + "from-stream/"
+_EP_STREAMS = "/api/channels/streams/"
+_EP_STREAMS_BY_IDS = _EP_STREAMS + "by-ids/"
+_EP_M3U = "/api/m3u/"
+_EP_M3U_ACCOUNTS = _EP_M3U + "accounts/"
+_EP_M3U_REFRESH = _EP_M3U + "refresh/"
+_EP_M3U_REFRESH_ACCOUNT = _EP_M3U_REFRESH + "{}/"
+
+# Page size and number of parallel page fetches used by get_streams()
+_STREAMS_PAGE_SIZE = 100
+_STREAMS_PAGE_WORKERS = 8
+
+# Number of stream IDs sent per request by fetch_streams_by_ids()
+_STREAMS_BY_IDS_CHUNK = 100
+
+# Number of channels updated concurrently by the bulk helpers
+_BULK_UPDATE_WORKERS = 8
+
+# Short-lived cache for read-only endpoints. Concurrent callers of the
+# same URL share a single in-flight request. Mutating helpers evict the
+# affected URLs via cache_clear().
+_READ_CACHE_TTL = 30
+_RESPONSE_CACHE: Dict[str, Tuple[float, Any]] = {}
+_INFLIGHT: Dict[str, Future] = {}
+_CACHE_LOCK = threading.Lock()
+_cache_generation = 0
+
+# Last ETag and body per URL for conditional GETs; a 304 response
+# reuses the stored body with no transfer or JSON decoding
+_ETAG_CACHE: Dict[str, Tuple[str, Any]] = {}
+
+# Seconds before the JWT expiry at which the token is proactively
+# refreshed, so requests never go out with an about-to-expire token
+_TOKEN_EXPIRY_MARGIN = 60
+# Cache lifetime for tokens whose expiry cannot be decoded
+_DEFAULT_TOKEN_TTL = 300
+
+
+class _TokenBucket:
+    """
+    Thread-safe token bucket limiting the rate of outgoing API requests.
+    
+    Callers reserve a token under the lock and sleep outside of it, so
+    concurrent threads are spaced out evenly instead of bursting.
+    """
+    
+    def __init__(self, rate: float):
+        """
+        Initialize the bucket.
+        
+        Args:
+            rate: Requests per second; 0 or less disables limiting
+        """
+        self.rate = rate
+        self.capacity = max(1.0, rate)
+        self.tokens = self.capacity
+        self.last = time.monotonic()
+        self.lock = threading.Lock()
+    
+    def acquire(self) -> None:
+        """Block until a request may be sent."""
+        if self.rate <= 0:
+            return
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(
+                self.capacity, self.tokens + (now - self.last) * self.rate
+            )
+            self.last = now
+            self.tokens -= 1
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+        if wait > 0:
+            time.sleep(wait)
+
+
+# (connect, read) timeouts applied to every Dispatcharr request so a
+# stalled server can't pin worker threads indefinitely. Timed-out
+# connects (and reads on GET/PATCH) are retried by the adapter.
+_TIMEOUT = (
+    float(os.getenv("DISPATCHARR_CONNECT_TIMEOUT", "3")),
+    float(os.getenv("DISPATCHARR_READ_TIMEOUT", "30"))
+)
+
+# Maximum requests per second sent to Dispatcharr (0 disables the limit).
+# 429 responses are retried by _RETRY_POLICY, honoring Retry-After.
+_RATE_LIMITER = _TokenBucket(float(os.getenv("DISPATCHARR_RPS", "10")))
+
+
+def close() -> None:
+    """
+    Close the shared HTTP session and release pooled connections.
+    """
+    _SESSION.close()
+
 
 def _get_base_url() -> Optional[str]:
     """
     Get the base URL from environment variables.
     
+    Read on every call rather than at import time because the URL can
+    be configured after startup. A trailing slash is stripped so it
+    joins cleanly with the endpoint paths.
+    
     Returns:
         Optional[str]: The Dispatcharr base URL or None if not set.
     """
-    return os.getenv("DISPATCHARR_BASE_URL")
+    base_url = os.getenv("DISPATCHARR_BASE_URL")
+    return base_url.rstrip('/') if base_url else base_url
+
+def _decode_token_exp(token: str) -> Optional[float]:
+    """
+    Decode the ``exp`` claim of a JWT without verifying its signature.
+    
+    Args:
+        token: The authentication token to inspect
+        
+    Returns:
+        Optional[float]: Expiry as a UNIX timestamp, or None if the token
+            is not a JWT or carries no ``exp`` claim.
+    """
+    try:
+        payload = token.split('.')[1]
+        payload += '=' * (-len(payload) % 4)
+        exp = json.loads(base64.urlsafe_b64decode(payload)).get('exp')
+        return float(exp) if exp is not None else None
+    except (IndexError, ValueError, TypeError, AttributeError):
+        return None
+
+def _cache_auth_headers(
+    token: str,
+    exp: Optional[float] = None,
+    margin: float = _TOKEN_EXPIRY_MARGIN
+) -> Dict[str, str]:
+    """
+    Build the auth headers for a token and cache them until expiry.
+    
+    Args:
+        token: The authentication token
+        exp: JWT expiry timestamp if already decoded
+        margin: Seconds before expiry at which the cache entry lapses
+        
+    Returns:
+        Dict[str, str]: Dictionary containing authorization headers.
+    """
+    global _cached_headers, _cached_token_exp
+    if exp is None:
+        exp = _decode_token_exp(token)
+    if exp is not None:
+        ttl = exp - time.time() - margin
+    else:
+        ttl = _DEFAULT_TOKEN_TTL
+    _cached_headers = {"Authorization": f"Bearer {token}"}
+    _cached_token_exp = time.monotonic() + ttl
+    return _cached_headers
+
+def _invalidate_auth_cache() -> None:
+    """Drop the cached auth headers so the next request re-reads the token."""
+    global _cached_headers, _cached_token_exp
+    _cached_headers = None
+    _cached_token_exp = 0.0
 
 def _validate_token(token: str) -> bool:
     """
@@ -47,13 +252,10 @@ def _validate_token(token: str) -> bool:
     
     try:
         # Make a lightweight API call to validate token
-        test_url = f"{base_url}/api/channels/channels/"
-        headers = {
-            "Authorization": f"Bearer {token}",
-            "Accept": "application/json",
-            "Content-Type": "application/json"
-        }
-        resp = requests.get(test_url, headers=headers, timeout=5, params={'page_size': 1})
+        test_url = f"{base_url}{_EP_CHANNELS}"
+        headers = {"Authorization": f"Bearer {token}"}
+        _RATE_LIMITER.acquire()
+        resp = _SESSION.get(test_url, headers=headers, timeout=5, params={'page_size': 1})
         return resp.status_code == 200
     except Exception:
         return False
@@ -80,27 +282,34 @@ def login() -> bool:
         )
         return False
 
-    login_url = f"{base_url}/api/accounts/token/"
+    login_url = f"{base_url}{_EP_TOKEN}"
     logging.info(f"Attempting to log in to {base_url}...")
 
     try:
-        resp = requests.post(
+        _RATE_LIMITER.acquire()
+        resp = _SESSION.post(
             login_url,
-            headers={"Content-Type": "application/json"},
-            json={"username": username, "password": password}
+            json={"username": username, "password": password},
+            timeout=_TIMEOUT
         )
         resp.raise_for_status()
-        data = resp.json()
+        data = orjson.loads(resp.content)
         token = data.get("access") or data.get("token")
 
         if token:
-            # Save token to .env if exists, else store in memory
+            _cache_auth_headers(token)
+            # Save token to .env if exists, else store in memory.
+            # The environment always holds the current token, so callers
+            # don't need to re-read .env, and .env is only rewritten when
+            # the token actually changed.
+            token_changed = os.environ.get("DISPATCHARR_TOKEN") != token
+            os.environ["DISPATCHARR_TOKEN"] = token
             if env_path.exists():
-                set_key(env_path, "DISPATCHARR_TOKEN", token)
+                if token_changed:
+                    set_key(env_path, "DISPATCHARR_TOKEN", token)
                 logging.info("Login successful. Token saved.")
             else:
                 # Token needs refresh on restart when no .env file
-                os.environ["DISPATCHARR_TOKEN"] = token
                 logging.info(
                     "Login successful. Token stored in memory."
                 )
@@ -125,7 +334,8 @@ def _get_auth_headers() -> Dict[str, str]:
     """
     Get authorization headers for API requests.
     
-    Retrieves the authentication token from environment variables.
+    Returns cached headers while the token is unexpired. Otherwise
+    retrieves the authentication token from environment variables.
     If no token is found or token is invalid, attempts to log in first.
     
     Returns:
@@ -134,16 +344,35 @@ def _get_auth_headers() -> Dict[str, str]:
     Raises:
         SystemExit: If login fails or token cannot be retrieved.
     """
+    if _cached_headers and time.monotonic() < _cached_token_exp:
+        return _cached_headers
+    
     current_token = os.getenv("DISPATCHARR_TOKEN")
     
-    # If token exists, validate it before using
-    if current_token and _validate_token(current_token):
-        logging.debug("Using existing valid token")
-        return {
-            "Authorization": f"Bearer {current_token}",
-            "Accept": "application/json",
-            "Content-Type": "application/json"
-        }
+    # A JWT carries its own expiry, so it can be trusted without an
+    # extra validation request; 401 responses still trigger a refresh.
+    # Opaque tokens are validated once and then cached.
+    if current_token:
+        exp = _decode_token_exp(current_token)
+        if exp is not None:
+            if exp - _TOKEN_EXPIRY_MARGIN > time.time():
+                logging.debug("Using existing unexpired token")
+                return _cache_auth_headers(current_token, exp)
+            if exp > time.time():
+                # Close to expiry: refresh before any request sees a 401
+                new_token = _refresh_token()
+                if new_token:
+                    return {"Authorization": f"Bearer {new_token}"}
+                # Keep using the current token until it actually expires;
+                # a 401 will still trigger the reactive refresh path
+                logging.warning(
+                    "Proactive token refresh failed; using current token "
+                    "until it expires"
+                )
+                return _cache_auth_headers(current_token, exp, margin=0)
+        elif _validate_token(current_token):
+            logging.debug("Using existing valid token")
+            return _cache_auth_headers(current_token)
     
     # Token is missing or invalid, need to login
     if current_token:
@@ -151,50 +380,126 @@ def _get_auth_headers() -> Dict[str, str]:
     else:
         logging.info("DISPATCHARR_TOKEN not found. Attempting to log in...")
     
-    if login():
-        # Reload from .env file only if it exists
-        if env_path.exists():
-            load_dotenv(dotenv_path=env_path, override=True)
-        current_token = os.getenv("DISPATCHARR_TOKEN")
-        if not current_token:
+    with _LOGIN_LOCK:
+        # Another thread may have logged in while this one waited
+        if _cached_headers and time.monotonic() < _cached_token_exp:
+            return _cached_headers
+        
+        if login():
+            current_token = os.getenv("DISPATCHARR_TOKEN")
+            if not current_token:
+                logging.error(
+                    "Login succeeded, but token not found. Aborting."
+                )
+                sys.exit(1)
+        else:
             logging.error(
-                "Login succeeded, but token not found. Aborting."
+                "Login failed. Check credentials. Aborting."
             )
             sys.exit(1)
-    else:
-        logging.error(
-            "Login failed. Check credentials. Aborting."
-        )
-        sys.exit(1)
 
-    return {
-        "Authorization": f"Bearer {current_token}",
-        "Accept": "application/json",
-        "Content-Type": "application/json"
-    }
+        return _cache_auth_headers(current_token)
 
-def _refresh_token() -> bool:
+def _refresh_token() -> Optional[str]:
     """
     Refresh the authentication token.
     
     Attempts to refresh the authentication token by calling the login
-    function. If successful, reloads environment variables.
+    function. Concurrent refreshes are coalesced: threads that hit a 401
+    at the same time wait for the first refresh and reuse its token.
     
     Returns:
-        bool: True if refresh successful, False otherwise.
-    """
-    logging.info("Token expired or invalid. Attempting to refresh...")
-    if login():
-        # Reload from .env file only if it exists
-        if env_path.exists():
-            load_dotenv(dotenv_path=env_path, override=True)
-        logging.info("Token refreshed successfully.")
-        return True
-    else:
+        Optional[str]: The new token if refresh successful, None otherwise.
+    """
+    stale_headers = _cached_headers
+    with _LOGIN_LOCK:
+        if (
+            _cached_headers is not None
+            and _cached_headers is not stale_headers
+            and time.monotonic() < _cached_token_exp
+        ):
+            logging.debug("Token already refreshed by another request")
+            return os.getenv("DISPATCHARR_TOKEN")
+        
+        logging.info("Token expired or invalid. Attempting to refresh...")
+        _invalidate_auth_cache()
+        if login():
+            new_token = os.getenv("DISPATCHARR_TOKEN")
+            if new_token:
+                _cache_auth_headers(new_token)
+                logging.info("Token refreshed successfully.")
+                return new_token
         logging.error("Token refresh failed.")
-        return False
+        return None
 
-def fetch_data_from_url(url: str) -> Optional[Any]:
+def _request(
+    method: str,
+    url: str,
+    headers: Optional[Dict[str, str]] = None,
+    **kwargs: Any
+) -> requests.Response:
+    """
+    Send an authenticated request to Dispatcharr.
+    
+    Single chokepoint for API calls: waits for the rate limiter, adds the
+    auth headers and timeout, and on a 401 refreshes the token and
+    retries once with the new token.
+    
+    Parameters:
+        method (str): HTTP method.
+        url (str): The URL to send the request to.
+        headers (Optional[Dict[str, str]]): Extra request headers.
+        **kwargs: Passed through to the session request.
+        
+    Returns:
+        requests.Response: The response object (2xx or 304).
+        
+    Raises:
+        requests.exceptions.RequestException: If request fails.
+    """
+    extra_headers = headers or {}
+    _RATE_LIMITER.acquire()
+    resp = _SESSION.request(
+        method, url, headers={**_get_auth_headers(), **extra_headers},
+        timeout=_TIMEOUT, **kwargs
+    )
+    if resp.status_code == 401:
+        new_token = _refresh_token()
+        if new_token:
+            logging.info(f"Retrying {method} request with new token...")
+            _RATE_LIMITER.acquire()
+            resp = _SESSION.request(
+                method, url,
+                headers={
+                    **extra_headers,
+                    "Authorization": f"Bearer {new_token}"
+                },
+                timeout=_TIMEOUT, **kwargs
+            )
+    resp.raise_for_status()
+    return resp
+
+def _load_etag_file(path: Path) -> Optional[Tuple[str, Any]]:
+    """Read an (ETag, body) pair saved by _store_etag_file, if any."""
+    try:
+        saved = orjson.loads(path.read_bytes())
+        return saved["etag"], saved["body"]
+    except (OSError, orjson.JSONDecodeError, KeyError, TypeError):
+        return None
+
+def _store_etag_file(path: Path, etag: str, data: Any) -> None:
+    """Atomically save an ETag and its body so later runs can revalidate."""
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path.write_bytes(orjson.dumps({"etag": etag, "body": data}))
+        os.replace(tmp_path, path)
+    except (OSError, TypeError) as e:
+        logging.warning(f"Could not save response cache {path}: {e}")
+
+def fetch_data_from_url(
+    url: str, use_etag: bool = False, etag_file: Optional[Path] = None
+) -> Optional[Any]:
     """
     Fetch data from a given URL with authentication and retry logic.
     
@@ -204,29 +509,71 @@ def fetch_data_from_url(url: str) -> Optional[Any]:
     
     Parameters:
         url (str): The URL to fetch data from.
+        use_etag (bool): Send If-None-Match with the last ETag seen for
+            this URL and reuse the stored body on 304 Not Modified.
+        etag_file (Optional[Path]): Also keep the ETag and body in this
+            file, so separate processes (e.g. CLI runs) can revalidate
+            instead of downloading again. Implies use_etag.
         
     Returns:
         Optional[Any]: JSON response data if successful, None otherwise.
     """
+    use_etag = use_etag or etag_file is not None
+    cached = _ETAG_CACHE.get(url) if use_etag else None
+    if cached is None and etag_file is not None:
+        cached = _load_etag_file(etag_file)
     try:
-        resp = requests.get(url, headers=_get_auth_headers())
-        resp.raise_for_status()
-        return resp.json()
-    except requests.exceptions.HTTPError as e:
-        if e.response.status_code == 401:
-            if _refresh_token():
-                logging.info("Retrying request with new token...")
-                resp = requests.get(url, headers=_get_auth_headers())
-                resp.raise_for_status()
-                return resp.json()
-            else:
-                return None
-        else:
-            logging.error(f"Error fetching data from {url}: {e}")
-            return None
+        resp = _request(
+            "GET", url,
+            headers={"If-None-Match": cached[0]} if cached else None
+        )
+        if cached and resp.status_code == 304:
+            return cached[1]
+        data = orjson.loads(resp.content)
+        if use_etag and resp.headers.get("ETag"):
+            _ETAG_CACHE[url] = (resp.headers["ETag"], data)
+            if etag_file is not None:
+                _store_etag_file(etag_file, resp.headers["ETag"], data)
+        return data
+    except requests.exceptions.Timeout as e:
+        logging.error(f"Timed out fetching data from {url}: {e}")
+        return None
     except requests.exceptions.RequestException as e:
         logging.error(f"Error fetching data from {url}: {e}")
         return None
+    except orjson.JSONDecodeError as e:
+        logging.error(f"Invalid JSON response from {url}: {e}")
+        return None
+
+def _send_json(
+    method: str, url: str, payload: Dict[str, Any], action: str
+) -> requests.Response:
+    """
+    Send a JSON body with _request() and log failures.
+    
+    Parameters:
+        method (str): HTTP method.
+        url (str): The URL to send the request to.
+        payload (Dict[str, Any]): The JSON payload to send.
+        action (str): Verb used in error messages, e.g. "patching".
+        
+    Returns:
+        requests.Response: The response object from the request.
+        
+    Raises:
+        requests.exceptions.RequestException: If request fails.
+    """
+    try:
+        return _request(method, url, data=orjson.dumps(payload))
+    except requests.exceptions.HTTPError as e:
+        logging.error(f"Error {action} data to {url}: {e.response.text}")
+        raise
+    except requests.exceptions.Timeout as e:
+        logging.error(f"Timed out {action} data to {url}: {e}")
+        raise
+    except requests.exceptions.RequestException as e:
+        logging.error(f"Error {action} data to {url}: {e}")
+        raise
 
 def patch_request(url: str, payload: Dict[str, Any]) -> requests.Response:
     """
@@ -246,31 +593,7 @@ def patch_request(url: str, payload: Dict[str, Any]) -> requests.Response:
     Raises:
         requests.exceptions.RequestException: If request fails.
     """
-    try:
-        resp = requests.patch(
-            url, json=payload, headers=_get_auth_headers()
-        )
-        resp.raise_for_status()
-        return resp
-    except requests.exceptions.HTTPError as e:
-        if e.response.status_code == 401:
-            if _refresh_token():
-                logging.info("Retrying PATCH request with new token...")
-                resp = requests.patch(
-                    url, json=payload, headers=_get_auth_headers()
-                )
-                resp.raise_for_status()
-                return resp
-            else:
-                raise
-        else:
-            logging.error(
-                f"Error patching data to {url}: {e.response.text}"
-            )
-            raise
-    except requests.exceptions.RequestException as e:
-        logging.error(f"Error patching data to {url}: {e}")
-        raise
+    return _send_json("PATCH", url, payload, "patching")
 
 def post_request(url: str, payload: Dict[str, Any]) -> requests.Response:
     """
@@ -290,31 +613,71 @@ def post_request(url: str, payload: Dict[str, Any]) -> requests.Response:
     Raises:
         requests.exceptions.RequestException: If request fails.
     """
-    try:
-        resp = requests.post(
-            url, json=payload, headers=_get_auth_headers()
-        )
-        resp.raise_for_status()
-        return resp
-    except requests.exceptions.HTTPError as e:
-        if e.response.status_code == 401:
-            if _refresh_token():
-                logging.info("Retrying POST request with new token...")
-                resp = requests.post(
-                    url, json=payload, headers=_get_auth_headers()
-                )
-                resp.raise_for_status()
-                return resp
-            else:
-                raise
+    return _send_json("POST", url, payload, "posting")
+
+def cache_clear(prefix: Optional[str] = None) -> None:
+    """
+    Evict cached read-only responses.
+    
+    Parameters:
+        prefix (Optional[str]): Only evict URLs starting with this
+            prefix. Evicts everything if None.
+    """
+    global _cache_generation
+    with _CACHE_LOCK:
+        _cache_generation += 1
+        if prefix is None:
+            _RESPONSE_CACHE.clear()
         else:
-            logging.error(
-                f"Error posting data to {url}: {e.response.text}"
-            )
-            raise
-    except requests.exceptions.RequestException as e:
-        logging.error(f"Error posting data to {url}: {e}")
+            for url in [u for u in _RESPONSE_CACHE if u.startswith(prefix)]:
+                del _RESPONSE_CACHE[url]
+
+def _fetch_cached(url: str, ttl: float = _READ_CACHE_TTL) -> Optional[Any]:
+    """
+    Fetch a read-only URL through the short-lived response cache.
+    
+    Returns a fresh cached response if available. Otherwise, if another
+    thread is already fetching the same URL, waits for and shares its
+    result instead of issuing a duplicate request.
+    
+    Parameters:
+        url (str): The URL to fetch data from.
+        ttl (float): Seconds to keep a successful response.
+        
+    Returns:
+        Optional[Any]: JSON response data if successful, None otherwise.
+    """
+    with _CACHE_LOCK:
+        entry = _RESPONSE_CACHE.get(url)
+        if entry and entry[0] > time.monotonic():
+            return entry[1]
+        future = _INFLIGHT.get(url)
+        if future is None:
+            future = Future()
+            _INFLIGHT[url] = future
+            generation = _cache_generation
+            owner = True
+        else:
+            owner = False
+    
+    if not owner:
+        return future.result()
+    
+    try:
+        data = fetch_data_from_url(url, use_etag=True)
+    except BaseException as e:
+        with _CACHE_LOCK:
+            _INFLIGHT.pop(url, None)
+        future.set_exception(e)
         raise
+    
+    with _CACHE_LOCK:
+        _INFLIGHT.pop(url, None)
+        # Don't store a response that an eviction raced with
+        if data is not None and generation == _cache_generation:
+            _RESPONSE_CACHE[url] = (time.monotonic() + ttl, data)
+    future.set_result(data)
+    return data
 
 def fetch_channel_streams(channel_id: int) -> Optional[List[Dict[str, Any]]]:
     """
@@ -326,11 +689,41 @@ def fetch_channel_streams(channel_id: int) -> Optional[List[Dict[str, Any]]]:
     Returns:
         Optional[List[Dict[str, Any]]]: List of stream objects or None.
     """
-    url = (
-        f"{_get_base_url()}/api/channels/channels/{channel_id}/"
-        f"streams/"
-    )
-    return fetch_data_from_url(url)
+    url = f"{_get_base_url()}{_EP_CHANNEL_STREAMS.format(channel_id)}"
+    return _fetch_cached(url)
+
+
+def fetch_streams_by_ids(
+    stream_ids: List[int], chunk_size: int = _STREAMS_BY_IDS_CHUNK
+) -> Optional[List[Dict[str, Any]]]:
+    """
+    Fetch the stream objects for many stream IDs in a few requests.
+    
+    Posts the IDs to the ``by-ids`` endpoint in chunks, so N streams
+    take ceil(N / chunk_size) requests instead of one per channel.
+    
+    Parameters:
+        stream_ids (List[int]): IDs of the streams to fetch.
+        chunk_size (int): Maximum number of IDs per request.
+        
+    Returns:
+        Optional[List[Dict[str, Any]]]: Stream objects, or None if any
+            request fails (e.g. Dispatcharr versions without the
+            endpoint).
+    """
+    url = f"{_get_base_url()}{_EP_STREAMS_BY_IDS}"
+    streams: List[Dict[str, Any]] = []
+    for start in range(0, len(stream_ids), chunk_size):
+        try:
+            resp = post_request(
+                url, {"ids": stream_ids[start:start + chunk_size]}
+            )
+            streams.extend(orjson.loads(resp.content))
+        except (requests.exceptions.RequestException,
+                orjson.JSONDecodeError) as e:
+            logging.warning(f"Could not fetch streams by ID: {e}")
+            return None
+    return streams
 
 
 def update_channel_streams(
@@ -349,11 +742,12 @@ def update_channel_streams(
     Raises:
         Exception: If the API request fails.
     """
-    url = f"{_get_base_url()}/api/channels/channels/{channel_id}/"
+    url = f"{_get_base_url()}{_EP_CHANNEL.format(channel_id)}"
     data = {"streams": stream_ids}
     
     try:
         response = patch_request(url, data)
+        cache_clear(url)
         if response and response.status_code in [200, 204]:
             logging.info(
                 f"Successfully updated channel {channel_id} with "
@@ -394,12 +788,13 @@ def refresh_m3u_playlists(
     """
     base_url = _get_base_url()
     if account_id:
-        url = f"{base_url}/api/m3u/refresh/{account_id}/"
+        url = f"{base_url}{_EP_M3U_REFRESH_ACCOUNT.format(account_id)}"
     else:
-        url = f"{base_url}/api/m3u/refresh/"
+        url = f"{base_url}{_EP_M3U_REFRESH}"
     
     try:
         resp = post_request(url, {})
+        cache_clear(f"{base_url}{_EP_M3U}")
         logging.info("M3U refresh initiated successfully")
         return resp
     except Exception as e:
@@ -415,8 +810,61 @@ def get_m3u_accounts() -> Optional[List[Dict[str, Any]]]:
         Optional[List[Dict[str, Any]]]: List of M3U account objects
             or None if request fails.
     """
-    url = f"{_get_base_url()}/api/m3u/accounts/"
-    return fetch_data_from_url(url)
+    url = f"{_get_base_url()}{_EP_M3U_ACCOUNTS}"
+    return _fetch_cached(url)
+
+def iter_streams() -> Iterator[Dict[str, Any]]:
+    """
+    Iterate over all available streams page by page.
+    
+    Yields streams as each page arrives so callers that only derive a
+    smaller structure (e.g. an ID to name map) never hold the full list
+    of stream objects in memory. Once the first page reports the total
+    count and holds the requested page size, the remaining pages are
+    fetched in parallel; otherwise the ``next`` links are followed
+    serially.
+    
+    Yields:
+        Dict[str, Any]: Stream objects in API order.
+    
+    Raises:
+        ValueError: If a page after the first cannot be fetched, so
+            callers never mistake a partial list for the full one.
+    """
+    base_url = _get_base_url()
+    url = f"{base_url}{_EP_STREAMS}?page_size={_STREAMS_PAGE_SIZE}"
+    response = fetch_data_from_url(url)
+    if isinstance(response, list):
+        yield from response
+        return
+    if not (isinstance(response, dict) and 'results' in response):
+        return
+    results = response.get('results', [])
+    yield from results
+    count = response.get('count')
+    next_url = response.get('next')
+    # Page numbers only line up with the count if the server honoured
+    # the requested page size
+    if next_url and isinstance(count, int) and len(results) == _STREAMS_PAGE_SIZE:
+        num_pages = math.ceil(count / _STREAMS_PAGE_SIZE)
+        page_urls = [f"{url}&page={page}" for page in range(2, num_pages + 1)]
+        workers = max(1, min(_STREAMS_PAGE_WORKERS, len(page_urls)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            # map() preserves page order
+            for page_url, page in zip(page_urls, executor.map(fetch_data_from_url, page_urls)):
+                if not (isinstance(page, dict) and 'results' in page):
+                    logging.error(f"Failed to fetch streams page {page_url}")
+                    raise ValueError(f"Could not fetch streams page {page_url}")
+                yield from page.get('results', [])
+    else:
+        url = next_url
+        while url:
+            response = fetch_data_from_url(url)
+            if not (isinstance(response, dict) and 'results' in response):
+                logging.error(f"Failed to fetch streams page {url}")
+                raise ValueError(f"Could not fetch streams page {url}")
+            yield from response.get('results', [])
+            url = response.get('next')
 
 def get_streams(log_result: bool = True) -> List[Dict[str, Any]]:
     """
@@ -431,27 +879,11 @@ def get_streams(log_result: bool = True) -> List[Dict[str, Any]]:
     
     Returns:
         List[Dict[str, Any]]: List of all stream objects.
-    """
-    base_url = _get_base_url()
-    # Use page_size parameter to maximize streams per request
-    url = f"{base_url}/api/channels/streams/?page_size=100"
-    
-    all_streams: List[Dict[str, Any]] = []
     
-    while url:
-        response = fetch_data_from_url(url)
-        if not response:
-            break
-        
-        # Handle paginated response
-        if isinstance(response, dict) and 'results' in response:
-            all_streams.extend(response.get('results', []))
-            url = response.get('next')  # Get next page URL
-        else:
-            # If response is list (non-paginated), use it directly
-            if isinstance(response, list):
-                all_streams.extend(response)
-            break
+    Raises:
+        ValueError: If a page after the first cannot be fetched.
+    """
+    all_streams: List[Dict[str, Any]] = list(iter_streams())
     
     if log_result:
         logging.info(f"Fetched {len(all_streams)} total streams")
@@ -472,7 +904,7 @@ def has_custom_streams() -> bool:
     
     # Try filtering by is_custom parameter first (if API supports it)
     # This would be the most efficient approach
-    url = f"{base_url}/api/channels/streams/?is_custom=true&page_size=1"
+    url = f"{base_url}{_EP_STREAMS}?is_custom=true&page_size=1"
     response = fetch_data_from_url(url)
     
     if response:
@@ -492,7 +924,7 @@ def has_custom_streams() -> bool:
     
     # Fallback: If filtering isn't supported or unclear, iterate through pages
     # Use page_size=100 for efficiency (fewer API calls)
-    url = f"{base_url}/api/channels/streams/?page_size=100"
+    url = f"{base_url}{_EP_STREAMS}?page_size={_STREAMS_PAGE_SIZE}"
     
     while url:
         response = fetch_data_from_url(url)
@@ -534,7 +966,7 @@ def create_channel_from_stream(
     Returns:
         requests.Response: The response object from the request.
     """
-    url = f"{_get_base_url()}/api/channels/channels/from-stream/"
+    url = f"{_get_base_url()}{_EP_CHANNEL_FROM_STREAM}"
     data: Dict[str, Any] = {"stream_id": stream_id}
     
     if channel_number is not None:
@@ -552,8 +984,10 @@ def add_streams_to_channel(
     """
     Add new streams to an existing channel.
     
-    Fetches the current streams for the channel, adds new streams
-    while avoiding duplicates, and updates the channel.
+    Reads the channel's current stream IDs from the channel detail
+    endpoint (IDs only, rather than the full stream objects returned by
+    the ``streams/`` endpoint), adds new streams while avoiding
+    duplicates, and updates the channel with a single PATCH.
     
     Parameters:
         channel_id (int): The ID of the channel to update.
@@ -565,21 +999,28 @@ def add_streams_to_channel(
     Raises:
         ValueError: If current streams cannot be fetched.
     """
-    # First get current streams
-    current_streams = fetch_channel_streams(channel_id)
-    if current_streams is None:
+    # First get current stream IDs
+    channel = fetch_data_from_url(
+        f"{_get_base_url()}{_EP_CHANNEL.format(channel_id)}"
+    )
+    if not isinstance(channel, dict) or 'streams' not in channel:
         raise ValueError(
             f"Could not fetch current streams for channel "
             f"{channel_id}"
         )
     
-    current_stream_ids = [s['id'] for s in current_streams]
-    
-    # Add new streams (avoid duplicates)
-    new_stream_ids = [
-        sid for sid in stream_ids
-        if sid not in current_stream_ids
+    current_stream_ids = [
+        s['id'] if isinstance(s, dict) else s
+        for s in channel['streams']
     ]
+    
+    # Add new streams (avoid duplicates, including within stream_ids)
+    seen = set(current_stream_ids)
+    new_stream_ids = []
+    for sid in stream_ids:
+        if sid not in seen:
+            seen.add(sid)
+            new_stream_ids.append(sid)
     if new_stream_ids:
         updated_streams = current_stream_ids + new_stream_ids
         update_channel_streams(channel_id, updated_streams)
@@ -593,3 +1034,79 @@ def add_streams_to_channel(
             f"No new streams to add to channel {channel_id}"
         )
         return 0
+
+
+def _run_channel_bulk(
+    func: Callable[[int, List[int]], Any],
+    mapping: Dict[int, List[int]],
+    concurrency: int
+) -> Dict[int, Any]:
+    """
+    Apply a per-channel update function to many channels concurrently.
+    
+    Parameters:
+        func: Function taking (channel_id, stream_ids).
+        mapping (Dict[int, List[int]]): Stream IDs keyed by channel ID.
+        concurrency (int): Maximum number of requests in flight.
+        
+    Returns:
+        Dict[int, Any]: Result of func keyed by channel ID. Channels whose
+            update raised are logged and left out.
+    """
+    results: Dict[int, Any] = {}
+    if not mapping:
+        return results
+    
+    workers = max(1, min(concurrency, len(mapping)))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(func, channel_id, stream_ids): channel_id
+            for channel_id, stream_ids in mapping.items()
+        }
+        for future in as_completed(futures):
+            channel_id = futures[future]
+            try:
+                results[channel_id] = future.result()
+            except Exception as e:
+                logging.error(
+                    f"Failed to update channel {channel_id} streams: {e}"
+                )
+    return results
+
+def bulk_update_channels(
+    mapping: Dict[int, List[int]],
+    concurrency: int = _BULK_UPDATE_WORKERS
+) -> Dict[int, bool]:
+    """
+    Replace the streams of many channels with bounded concurrency.
+    
+    Parameters:
+        mapping (Dict[int, List[int]]): Stream IDs keyed by channel ID.
+        concurrency (int): Maximum number of PATCH requests in flight.
+        
+    Returns:
+        Dict[int, bool]: Whether each channel was updated successfully.
+    """
+    results = _run_channel_bulk(update_channel_streams, mapping, concurrency)
+    return {
+        channel_id: bool(results.get(channel_id))
+        for channel_id in mapping
+    }
+
+def bulk_add_streams_to_channels(
+    mapping: Dict[int, List[int]],
+    concurrency: int = _BULK_UPDATE_WORKERS
+) -> Dict[int, int]:
+    """
+    Add streams to many channels with bounded concurrency.
+    
+    Parameters:
+        mapping (Dict[int, List[int]]): Stream IDs to add keyed by
+            channel ID.
+        concurrency (int): Maximum number of channels updated at once.
+        
+    Returns:
+        Dict[int, int]: Number of streams added keyed by channel ID.
+            Channels that failed are logged and omitted.
+    """
+    return _run_channel_bulk(add_streams_to_channel, mapping, concurrency)
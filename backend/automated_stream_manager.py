@@ -12,70 +12,231 @@ import json
 import logging
 import os
 import re
-import time
 import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
-from collections import defaultdict
+from typing import Dict, List, Optional, Set, Tuple
+from collections import defaultdict, deque
+
+try:
+    from re import _parser as sre_parse
+except ImportError:  # Python < 3.11
+    import sre_parse
 
 from api_utils import (
     refresh_m3u_playlists,
     get_m3u_accounts,
     get_streams,
     fetch_data_from_url,
-    add_streams_to_channel,
+    bulk_add_streams_to_channels,
     _get_base_url
 )
 
 
 
+# HTTP request/response indicators, matched in a single case-insensitive scan
+_HTTP_LOG_RE = re.compile(
+    r'http request|http response|status code'
+    r'|(?:get|post|put|delete|patch) /'
+    r'|" with'
+    r'|- - \['  # Common HTTP access log format
+    r'|werkzeug',
+    re.IGNORECASE
+)
+
 # Custom logging filter to exclude HTTP-related logs
 class HTTPLogFilter(logging.Filter):
     """Filter out HTTP-related log messages."""
     def filter(self, record):
-        message = record.getMessage().lower()
-        http_indicators = [
-            'http request',
-            'http response',
-            'status code',
-            'get /',
-            'post /',
-            'put /',
-            'delete /',
-            'patch /',
-            '" with',
-            '- - [',
-            'werkzeug',
-        ]
-        return not any(indicator in message for indicator in http_indicators)
+        return _HTTP_LOG_RE.search(record.getMessage()) is None
 
 # Setup logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 for handler in logging.root.handlers:
     handler.addFilter(HTTPLogFilter())
 
+# Numbered or named backreferences, which break when patterns are joined
+_BACKREFERENCE_RE = re.compile(r'\\[1-9]|\(\?P=')
+
+# Maximum concurrent per-channel stream list requests during discovery
+_CHANNEL_FETCH_WORKERS = 8
+
+# Seconds between automation loop checks, and the longest wait after
+# repeated failing cycles
+_AUTOMATION_CHECK_INTERVAL = 60
+_AUTOMATION_MAX_BACKOFF = 900
+
+# Maximum concurrent M3U account refresh requests
+_M3U_REFRESH_WORKERS = 8
+
+# Shortest literal worth using to prefilter streams before running a regex
+_MIN_PREFILTER_LITERAL = 3
+
+# Characters that IGNORECASE matches against ASCII letters but that
+# str.casefold() leaves distinct
+_FOLD_FIXES = str.maketrans({'\u0131': 'i', '\u0130': 'i'})
+
+
+def _fold(text: str) -> str:
+    """Fold text for the case-insensitive literal prefilter."""
+    return text.translate(_FOLD_FIXES).casefold()
+
+
+def _extract_literals(pattern: str, flags: int = 0) -> List[str]:
+    """Extract literal substrings that every match of a pattern must contain.
+    
+    Only runs of plain characters at the top level of the pattern are
+    collected; anything inside groups, alternations or repeats ends the
+    current run. Runs shorter than _MIN_PREFILTER_LITERAL are dropped.
+    
+    Args:
+        pattern: Regex pattern string
+        flags: Flags the pattern is compiled with
+        
+    Returns:
+        List of required literal substrings (empty if none could be found
+        or the pattern is invalid)
+    """
+    try:
+        parsed = sre_parse.parse(pattern, flags)
+    except re.error:
+        return []
+    
+    literals = []
+    run = []
+    for op, arg in parsed:
+        if op is sre_parse.LITERAL:
+            run.append(chr(arg))
+            continue
+        if len(run) >= _MIN_PREFILTER_LITERAL:
+            literals.append(''.join(run))
+        run = []
+    if len(run) >= _MIN_PREFILTER_LITERAL:
+        literals.append(''.join(run))
+    return literals
+
+
+# Changelog retention: entries older than this are dropped when loading,
+# and at most this many entries are kept in memory and on disk
+CHANGELOG_RETENTION_DAYS = 90
+CHANGELOG_MAX_ENTRIES = 10000
+# Rewrite the changelog file to the retained entries after this many appends
+_CHANGELOG_COMPACT_EVERY = 1000
+
+def _atomic_write_json(path: Path, obj) -> None:
+    """Write JSON to a temp file next to path and move it into place.
+    
+    A crash mid-write leaves the previous file intact instead of a
+    truncated one that would be replaced by defaults on the next load.
+    """
+    temp_path = path.with_suffix(path.suffix + '.tmp')
+    try:
+        with open(temp_path, 'w') as f:
+            json.dump(obj, f, indent=2)
+        os.replace(temp_path, path)
+    except BaseException:
+        temp_path.unlink(missing_ok=True)
+        raise
+
+
 # Configuration directory - persisted via Docker volume
 CONFIG_DIR = Path(os.environ.get('CONFIG_DIR', '/app/data'))
 
 class ChangelogManager:
-    """Manages changelog entries for stream updates."""
+    """Manages changelog entries for stream updates.
+    
+    Entries are stored as JSON Lines so adding an entry appends a single
+    line instead of rewriting the whole history. Only the most recent
+    entries within the retention period are kept; the file is compacted
+    to them periodically.
+    """
     
-    def __init__(self, changelog_file=None):
+    def __init__(self, changelog_file=None, max_entries: int = CHANGELOG_MAX_ENTRIES,
+                 retention_days: int = CHANGELOG_RETENTION_DAYS):
         if changelog_file is None:
-            changelog_file = CONFIG_DIR / "changelog.json"
+            changelog_file = CONFIG_DIR / "changelog.jsonl"
         self.changelog_file = Path(changelog_file)
-        self.changelog = self._load_changelog()
+        self.max_entries = max_entries
+        self.retention_days = retention_days
+        self._lock = threading.Lock()
+        # Loaded on first read; appended to in memory once loaded
+        self._entries: Optional[deque] = None
+        self._appends_since_compaction = 0
+        self._migrate_legacy_changelog()
     
-    def _load_changelog(self) -> List[Dict]:
-        """Load existing changelog or create empty one."""
-        if self.changelog_file.exists():
-            try:
-                with open(self.changelog_file, 'r') as f:
-                    return json.load(f)
-            except (json.JSONDecodeError, FileNotFoundError):
-                logging.warning(f"Could not load {self.changelog_file}, creating new changelog")
-        return []
+    def _migrate_legacy_changelog(self):
+        """Convert a changelog saved as a single JSON array to JSON Lines.
+        
+        Handles both a legacy ``.json`` file next to the changelog and a
+        changelog file that still holds a JSON array.
+        """
+        legacy_file = self.changelog_file
+        if not legacy_file.exists():
+            legacy_file = self.changelog_file.with_suffix('.json')
+            if not legacy_file.exists():
+                return
+        
+        try:
+            with open(legacy_file, 'r') as f:
+                if f.read(1) != '[':
+                    return
+                f.seek(0)
+                entries = json.load(f)
+        except (json.JSONDecodeError, FileNotFoundError):
+            logging.warning(f"Could not migrate {legacy_file}, creating new changelog")
+            return
+        
+        self.changelog_file.parent.mkdir(parents=True, exist_ok=True)
+        self._write_entries(entries)
+        if legacy_file != self.changelog_file:
+            legacy_file.unlink()
+        logging.info(f"Migrated {len(entries)} changelog entries from {legacy_file} to {self.changelog_file}")
+    
+    def _load_changelog(self) -> deque:
+        """Load retained changelog entries, skipping malformed and expired lines.
+        
+        The file is compacted right away if any lines were dropped.
+        """
+        entries = deque(maxlen=self.max_entries)
+        if not self.changelog_file.exists():
+            return entries
+        
+        cutoff = datetime.now() - timedelta(days=self.retention_days)
+        total = 0
+        with open(self.changelog_file, 'r') as f:
+            for line_number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                total += 1
+                try:
+                    entry = json.loads(line)
+                    if datetime.fromisoformat(entry['timestamp']) >= cutoff:
+                        entries.append(entry)
+                except json.JSONDecodeError:
+                    logging.warning(f"Skipping malformed changelog line {line_number} in {self.changelog_file}")
+                except (ValueError, KeyError, TypeError):
+                    continue
+        
+        if len(entries) < total:
+            self._write_entries(entries)
+        return entries
+    
+    def _write_entries(self, entries):
+        """Atomically replace the changelog file with the given entries."""
+        temp_file = self.changelog_file.with_suffix(self.changelog_file.suffix + '.tmp')
+        with open(temp_file, 'w') as f:
+            for entry in entries:
+                f.write(json.dumps(entry) + "\n")
+        os.replace(temp_file, self.changelog_file)
+        self._appends_since_compaction = 0
+    
+    def _get_entries(self) -> deque:
+        """Return retained entries, loading them from disk on first use."""
+        with self._lock:
+            if self._entries is None:
+                self._entries = self._load_changelog()
+            return self._entries
     
     def add_entry(self, action: str, details: Dict, timestamp: Optional[str] = None):
         """Add a new changelog entry."""
@@ -88,23 +249,26 @@ class ChangelogManager:
             "details": details
         }
         
-        self.changelog.append(entry)
-        self._save_changelog()
+        with self._lock:
+            # Ensure parent directory exists
+            self.changelog_file.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.changelog_file, 'a') as f:
+                f.write(json.dumps(entry) + "\n")
+            self._appends_since_compaction += 1
+            if self._appends_since_compaction >= _CHANGELOG_COMPACT_EVERY:
+                # Reloading drops expired entries and compacts the file
+                self._appends_since_compaction = 0
+                self._entries = self._load_changelog()
+            elif self._entries is not None:
+                self._entries.append(entry)
         logging.info(f"Changelog entry added: {action}")
     
-    def _save_changelog(self):
-        """Save changelog to file."""
-        # Ensure parent directory exists
-        self.changelog_file.parent.mkdir(parents=True, exist_ok=True)
-        with open(self.changelog_file, 'w') as f:
-            json.dump(self.changelog, f, indent=2)
-    
     def get_recent_entries(self, days: int = 7) -> List[Dict]:
         """Get changelog entries from the last N days, filtered and sorted."""
         cutoff = datetime.now() - timedelta(days=days)
         recent = []
         
-        for entry in self.changelog:
+        for entry in list(self._get_entries()):
             try:
                 entry_time = datetime.fromisoformat(entry['timestamp'])
                 if entry_time >= cutoff:
@@ -150,6 +314,14 @@ class RegexChannelMatcher:
         if config_file is None:
             config_file = CONFIG_DIR / "channel_regex_config.json"
         self.config_file = Path(config_file)
+        # (channel ID, compiled regexes) for enabled channels in config
+        # order, built lazily and dropped whenever patterns are saved or
+        # reloaded
+        self._enabled_compiled: Optional[List[Tuple[str, List[re.Pattern]]]] = None
+        # Folded literal -> channel IDs whose pattern requires it, plus the
+        # channels that have a pattern without a usable literal
+        self._literal_index: Dict[str, Set[str]] = {}
+        self._unfiltered_channels: Set[str] = set()
         self.channel_patterns = self._load_patterns()
     
     def _load_patterns(self) -> Dict:
@@ -181,8 +353,91 @@ class RegexChannelMatcher:
         """Save patterns to file."""
         # Ensure parent directory exists
         self.config_file.parent.mkdir(parents=True, exist_ok=True)
-        with open(self.config_file, 'w') as f:
-            json.dump(patterns, f, indent=2)
+        _atomic_write_json(self.config_file, patterns)
+        self._enabled_compiled = None
+    
+    def _compile_patterns(self) -> List[Tuple[str, List[re.Pattern]]]:
+        """Compile the regex patterns of every enabled channel once.
+        
+        Literal spaces in patterns are converted to flexible whitespace
+        (\\s+) so streams with different whitespace characters (non-breaking
+        spaces, tabs, double spaces, etc.) still match. Invalid patterns are
+        logged and skipped.
+        
+        A channel's valid patterns are joined into a single alternation so
+        each stream is scanned once per channel. Patterns that use
+        backreferences keep their own compiled object, since joining would
+        renumber their groups.
+        
+        Returns:
+            List of (channel ID, compiled patterns) for enabled channels,
+            in configuration order
+        """
+        case_sensitive = self.channel_patterns.get("global_settings", {}).get("case_sensitive", False)
+        flags = 0 if case_sensitive else re.IGNORECASE
+        
+        compiled = []
+        for channel_id, config in self.channel_patterns.get("patterns", {}).items():
+            if not config.get("enabled", True):
+                continue
+            
+            regexes = []
+            joinable = []
+            for pattern in config.get("regex", []):
+                search_pattern = re.sub(r' +', r'\\s+', pattern)
+                try:
+                    regex = re.compile(search_pattern, flags)
+                except re.error as e:
+                    logging.error(f"Invalid regex pattern '{pattern}' for channel {channel_id}: {e}")
+                    continue
+                if _BACKREFERENCE_RE.search(search_pattern):
+                    regexes.append(regex)
+                else:
+                    joinable.append(regex)
+            
+            if len(joinable) > 1:
+                try:
+                    combined = re.compile("|".join(f"(?:{r.pattern})" for r in joinable), flags)
+                    joinable = [combined]
+                except re.error:
+                    # e.g. inline global flags or duplicate group names
+                    pass
+            compiled.append((channel_id, joinable + regexes))
+        return compiled
+    
+    def _build_literal_index(self) -> Tuple[Dict[str, Set[str]], Set[str]]:
+        """Index channels by a literal substring each of their patterns requires.
+        
+        A stream can only match a pattern if its name contains that
+        pattern's longest required literal, so channels whose literals are
+        all absent can be rejected with plain substring checks. Literals are
+        folded, which over-approximates both case modes; the regex still
+        decides the actual match.
+        
+        Returns:
+            Tuple of (literal -> channel IDs, channel IDs that always need
+            the regex because some pattern has no usable literal)
+        """
+        case_sensitive = self.channel_patterns.get("global_settings", {}).get("case_sensitive", False)
+        flags = 0 if case_sensitive else re.IGNORECASE
+        
+        index = defaultdict(set)
+        unfiltered = set()
+        for channel_id, config in self.channel_patterns.get("patterns", {}).items():
+            if not config.get("enabled", True):
+                continue
+            for pattern in config.get("regex", []):
+                search_pattern = re.sub(r' +', r'\\s+', pattern)
+                literals = _extract_literals(search_pattern, flags)
+                if not literals:
+                    try:
+                        re.compile(search_pattern, flags)
+                    except re.error:
+                        continue  # Never matches; already logged when compiling
+                    unfiltered.add(channel_id)
+                    break
+                index[_fold(max(literals, key=len))].add(channel_id)
+        return dict(index), unfiltered
     
     def validate_regex_patterns(self, patterns: List[str]) -> Tuple[bool, Optional[str]]:
         """Validate a list of regex patterns.
@@ -240,34 +495,31 @@ class RegexChannelMatcher:
         and we need to ensure we're using the latest patterns.
         """
         self.channel_patterns = self._load_patterns()
+        self._enabled_compiled = None
         logging.debug("Reloaded regex patterns from config file")
     
     def match_stream_to_channels(self, stream_name: str) -> List[str]:
         """Match a stream name to channel IDs based on regex patterns."""
-        matches = []
-        case_sensitive = self.channel_patterns.get("global_settings", {}).get("case_sensitive", False)
+        if self._enabled_compiled is None:
+            self._enabled_compiled = self._compile_patterns()
+            self._literal_index, self._unfiltered_channels = self._build_literal_index()
         
-        search_name = stream_name if case_sensitive else stream_name.lower()
+        folded_name = _fold(stream_name)
+        candidates = set(self._unfiltered_channels)
+        for literal, channel_ids in self._literal_index.items():
+            if literal in folded_name:
+                candidates |= channel_ids
         
-        for channel_id, config in self.channel_patterns.get("patterns", {}).items():
-            if not config.get("enabled", True):
+        matches = []
+        for channel_id, regexes in self._enabled_compiled:
+            if channel_id not in candidates:
                 continue
             
-            for pattern in config.get("regex", []):
-                search_pattern = pattern if case_sensitive else pattern.lower()
-                
-                # Convert literal spaces in pattern to flexible whitespace regex (\s+)
-                # This allows matching streams with different whitespace characters
-                # (non-breaking spaces, tabs, double spaces, etc.)
-                search_pattern = re.sub(r' +', r'\\s+', search_pattern)
-                
-                try:
-                    if re.search(search_pattern, search_name):
-                        matches.append(channel_id)
-                        logging.debug(f"Stream '{stream_name}' matched channel {channel_id} with pattern '{pattern}'")
-                        break  # Only match once per channel
-                except re.error as e:
-                    logging.error(f"Invalid regex pattern '{pattern}' for channel {channel_id}: {e}")
+            for regex in regexes:
+                if regex.search(stream_name):
+                    matches.append(channel_id)
+                    logging.debug(f"Stream '{stream_name}' matched channel {channel_id} with pattern '{regex.pattern}'")
+                    break  # Only match once per channel
         
         return matches
     
@@ -284,11 +536,16 @@ class AutomatedStreamManager:
             config_file = CONFIG_DIR / "automation_config.json"
         self.config_file = Path(config_file)
         self.config = self._load_config()
+        self._playlist_update_delta = self._get_playlist_update_delta()
         self.changelog = ChangelogManager()
         self.regex_matcher = RegexChannelMatcher()
         
         self.running = False
         self.last_playlist_update = None
+        # Set to stop the automation loop; its waits return immediately
+        self._stop_event = threading.Event()
+        # (key, last update, next update) formatted for get_status()
+        self._status_times = None
     
     def _load_config(self) -> Dict:
         """Load automation configuration."""
@@ -304,6 +561,7 @@ class AutomatedStreamManager:
             "playlist_update_interval_minutes": 5,
             "enabled_m3u_accounts": [],  # Empty list means all accounts enabled
             "autostart_automation": False,  # Don't auto-start by default
+            "verify_assignments": False,  # Re-fetch channels after assigning streams
             "enabled_features": {
                 "auto_playlist_update": True,
                 "auto_stream_discovery": True,
@@ -318,8 +576,11 @@ class AutomatedStreamManager:
         """Save configuration to file."""
         # Ensure parent directory exists
         self.config_file.parent.mkdir(parents=True, exist_ok=True)
-        with open(self.config_file, 'w') as f:
-            json.dump(config, f, indent=2)
+        _atomic_write_json(self.config_file, config)
+    
+    def _get_playlist_update_delta(self) -> timedelta:
+        """Return the configured playlist update interval as a timedelta."""
+        return timedelta(minutes=self.config.get("playlist_update_interval_minutes", 5))
     
     def update_config(self, updates: Dict):
         """Update configuration with new values and apply immediately."""
@@ -352,6 +613,7 @@ class AutomatedStreamManager:
         
         # Apply the configuration update
         self.config.update(updates)
+        self._playlist_update_delta = self._get_playlist_update_delta()
         self._save_config(self.config)
         
         # Log the changes
@@ -361,8 +623,66 @@ class AutomatedStreamManager:
         else:
             logging.info("Automation configuration updated")
     
-    def refresh_playlists(self) -> bool:
-        """Refresh M3U playlists and track changes."""
+    def _refresh_m3u_accounts(self, account_ids: List[int]):
+        """Refresh several M3U accounts concurrently.
+        
+        A failing account is logged without stopping the others. If every
+        account fails, the first error is raised.
+        
+        Args:
+            account_ids: IDs of the M3U accounts to refresh
+        """
+        if not account_ids:
+            return
+        
+        def refresh(account_id):
+            logging.info(f"Refreshing M3U account {account_id}")
+            try:
+                refresh_m3u_playlists(account_id=account_id)
+                return None
+            except Exception as e:
+                logging.error(f"Failed to refresh M3U account {account_id}: {e}")
+                return e
+        
+        workers = min(_M3U_REFRESH_WORKERS, len(account_ids))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            errors = [e for e in executor.map(refresh, account_ids) if e is not None]
+        
+        if len(errors) == len(account_ids):
+            raise errors[0]
+    
+    def _mark_channels_for_checking(self, marks: Dict[int, Optional[int]]):
+        """Mark channels as updated in the stream checker and trigger a check.
+        
+        Args:
+            marks: Stream count (or None if unknown) keyed by channel ID
+        """
+        if not marks:
+            return
+        
+        stream_counts = {ch_id: count for ch_id, count in marks.items() if count is not None}
+        try:
+            from stream_checker_service import get_stream_checker_service
+            stream_checker = get_stream_checker_service()
+            stream_checker.update_tracker.mark_channels_updated(list(marks), stream_counts=stream_counts)
+            logging.info(f"Marked {len(marks)} channels for stream quality checking")
+            # Trigger immediate check instead of waiting for scheduled interval
+            stream_checker.trigger_check_updated_channels()
+        except Exception as sc_error:
+            logging.debug(f"Stream checker not available or error marking channels: {sc_error}")
+    
+    def refresh_playlists(self, now: Optional[datetime] = None,
+                          channel_marks: Optional[Dict[int, Optional[int]]] = None) -> bool:
+        """Refresh M3U playlists and track changes.
+        
+        Args:
+            now: Start time of the automation cycle, used to timestamp
+                changelog entries (defaults to the current time)
+            channel_marks: If given, channels to mark for checking are
+                added to this dict (stream count or None keyed by channel
+                ID) instead of being marked right away
+        """
+        timestamp = (now or datetime.now()).isoformat()
         try:
             if not self.config.get("enabled_features", {}).get("auto_playlist_update", True):
                 logging.info("Playlist update is disabled in configuration")
@@ -370,9 +690,11 @@ class AutomatedStreamManager:
             
             logging.info("Starting M3U playlist refresh...")
             
-            # Get streams before refresh
-            from api_utils import get_streams
-            streams_before = get_streams(log_result=False) if self.config.get("enabled_features", {}).get("changelog_tracking", True) else []
+            # Get streams before refresh. Only IDs and names are kept, so
+            # iterate page by page instead of holding every stream object.
+            from api_utils import iter_streams
+            track_changes = self.config.get("enabled_features", {}).get("changelog_tracking", True)
+            streams_before = iter_streams() if track_changes else []
             before_stream_ids = {s.get('id'): s.get('name', '') for s in streams_before if isinstance(s, dict) and s.get('id')}
             
             # Get all M3U accounts and filter out "custom" and non-active accounts
@@ -392,18 +714,14 @@ class AutomatedStreamManager:
                     # Refresh only enabled accounts (and exclude custom)
                     non_custom_ids = [acc.get('id') for acc in non_custom_accounts if acc.get('id') is not None]
                     accounts_to_refresh = [acc_id for acc_id in enabled_accounts if acc_id in non_custom_ids]
-                    for account_id in accounts_to_refresh:
-                        logging.info(f"Refreshing M3U account {account_id}")
-                        refresh_m3u_playlists(account_id=account_id)
+                    self._refresh_m3u_accounts(accounts_to_refresh)
                     if len(enabled_accounts) != len(accounts_to_refresh):
                         logging.info(f"Skipped {len(enabled_accounts) - len(accounts_to_refresh)} account(s) (custom or invalid)")
                 else:
                     # Refresh all non-custom accounts
-                    for account in non_custom_accounts:
-                        account_id = account.get('id')
-                        if account_id is not None:
-                            logging.info(f"Refreshing M3U account {account_id}")
-                            refresh_m3u_playlists(account_id=account_id)
+                    self._refresh_m3u_accounts([
+                        acc.get('id') for acc in non_custom_accounts if acc.get('id') is not None
+                    ])
                     if len(all_accounts) != len(non_custom_accounts):
                         logging.info(f"Skipped {len(all_accounts) - len(non_custom_accounts)} 'custom' account(s)")
             else:
@@ -411,30 +729,38 @@ class AutomatedStreamManager:
                 logging.warning("Could not fetch M3U accounts, refreshing all as fallback")
                 refresh_m3u_playlists()
             
-            # Get streams after refresh - log this one since it shows the final result
-            streams_after = get_streams(log_result=True) if self.config.get("enabled_features", {}).get("changelog_tracking", True) else []
-            after_stream_ids = {s.get('id'): s.get('name', '') for s in streams_after if isinstance(s, dict) and s.get('id')}
+            # Get streams after refresh - log this one since it shows the final result.
+            # Only IDs are kept, plus names for streams that are new.
+            streams_after = iter_streams() if track_changes else []
+            after_stream_ids = set()
+            added_stream_names = {}
+            for s in streams_after:
+                if isinstance(s, dict) and s.get('id'):
+                    after_stream_ids.add(s['id'])
+                    if s['id'] not in before_stream_ids:
+                        added_stream_names[s['id']] = s.get('name', '')
+            if track_changes:
+                logging.info(f"Fetched {len(after_stream_ids)} total streams")
             
             self.last_playlist_update = datetime.now()
             
             # Calculate differences
-            added_stream_ids = set(after_stream_ids.keys()) - set(before_stream_ids.keys())
-            removed_stream_ids = set(before_stream_ids.keys()) - set(after_stream_ids.keys())
+            removed_stream_ids = before_stream_ids.keys() - after_stream_ids
             
-            added_streams = [{"id": sid, "name": after_stream_ids[sid]} for sid in added_stream_ids]
+            added_streams = [{"id": sid, "name": name} for sid, name in added_stream_names.items()]
             removed_streams = [{"id": sid, "name": before_stream_ids[sid]} for sid in removed_stream_ids]
             
             
             if self.config.get("enabled_features", {}).get("changelog_tracking", True):
                 self.changelog.add_entry("playlist_refresh", {
                     "success": True,
-                    "timestamp": self.last_playlist_update.isoformat(),
+                    "timestamp": timestamp,
                     "total_streams": len(after_stream_ids),
                     "added_streams": added_streams[:50],  # Limit to first 50 for changelog size
                     "removed_streams": removed_streams[:50],  # Limit to first 50 for changelog size
                     "added_count": len(added_streams),
                     "removed_count": len(removed_streams)
-                })
+                }, timestamp=timestamp)
             
             logging.info(f"M3U playlist refresh completed successfully. Added: {len(added_streams)}, Removed: {len(removed_streams)}")
             
@@ -443,7 +769,6 @@ class AutomatedStreamManager:
             if len(added_streams) > 0 or len(removed_streams) > 0:
                 try:
                     # Get all channels that may have been affected
-                    from api_utils import fetch_data_from_url, _get_base_url
                     base_url = _get_base_url()
                     channels_data = fetch_data_from_url(f"{base_url}/api/channels/channels/")
                     
@@ -454,26 +779,17 @@ class AutomatedStreamManager:
                             channels = channels_data
                         
                         # Mark all channels for checking with stream counts for 2-hour immunity
-                        channel_ids = []
-                        stream_counts = {}
+                        marks = {}
                         for ch in channels:
                             if isinstance(ch, dict) and 'id' in ch:
-                                ch_id = ch['id']
-                                channel_ids.append(ch_id)
                                 # Get stream count if available
-                                if 'streams' in ch and isinstance(ch['streams'], list):
-                                    stream_counts[ch_id] = len(ch['streams'])
+                                streams = ch.get('streams')
+                                marks[ch['id']] = len(streams) if isinstance(streams, list) else None
                         
-                        # Try to get stream checker service and mark channels
-                        try:
-                            from stream_checker_service import get_stream_checker_service
-                            stream_checker = get_stream_checker_service()
-                            stream_checker.update_tracker.mark_channels_updated(channel_ids, stream_counts=stream_counts)
-                            logging.info(f"Marked {len(channel_ids)} channels for stream quality checking")
-                            # Trigger immediate check instead of waiting for scheduled interval
-                            stream_checker.trigger_check_updated_channels()
-                        except Exception as sc_error:
-                            logging.debug(f"Stream checker not available or error marking channels: {sc_error}")
+                        if channel_marks is not None:
+                            channel_marks.update(marks)
+                        else:
+                            self._mark_channels_for_checking(marks)
                 except Exception as ch_error:
                     logging.debug(f"Could not mark channels for stream checking: {ch_error}")
             else:
@@ -489,12 +805,47 @@ class AutomatedStreamManager:
                 self.changelog.add_entry("playlist_refresh", {
                     "success": False,
                     "error": str(e),
-                    "timestamp": datetime.now().isoformat()
-                })
+                    "timestamp": timestamp
+                }, timestamp=timestamp)
             return False
     
-    def discover_and_assign_streams(self) -> Dict[str, int]:
-        """Discover new streams and assign them to channels based on regex patterns."""
+    def _fetch_channel_streams(self, base_url: str, channel_ids: List[str]) -> Dict[str, Optional[List]]:
+        """Fetch the stream lists of several channels concurrently.
+        
+        Args:
+            base_url: Dispatcharr base URL
+            channel_ids: Channel IDs to fetch
+            
+        Returns:
+            Dict mapping each channel ID to its stream list, or None if the
+            request failed
+        """
+        if not channel_ids:
+            return {}
+        
+        def fetch(channel_id):
+            try:
+                return fetch_data_from_url(f"{base_url}/api/channels/channels/{channel_id}/streams/")
+            except Exception as e:
+                logging.warning(f"Could not fetch streams for channel {channel_id}: {e}")
+                return None
+        
+        workers = min(_CHANNEL_FETCH_WORKERS, len(channel_ids))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return dict(zip(channel_ids, executor.map(fetch, channel_ids)))
+    
+    def discover_and_assign_streams(self, now: Optional[datetime] = None,
+                                    channel_marks: Optional[Dict[int, Optional[int]]] = None) -> Dict[str, int]:
+        """Discover new streams and assign them to channels based on regex patterns.
+        
+        Args:
+            now: Start time of the automation cycle, used to timestamp
+                changelog entries (defaults to the current time)
+            channel_marks: If given, channels to mark for checking are
+                added to this dict (stream count keyed by channel ID)
+                instead of being marked right away
+        """
+        timestamp = (now or datetime.now()).isoformat()
         if not self.config.get("enabled_features", {}).get("auto_stream_discovery", True):
             logging.info("Stream discovery is disabled in configuration")
             return {}
@@ -503,6 +854,15 @@ class AutomatedStreamManager:
             # Reload patterns to ensure we have the latest changes
             self.regex_matcher.reload_patterns()
             
+            # Nothing can be assigned without an enabled pattern, so skip all API calls
+            enabled_count = sum(
+                1 for cfg in self.regex_matcher.get_patterns().get("patterns", {}).values()
+                if cfg.get("enabled", True) and cfg.get("regex")
+            )
+            if enabled_count == 0:
+                logging.info("No enabled regex patterns configured, skipping stream discovery")
+                return {}
+            
             logging.info("Starting stream discovery and assignment...")
             
             # Get all available streams (don't log, we already logged during refresh)
@@ -575,18 +935,22 @@ class AutomatedStreamManager:
                 logging.error(f"Invalid channels response format: expected list, got {type(all_channels).__name__}")
                 return {}
             
-            # Create a map of existing channel streams
-            channel_streams = {}
-            channel_names = {}  # Store channel names for changelog
+            # Validate that each channel is a dictionary
             for channel in all_channels:
-                # Validate that channel is a dictionary
                 if not isinstance(channel, dict) or 'id' not in channel:
                     logging.warning(f"Invalid channel format encountered: {type(channel).__name__} - {channel}")
-                    continue
-                    
-                channel_id = str(channel['id'])
-                channel_names[channel_id] = channel.get('name', f'Channel {channel_id}')
-                streams = fetch_data_from_url(f"{base_url}/api/channels/channels/{channel_id}/streams/")
+            
+            # Store channel names for changelog
+            channel_names = {
+                str(c['id']): c.get('name', f"Channel {c['id']}")
+                for c in all_channels
+                if isinstance(c, dict) and 'id' in c
+            }
+            
+            # Create a map of existing channel streams
+            channel_streams = {}
+            current_streams = self._fetch_channel_streams(base_url, list(channel_names))
+            for channel_id, streams in current_streams.items():
                 if streams:
                     # Validate that streams is a list and contains dictionaries
                     if isinstance(streams, list):
@@ -603,8 +967,9 @@ class AutomatedStreamManager:
                 else:
                     channel_streams[channel_id] = set()
             
-            assignments = defaultdict(list)
-            assignment_details = defaultdict(list)  # Track stream details for changelog
+            # Streams to add per channel, keyed by stream ID so a stream listed
+            # twice is only added once; values are the details for changelog
+            assignment_details = defaultdict(dict)
             assignment_count = {}
             
             # Process each stream
@@ -626,8 +991,7 @@ class AutomatedStreamManager:
                 for channel_id in matching_channels:
                     # Check if stream is already in this channel
                     if channel_id in channel_streams and stream_id not in channel_streams[channel_id]:
-                        assignments[channel_id].append(stream_id)
-                        assignment_details[channel_id].append({
+                        assignment_details[channel_id].setdefault(stream_id, {
                             "stream_id": stream_id,
                             "stream_name": stream_name
                         })
@@ -635,46 +999,49 @@ class AutomatedStreamManager:
             # Prepare detailed changelog data
             detailed_assignments = []
             
-            # Assign streams to channels
-            for channel_id, stream_ids in assignments.items():
-                if stream_ids:
-                    try:
-                        added_count = add_streams_to_channel(int(channel_id), stream_ids)
-                        assignment_count[channel_id] = added_count
-                        
-                        # Verify streams were added correctly
-                        if added_count > 0:
-                            try:
-                                time.sleep(0.5)  # Brief delay for API processing
-                                base_url = _get_base_url()
-                                updated_streams = fetch_data_from_url(f"{base_url}/api/channels/channels/{channel_id}/streams/")
-                                
-                                if updated_streams and isinstance(updated_streams, list):
-                                    updated_stream_ids = set(s.get('id') for s in updated_streams if isinstance(s, dict) and 'id' in s)
-                                    expected_stream_ids = set(stream_ids)
-                                    added_stream_ids = expected_stream_ids & updated_stream_ids
-                                    
-                                    if len(added_stream_ids) == added_count:
-                                        logging.info(f"✓ Verified: {added_count} streams successfully added to channel {channel_id} ({channel_names.get(channel_id, f'Channel {channel_id}')})")
-                                    else:
-                                        logging.warning(f"⚠ Verification mismatch for channel {channel_id}: expected {added_count} streams, found {len(added_stream_ids)} in channel")
-                                else:
-                                    logging.warning(f"⚠ Could not verify stream addition for channel {channel_id}: invalid response")
-                            except Exception as verify_error:
-                                logging.warning(f"⚠ Could not verify stream addition for channel {channel_id}: {verify_error}")
-                        
-                        # Prepare detailed assignment info
-                        channel_assignment = {
-                            "channel_id": channel_id,
-                            "channel_name": channel_names.get(channel_id, f'Channel {channel_id}'),
-                            "stream_count": added_count,
-                            "streams": assignment_details[channel_id][:20]  # Limit to first 20 for changelog
-                        }
-                        detailed_assignments.append(channel_assignment)
-                        
-                        
-                    except Exception as e:
-                        logging.error(f"Failed to assign streams to channel {channel_id}: {e}")
+            # Assign streams to channels concurrently; failures are logged
+            # by the bulk helper and left out of the results
+            added_counts = bulk_add_streams_to_channels({
+                int(channel_id): list(details)
+                for channel_id, details in assignment_details.items()
+                if details
+            })
+            
+            for channel_id, details in assignment_details.items():
+                if int(channel_id) in added_counts:
+                    added_count = added_counts[int(channel_id)]
+                    assignment_count[channel_id] = added_count
+                    
+                    # Prepare detailed assignment info
+                    channel_assignment = {
+                        "channel_id": channel_id,
+                        "channel_name": channel_names.get(channel_id, f'Channel {channel_id}'),
+                        "stream_count": added_count,
+                        "streams": list(details.values())[:20]  # Limit to first 20 for changelog
+                    }
+                    detailed_assignments.append(channel_assignment)
+            
+            changed_channels = [cid for cid, count in assignment_count.items() if count > 0]
+            
+            # Optionally verify streams were added correctly by re-fetching
+            # all changed channels at once
+            updated_streams_by_channel = {}
+            if changed_channels and self.config.get("verify_assignments", False):
+                updated_streams_by_channel = self._fetch_channel_streams(base_url, changed_channels)
+            
+            for channel_id, updated_streams in updated_streams_by_channel.items():
+                added_count = assignment_count[channel_id]
+                if updated_streams and isinstance(updated_streams, list):
+                    updated_stream_ids = {s['id'] for s in updated_streams if isinstance(s, dict) and 'id' in s}
+                    expected_stream_ids = assignment_details[channel_id].keys()
+                    added_stream_ids = expected_stream_ids & updated_stream_ids
+                    
+                    if len(added_stream_ids) == added_count:
+                        logging.info(f"✓ Verified: {added_count} streams successfully added to channel {channel_id} ({channel_names.get(channel_id, f'Channel {channel_id}')})")
+                    else:
+                        logging.warning(f"⚠ Verification mismatch for channel {channel_id}: expected {added_count} streams, found {len(added_stream_ids)} in channel")
+                else:
+                    logging.warning(f"⚠ Could not verify stream addition for channel {channel_id}: invalid response")
             
             # Add comprehensive changelog entry
             total_assigned = sum(assignment_count.values())
@@ -689,42 +1056,23 @@ class AutomatedStreamManager:
                     "channel_count": len(assignment_count),
                     "assignments": sorted_assignments[:max_channels_in_changelog],
                     "has_more_channels": len(sorted_assignments) > max_channels_in_changelog,
-                    "timestamp": datetime.now().isoformat()
-                })
+                    "timestamp": timestamp
+                }, timestamp=timestamp)
             
             logging.info(f"Stream discovery completed. Assigned {total_assigned} new streams across {len(assignment_count)} channels")
             
-            # Mark channels that received new streams for stream quality checking
-            if total_assigned > 0 and assignment_count:
-                try:
-                    # Get updated stream counts for channels that received new streams
-                    channel_ids_to_mark = []
-                    stream_counts = {}
-                    
-                    for channel_id in assignment_count.keys():
-                        if assignment_count[channel_id] > 0:
-                            channel_ids_to_mark.append(int(channel_id))
-                            # Fetch current stream count for this channel
-                            try:
-                                ch_streams = fetch_data_from_url(f"{base_url}/api/channels/channels/{channel_id}/streams/")
-                                if ch_streams and isinstance(ch_streams, list):
-                                    stream_counts[int(channel_id)] = len(ch_streams)
-                            except Exception:
-                                pass  # If we can't get count, marking will still work
-                    
-                    # Try to get stream checker service and mark channels
-                    if channel_ids_to_mark:
-                        try:
-                            from stream_checker_service import get_stream_checker_service
-                            stream_checker = get_stream_checker_service()
-                            stream_checker.update_tracker.mark_channels_updated(channel_ids_to_mark, stream_counts=stream_counts)
-                            logging.info(f"Marked {len(channel_ids_to_mark)} channels with new streams for stream quality checking")
-                            # Trigger immediate check instead of waiting for scheduled interval
-                            stream_checker.trigger_check_updated_channels()
-                        except Exception as sc_error:
-                            logging.debug(f"Stream checker not available or error marking channels: {sc_error}")
-                except Exception as mark_error:
-                    logging.debug(f"Could not mark channels for stream checking after discovery: {mark_error}")
+            # Mark channels that received new streams for stream quality checking.
+            # Trust the assignment result for stream counts: existing streams
+            # plus the ones just added.
+            marks = {
+                int(channel_id): len(channel_streams.get(channel_id, ())) + assignment_count[channel_id]
+                for channel_id in changed_channels
+            }
+            if marks:
+                if channel_marks is not None:
+                    channel_marks.update(marks)
+                else:
+                    self._mark_channels_for_checking(marks)
             
             return assignment_count
             
@@ -734,16 +1082,15 @@ class AutomatedStreamManager:
                 self.changelog.add_entry("stream_discovery", {
                     "success": False,
                     "error": str(e)
-                })
+                }, timestamp=timestamp)
             return {}
     
-    def should_run_playlist_update(self) -> bool:
+    def should_run_playlist_update(self, now: Optional[datetime] = None) -> bool:
         """Check if it's time to run playlist update."""
         if not self.last_playlist_update:
             return True
         
-        interval = timedelta(minutes=self.config.get("playlist_update_interval_minutes", 5))
-        return datetime.now() - self.last_playlist_update >= interval
+        return (now or datetime.now()) - self.last_playlist_update >= self._playlist_update_delta
     
     def run_automation_cycle(self):
         """Run one complete automation cycle."""
@@ -757,20 +1104,33 @@ class AutomatedStreamManager:
         except Exception as e:
             logging.debug(f"Could not check global action status: {e}")
         
+        # One timestamp for the whole cycle so its changelog entries agree
+        now = datetime.now()
+        
         # Only log and run if it's actually time to update
-        if not self.should_run_playlist_update():
+        if not self.should_run_playlist_update(now):
             return  # Skip silently until it's time
         
         logging.info("Starting automation cycle...")
         
-        # 1. Update playlists
-        success = self.refresh_playlists()
-        if success:
-            # Small delay to allow playlist processing
-            time.sleep(10)
-            
-            # 2. Discover and assign new streams
-            assignments = self.discover_and_assign_streams()
+        # Channels to mark for checking, collected from both phases so the
+        # stream checker is notified once; later counts win
+        channel_marks = {}
+        
+        try:
+            # 1. Update playlists
+            success = self.refresh_playlists(now=now, channel_marks=channel_marks)
+            if success:
+                # Small delay to allow playlist processing, cut short on stop
+                if self._stop_event.wait(10):
+                    return
+                
+                # 2. Discover and assign new streams
+                assignments = self.discover_and_assign_streams(now=now, channel_marks=channel_marks)
+        finally:
+            # The changelog diff is already taken, so marks collected before
+            # a stop would otherwise never be queued
+            self._mark_channels_for_checking(channel_marks)
         
         logging.info("Automation cycle completed")
     def start_automation(self):
@@ -779,20 +1139,27 @@ class AutomatedStreamManager:
             logging.warning("Automation is already running")
             return
         
+        self._stop_event.clear()
         self.running = True
         logging.info("Starting automated stream management...")
         
         def automation_loop():
-            while self.running:
+            consecutive_failures = 0
+            while not self._stop_event.is_set():
+                delay = _AUTOMATION_CHECK_INTERVAL
                 try:
                     self.run_automation_cycle()
-                    
-                    # Sleep for a minute before checking again
-                    time.sleep(60)
-                    
+                    consecutive_failures = 0
                 except Exception as e:
-                    logging.error(f"Error in automation loop: {e}")
-                    time.sleep(60)  # Continue after error
+                    # Back off exponentially while cycles keep failing
+                    consecutive_failures += 1
+                    delay = min(_AUTOMATION_CHECK_INTERVAL * 2 ** consecutive_failures,
+                                _AUTOMATION_MAX_BACKOFF)
+                    logging.error(f"Error in automation loop: {e} (retrying in {delay}s)")
+                
+                # Wait before checking again, waking up on stop
+                if self._stop_event.wait(delay):
+                    break
         
         self.automation_thread = threading.Thread(target=automation_loop, daemon=True)
         self.automation_thread.start()
@@ -804,6 +1171,7 @@ class AutomatedStreamManager:
             return
         
         self.running = False
+        self._stop_event.set()
         logging.info("Stopping automated stream management...")
         
         if hasattr(self, 'automation_thread'):
@@ -813,12 +1181,21 @@ class AutomatedStreamManager:
     
     def get_status(self) -> Dict:
         """Get current status of the automation system."""
+        # The formatted times only change with the last update or the interval
+        key = (self.last_playlist_update, self._playlist_update_delta)
+        cached = self._status_times
+        if cached is None or cached[0] != key:
+            if self.last_playlist_update:
+                last_update = self.last_playlist_update.isoformat()
+                next_update = (self.last_playlist_update + key[1]).isoformat()
+            else:
+                last_update, next_update = None, "immediate"
+            cached = self._status_times = (key, last_update, next_update)
+        
         return {
             "running": self.running,
-            "last_playlist_update": self.last_playlist_update.isoformat() if self.last_playlist_update else None,
-            "next_playlist_update": (
-                self.last_playlist_update + timedelta(minutes=self.config.get("playlist_update_interval_minutes", 5))
-            ).isoformat() if self.last_playlist_update else "immediate",
+            "last_playlist_update": cached[1],
+            "next_playlist_update": cached[2],
             "config": self.config,
             "recent_changelog": self.changelog.get_recent_entries(7)
         }
\ No newline at end of file
@@ -51,11 +51,10 @@ def create_default_configs() -> None:
             json.dump(config, f, indent=2)
         print(f"Created {regex_path}")
 
-    # Create empty changelog
-    changelog_path = CONFIG_DIR / 'changelog.json'
-    if not changelog_path.exists():
-        with open(changelog_path, 'w', encoding='utf-8') as f:
-            json.dump([], f)
+    # Create empty changelog (a legacy changelog.json is migrated on startup)
+    changelog_path = CONFIG_DIR / 'changelog.jsonl'
+    if not changelog_path.exists() and not changelog_path.with_suffix('.json').exists():
+        changelog_path.touch()
         print(f"Created {changelog_path}")
 
     # Create default webhook config
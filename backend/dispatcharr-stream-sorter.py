@@ -11,19 +11,29 @@ import sys
 import threading
 import time
 from collections import defaultdict
-# Removed ThreadPoolExecutor - now using synchronous processing
-# from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
+from itertools import zip_longest
 from pathlib import Path
 from urllib.parse import urlparse
 
+import numpy as np
+import orjson
 import pandas as pd
 from dotenv import load_dotenv
 
+try:
+    import pyarrow  # noqa: F401
+    _CSV_ENGINE = 'pyarrow'  # multi-threaded Arrow CSV reader
+except ImportError:
+    _CSV_ENGINE = 'c'
+
 from api_utils import (
     _get_base_url,
     fetch_channel_streams,
     fetch_data_from_url,
+    fetch_streams_by_ids,
     login,
     update_channel_streams,
     patch_request,
@@ -41,7 +51,11 @@ logging.basicConfig(
 # --- Progress Tracking ---
 class StreamCheckProgress:
     """Manages progress tracking for stream analysis operations."""
-    
+
+    # Progress is advisory, so it is written at most every _MIN_INTERVAL
+    # seconds unless it moved by at least a percent or the run finished.
+    _MIN_INTERVAL = 0.5
+
     def __init__(self, progress_file=None):
         if progress_file is None:
             # Use CONFIG_DIR if available (Docker environment), otherwise fall back to local csv directory
@@ -49,14 +63,23 @@ class StreamCheckProgress:
             progress_file = Path(config_dir) / 'csv' / 'stream_check_progress.json'
         self.progress_file = Path(progress_file)
         self.lock = threading.Lock()
-        
+        self._last_write = 0.0
+        self._last_percent = -1.0
+
     def update(self, current, total, current_stream_name=''):
         """Update progress information."""
+        percentage = round((current / total * 100) if total > 0 else 0, 1)
         with self.lock:
+            now = time.monotonic()
+            if (current < total
+                    and percentage - self._last_percent < 1.0
+                    and now - self._last_write < self._MIN_INTERVAL):
+                return
+
             progress_data = {
                 'current': current,
                 'total': total,
-                'percentage': round((current / total * 100) if total > 0 else 0, 1),
+                'percentage': percentage,
                 'current_stream_name': current_stream_name,
                 'timestamp': datetime.now().isoformat(),
                 'in_progress': current < total
@@ -65,18 +88,22 @@ class StreamCheckProgress:
             # Ensure directory exists
             self.progress_file.parent.mkdir(parents=True, exist_ok=True)
             
-            # Write progress to file with explicit flush
+            # Write to a temporary file and swap it in so readers never see a partial file
+            tmp_file = self.progress_file.with_suffix('.tmp')
             try:
-                with open(self.progress_file, 'w') as f:
-                    json.dump(progress_data, f)
-                    f.flush()  # Ensure data is written to disk immediately
-                    os.fsync(f.fileno())  # Force write to disk
+                with open(tmp_file, 'wb') as f:
+                    f.write(orjson.dumps(progress_data))
+                os.replace(tmp_file, self.progress_file)
+                self._last_write = now
+                self._last_percent = percentage
             except Exception as e:
                 logging.warning(f"Failed to write progress file: {e}")
     
     def clear(self):
         """Clear progress tracking (analysis complete)."""
         with self.lock:
+            self._last_write = 0.0
+            self._last_percent = -1.0
             if self.progress_file.exists():
                 try:
                     self.progress_file.unlink()
@@ -96,6 +123,49 @@ def load_config():
 
 # --- Main Functionality ---
 
+def _write_rows_csv(path, rows, columns):
+    """Writes rows to a CSV file with one batched writerows() call.
+    
+    writerows() loops over the rows in C; for the plain values written
+    here it is faster than building a DataFrame for to_csv().
+    """
+    with open(path, mode="w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(columns)
+        writer.writerows(rows)
+
+def _fetch_streams_for_channels(channels, parallelism):
+    """Returns the stream objects of each channel, in channel order.
+    
+    Channel objects list their stream IDs, so all streams are fetched with
+    a few batched by-ids requests. If that is not possible (older
+    Dispatcharr versions), each channel's streams are requested on their
+    own, overlapping up to `parallelism` requests.
+    """
+    stream_id_lists = [
+        [s['id'] if isinstance(s, dict) else s for s in ch.get('streams')]
+        if isinstance(ch.get('streams'), list) else None
+        for ch in channels
+    ]
+    if all(ids is not None for ids in stream_id_lists):
+        unique_ids = list(dict.fromkeys(sid for ids in stream_id_lists for sid in ids))
+        streams = fetch_streams_by_ids(unique_ids) if unique_ids else []
+        if streams is not None:
+            logging.info(f"Fetched {len(streams)} streams in batched requests")
+            streams_by_id = {stream.get('id'): stream for stream in streams}
+            return [
+                [streams_by_id[sid] for sid in ids if sid in streams_by_id]
+                for ids in stream_id_lists
+            ]
+        logging.info("Batched stream lookup unavailable, fetching streams per channel")
+
+    with ThreadPoolExecutor(max_workers=parallelism) as executor:
+        return list(executor.map(fetch_channel_streams, [ch.get("id") for ch in channels]))
+
+# ETags and bodies of the channel and group lists, kept between runs so an
+# unchanged list is revalidated with a 304 instead of downloaded again
+_HTTP_CACHE_DIR = Path(os.environ.get('CONFIG_DIR', str(Path(__file__).parent))) / 'csv' / 'http_cache'
+
 def fetch_streams(config, output_file, channel_ids=None):
     """Fetches streams for channels based on group and/or range filters, or specific channel IDs.
     
@@ -113,9 +183,10 @@ def fetch_streams(config, output_file, channel_ids=None):
         group_ids_str = settings.get('channel_group_ids', 'ALL').strip()
         start_range = settings.getint('start_channel', 1)
         end_range = settings.getint('end_channel', 999)
+        fetch_parallelism = max(1, settings.getint('fetch_parallelism', 8))
         logging.info(f"Configuration loaded - Groups: {group_ids_str}, Channel range: {start_range}-{end_range}")
     except ValueError:
-        logging.error("Invalid number format in config.ini for start/end channel. Please provide valid integers.")
+        logging.error("Invalid number format in config.ini for start/end channel or fetch_parallelism. Please provide valid integers.")
         return
 
     # --- Fetch initial data ---
@@ -127,21 +198,21 @@ def fetch_streams(config, output_file, channel_ids=None):
     logging.info(f"Base URL: {base_url}")
 
     logging.info("Fetching channel groups from API...")
-    groups = fetch_data_from_url(f"{base_url}/api/channels/groups/")
+    groups = fetch_data_from_url(f"{base_url}/api/channels/groups/", etag_file=_HTTP_CACHE_DIR / 'channel_groups.json')
     if not groups:
         logging.error("Could not fetch groups. Aborting.")
         return
     logging.info(f"Successfully fetched {len(groups)} groups")
     
-    with open("csv/00_channel_groups.csv", mode="w", newline="", encoding="utf-8") as f:
-        writer = csv.writer(f)
-        writer.writerow(["id", "name"])
-        for group in groups:
-            writer.writerow([group.get("id", ""), group.get("name", "")])
+    _write_rows_csv(
+        "csv/00_channel_groups.csv",
+        [(group.get("id", ""), group.get("name", "")) for group in groups],
+        ["id", "name"]
+    )
     logging.info("Saved group list to csv/00_channel_groups.csv")
 
     logging.info("Fetching all channels from API...")
-    all_channels = fetch_data_from_url(f"{base_url}/api/channels/channels/")
+    all_channels = fetch_data_from_url(f"{base_url}/api/channels/channels/", etag_file=_HTTP_CACHE_DIR / 'channels.json')
     if not all_channels:
         logging.error("Could not fetch channels. Aborting.")
         return
@@ -195,46 +266,49 @@ def fetch_streams(config, output_file, channel_ids=None):
 
     # --- Write metadata and streams for filtered channels ---
     logging.info("Writing channel metadata to csv/01_channels_metadata.csv...")
-    with open("csv/01_channels_metadata.csv", mode="w", newline="", encoding="utf-8") as f:
-        writer = csv.writer(f)
-        headers = ["id", "channel_number", "name", "channel_group_id", "tvg_id", "tvc_guide_stationid", "epg_data_id", "logo_id"]
-        writer.writerow(headers)
-        for ch in final_filtered_channels:
-            writer.writerow([ch.get(h, "") for h in headers])
+    headers = ["id", "channel_number", "name", "channel_group_id", "tvg_id", "tvc_guide_stationid", "epg_data_id", "logo_id"]
+    _write_rows_csv(
+        "csv/01_channels_metadata.csv",
+        [[ch.get(h, "") for h in headers] for ch in final_filtered_channels],
+        headers
+    )
     logging.info("Successfully saved channel metadata")
 
     logging.info(f"Starting to fetch streams for {len(final_filtered_channels)} channels...")
     logging.info(f"Output file: {output_file}")
     
-    total_streams_count = 0
-    with open(output_file, mode="w", newline="", encoding="utf-8") as csvfile:
-        writer = csv.writer(csvfile)
-        # Add channel_group_id to the header
-        writer.writerow(["channel_number", "channel_id", "channel_group_id", "stream_id", "stream_name", "stream_url"])
-
-        for idx, channel in enumerate(final_filtered_channels, 1):
-            channel_id = channel.get("id")
-            channel_number = channel.get("channel_number")
-            channel_group_id = channel.get("channel_group_id") # Get group ID
-            channel_name = channel.get("name", "")
-
-            logging.info(f"[{idx}/{len(final_filtered_channels)}] Fetching streams for channel {channel_number} (Group: {channel_group_id}, ID: {channel_id}) - {channel_name}...")
-            streams = fetch_channel_streams(channel_id)
-            if not streams:
-                logging.warning(f"  No streams found for channel {channel_number} ({channel_name})")
-                continue
+    channel_streams = _fetch_streams_for_channels(final_filtered_channels, fetch_parallelism)
+    rows = []
+    for idx, (channel, streams) in enumerate(zip(final_filtered_channels, channel_streams), 1):
+        channel_id = channel.get("id")
+        channel_number = channel.get("channel_number")
+        channel_group_id = channel.get("channel_group_id") # Get group ID
+        channel_name = channel.get("name", "")
+
+        logging.info(f"[{idx}/{len(final_filtered_channels)}] Fetched streams for channel {channel_number} (Group: {channel_group_id}, ID: {channel_id}) - {channel_name}")
+        if not streams:
+            logging.warning(f"  No streams found for channel {channel_number} ({channel_name})")
+            continue
 
-            for stream in streams:
-                writer.writerow([
-                    channel_number,
-                    channel_id,
-                    channel_group_id, # Write group ID to the CSV
-                    stream.get("id", ""),
-                    stream.get("name", ""),
-                    stream.get("url", "")
-                ])
-                total_streams_count += 1
-            logging.info(f"  ✓ Saved {len(streams)} streams for channel {channel_number} ({channel_name})")
+        rows.extend(
+            (
+                channel_number,
+                channel_id,
+                channel_group_id, # Write group ID to the CSV
+                stream.get("id", ""),
+                stream.get("name", ""),
+                stream.get("url", "")
+            )
+            for stream in streams
+        )
+        logging.info(f"  ✓ Collected {len(streams)} streams for channel {channel_number} ({channel_name})")
+
+    # Add channel_group_id to the header
+    _write_rows_csv(
+        output_file, rows,
+        ["channel_number", "channel_id", "channel_group_id", "stream_id", "stream_name", "stream_url"]
+    )
+    total_streams_count = len(rows)
 
     logging.info("="*80)
     logging.info(f"FETCH COMPLETE! Total streams fetched: {total_streams_count}")
@@ -245,7 +319,52 @@ def fetch_streams(config, output_file, channel_ids=None):
 # --- Stream Analysis ---
 
 provider_semaphores = {}
-semaphore_lock = threading.Lock()
+
+# Analysis results are checkpointed to the CSVs after this many rows or
+# seconds, whichever comes first, to bound what a crash can lose. Each
+# checkpoint rewrites both files, hence the coarse limits.
+_CHECKPOINT_EVERY_ROWS = 100
+_CHECKPOINT_INTERVAL = 60.0
+_CSV_BUFFER_SIZE = 1 << 20
+# Earliest time.monotonic() at which the next stream of a provider may
+# start; only read and written while holding that provider's semaphore
+provider_next_available = {}
+
+# Text columns of the stream CSVs. Naming them skips dtype inference; the
+# numeric columns are still coerced after loading because channel numbers
+# can be fractional and group IDs can be blank.
+_STREAM_TEXT_DTYPES = {'stream_name': str, 'stream_url': str}
+
+# Columns each command reads from its input CSV; anything else in the file
+# is never parsed. Columns that are only passed through as text are read as
+# str so their type is not inferred.
+_SCORE_INPUT_COLUMNS = frozenset({
+    'stream_id', 'channel_number', 'channel_id', 'channel_group_id', 'stream_name', 'stream_url',
+    'video_codec', 'audio_codec', 'interlaced_status', 'status', 'bitrate_kbps', 'fps', 'resolution',
+    'frames_decoded', 'frames_dropped', 'err_decode', 'err_discontinuity', 'err_timeout'
+})
+_SCORE_TEXT_DTYPES = {
+    **_STREAM_TEXT_DTYPES,
+    'video_codec': str, 'audio_codec': str, 'interlaced_status': str, 'status': str, 'resolution': str
+}
+_REORDER_INPUT_COLUMNS = ['stream_id', 'channel_number', 'channel_id', 'channel_group_id']
+_STREAM_STATS_COLUMNS = ['stream_id', 'resolution', 'fps', 'video_codec', 'audio_codec', 'avg_bitrate_kbps']
+
+# Patterns matched against every line of ffmpeg's stderr
+_TFF_RE = re.compile(r'TFF:\s*(\d+)')
+_BFF_RE = re.compile(r'BFF:\s*(\d+)')
+_PROG_RE = re.compile(r'Progressive:\s*(\d+)')
+_STATS_RE = re.compile(r'Statistics:\s*(\d+)\s*bytes read')
+# e.g. "Input stream #0:0 (video): 500 packets read (...); 498 frames decoded; 2 decode errors"
+_INPUT_STREAM_RE = re.compile(r'Input stream #.*?(\d+)\s*frames decoded;(?:\s*(\d+)\s*decode errors)?')
+
+# Messages that mark a critical, provider-side error, by the error they set
+_CRITICAL_ERRORS = {
+    'decode_slice_header error': 'err_decode',
+    'timestamp discontinuity': 'err_discontinuity',
+    'Connection timed out': 'err_timeout',
+}
+_CRITICAL_ERROR_RE = re.compile('|'.join(map(re.escape, _CRITICAL_ERRORS)))
 
 def _check_ffmpeg_installed():
     """Checks if ffmpeg and ffprobe are installed and in PATH."""
@@ -260,6 +379,39 @@ def _check_ffmpeg_installed():
         logging.error(f"Error checking ffmpeg/ffprobe installation: {e}")
         return False
 
+def _scan_stderr(command, timeout, handle_line):
+    """
+    Runs command and passes each stderr line to handle_line as it is produced.
+    The output is never held in memory as a whole. Raises
+    subprocess.TimeoutExpired if the process is still running after timeout.
+    """
+    proc = subprocess.Popen(
+        command, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+        text=True, errors='replace'
+    )
+    timed_out = threading.Event()
+
+    def _kill():
+        timed_out.set()
+        proc.kill()
+
+    watchdog = threading.Timer(timeout, _kill)
+    watchdog.daemon = True
+    watchdog.start()
+    try:
+        for line in proc.stderr:
+            handle_line(line)
+        proc.wait()
+    finally:
+        watchdog.cancel()
+        if proc.poll() is None:
+            proc.kill()
+            proc.wait()
+        proc.stderr.close()
+
+    if timed_out.is_set():
+        raise subprocess.TimeoutExpired(command, timeout)
+
 def _get_stream_info(url, timeout, user_agent='VLC/3.0.14'):
     """Gets stream information using ffprobe."""
     logging.debug(f"Running ffprobe for URL: {url[:50]}...")
@@ -272,9 +424,10 @@ def _get_stream_info(url, timeout, user_agent='VLC/3.0.14'):
         url
     ]
     try:
-        result = subprocess.run(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, timeout=timeout, text=True)
+        # Raw bytes go straight to orjson; nothing is decoded to str first
+        result = subprocess.run(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, timeout=timeout)
         if result.stdout:
-            data = json.loads(result.stdout)
+            data = orjson.loads(result.stdout)
             streams = data.get('streams', [])
             logging.debug(f"ffprobe returned {len(streams)} streams")
             return streams
@@ -283,7 +436,7 @@ def _get_stream_info(url, timeout, user_agent='VLC/3.0.14'):
     except subprocess.TimeoutExpired:
         logging.warning(f"Timeout ({timeout}s) while fetching stream info for: {url[:50]}...")
         return []
-    except json.JSONDecodeError as e:
+    except orjson.JSONDecodeError as e:
         logging.warning(f"Failed to decode JSON from ffprobe for {url[:50]}...: {e}")
         return []
     except Exception as e:
@@ -303,21 +456,21 @@ def _check_interlaced_status(url, stream_name, idet_frames, timeout, user_agent=
     ]
 
     try:
-        idet_result = subprocess.run(idet_command, capture_output=True, text=True, timeout=timeout)
-        idet_output = idet_result.stderr
-
         interlaced_frames = 0
         progressive_frames = 0
 
-        for line in idet_output.splitlines():
+        def handle_line(line):
+            nonlocal interlaced_frames, progressive_frames
             if "Single frame detection:" in line or "Multi frame detection:" in line:
-                tff_match = re.search(r'TFF:\s*(\d+)', line)
-                bff_match = re.search(r'BFF:\s*(\d+)', line)
-                progressive_match = re.search(r'Progressive:\s*(\d+)', line)
+                tff_match = _TFF_RE.search(line)
+                bff_match = _BFF_RE.search(line)
+                progressive_match = _PROG_RE.search(line)
 
                 if tff_match: interlaced_frames += int(tff_match.group(1))
                 if bff_match: interlaced_frames += int(bff_match.group(1))
                 if progressive_match: progressive_frames += int(progressive_match.group(1))
+
+        _scan_stderr(idet_command, timeout, handle_line)
         
         if interlaced_frames > progressive_frames:
             status = "INTERLACED"
@@ -338,13 +491,24 @@ def _check_interlaced_status(url, stream_name, idet_frames, timeout, user_agent=
         logging.error(f"Error checking interlacing for {stream_name}: {e}")
         return "UNKNOWN (Error)"
 
-def _get_bitrate_and_frame_stats(url, ffmpeg_duration, timeout, user_agent='VLC/3.0.14'):
-    """Gets bitrate and frame statistics using ffmpeg."""
+def _get_bitrate_and_frame_stats(url, ffmpeg_duration, timeout, user_agent='VLC/3.0.14', realtime=False):
+    """Gets bitrate and frame statistics using ffmpeg.
+    
+    The input is read as fast as the provider delivers it; -t still limits
+    the run to ffmpeg_duration seconds of media, so the bytes read cover
+    that duration. Set realtime to pace the read with -re for providers
+    that throttle burst reads.
+    """
     logging.debug(f"Analyzing bitrate and frame stats for {ffmpeg_duration}s...")
-    command = [
-        'ffmpeg', '-re', '-v', 'debug', '-user_agent', user_agent,
+    # The "Statistics:" and per-stream decode summaries are logged at the
+    # verbose level; debug would add per-packet output we never read
+    command = ['ffmpeg']
+    if realtime:
+        command.append('-re')
+    command.extend([
+        '-v', 'verbose', '-user_agent', user_agent,
         '-i', url, '-t', str(ffmpeg_duration), '-f', 'null', '-'
-    ]
+    ])
     bitrate = "N/A"
     frames_decoded = "N/A"
     frames_dropped = "N/A"
@@ -352,35 +516,30 @@ def _get_bitrate_and_frame_stats(url, ffmpeg_duration, timeout, user_agent='VLC/
     status = "OK"
 
     # Add buffer to timeout to account for ffmpeg startup, network latency, and shutdown overhead
-    # Since -re flag reads at real-time, ffmpeg takes at least ffmpeg_duration seconds
+    # Live streams are delivered in real time, so ffmpeg can take ffmpeg_duration seconds
     actual_timeout = timeout + ffmpeg_duration + 10
 
+    def handle_line(line):
+        nonlocal bitrate, frames_decoded, frames_dropped
+        stats_match = _STATS_RE.search(line)
+        if stats_match:
+            total_bytes = int(stats_match.group(1))
+            if total_bytes > 0 and ffmpeg_duration > 0:
+                bitrate = (total_bytes * 8) / 1000 / ffmpeg_duration
+                logging.debug(f"  → Calculated bitrate: {bitrate:.2f} kbps from {total_bytes} bytes")
+            return
+        input_match = _INPUT_STREAM_RE.search(line)
+        if input_match:
+            frames_decoded = int(input_match.group(1))
+            logging.debug(f"  → Frames decoded: {frames_decoded}")
+            if input_match.group(2) is not None:
+                frames_dropped = int(input_match.group(2))
+                logging.debug(f"  → Decode errors: {frames_dropped}")
+
     try:
         start = time.time()
-        result = subprocess.run(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, timeout=actual_timeout, text=True)
+        _scan_stderr(command, actual_timeout, handle_line)
         elapsed = time.time() - start
-        output = result.stderr
-        total_bytes = 0
-        for line in output.splitlines():
-            if "Statistics:" in line and "bytes read" in line:
-                try:
-                    parts = line.split("bytes read")
-                    size_str = parts[0].strip().split()[-1]
-                    total_bytes = int(size_str)
-                    if total_bytes > 0 and ffmpeg_duration > 0:
-                        bitrate = (total_bytes * 8) / 1000 / ffmpeg_duration
-                        logging.debug(f"  → Calculated bitrate: {bitrate:.2f} kbps from {total_bytes} bytes")
-                except ValueError:
-                    pass
-            if "Input stream #" in line and "frames decoded;" in line:
-                decoded_match = re.search(r'(\d+)\s*frames decoded', line)
-                errors_match = re.search(r'(\d+)\s*decode errors', line)
-                if decoded_match: 
-                    frames_decoded = int(decoded_match.group(1))
-                    logging.debug(f"  → Frames decoded: {frames_decoded}")
-                if errors_match: 
-                    frames_dropped = int(errors_match.group(1))
-                    logging.debug(f"  → Decode errors: {frames_dropped}")
         logging.debug(f"  → Analysis completed in {elapsed:.2f}s")
     except subprocess.TimeoutExpired:
         logging.warning(f"Timeout ({actual_timeout}s) while fetching bitrate/frames")
@@ -392,6 +551,7 @@ def _get_bitrate_and_frame_stats(url, ffmpeg_duration, timeout, user_agent='VLC/
 
     return bitrate, frames_decoded, frames_dropped, status, elapsed
 
+@lru_cache(maxsize=8192)
 def _get_provider_from_url(url):
     """Extracts the hostname and port as a provider identifier."""
     try:
@@ -405,49 +565,21 @@ def _check_stream_for_critical_errors(url, stream_name, timeout, config):
     Returns a dictionary of identified critical errors.
     """
     logging.debug(f"Checking for critical errors in stream (timeout: {timeout}s)...")
-    settings = config['script_settings']
-    hwaccel_mode = settings.get('ffmpeg_hwaccel_mode', 'none').lower()
 
-    # Base command arguments
+    # The errors looked for come from the demuxer and the decoders, so the
+    # streams are decoded into the null muxer's raw formats; nothing is
+    # encoded.
     ffmpeg_command = [
         'ffmpeg',
         '-probesize', '500000', '-analyzeduration', '1000000',
         '-fflags', '+genpts+discardcorrupt', '-flags', 'low_delay',
-        '-flush_packets', '1', '-avoid_negative_ts', 'make_zero',
+        '-avoid_negative_ts', 'make_zero',
         '-timeout', '5000000', '-rw_timeout', '5000000',
-    ]
-
-    # Hardware acceleration specific arguments
-    if hwaccel_mode == 'qsv':
-        ffmpeg_command.extend([
-            '-hwaccel', 'qsv', '-hwaccel_output_format', 'qsv',
-        ])
-        logging.debug(f"  Using QSV hardware acceleration")
-
-    # Input and common arguments
-    ffmpeg_command.extend([
         '-i', url,
         '-t', '20', # 20 second duration for the check
-        '-map', '0:v:0', '-map', '0:a:0?', '-map', '0:s?',
-    ])
-
-    # Codec and output arguments
-    if hwaccel_mode == 'qsv':
-        ffmpeg_command.extend([
-            '-c:v', 'hevc_qsv',
-        ])
-    else: # Default to software encoding
-        ffmpeg_command.extend([
-            '-c:v', 'libx265',
-        ])
-
-    ffmpeg_command.extend([
-        '-preset', 'veryfast', '-profile:v', 'main', '-g', '50', '-bf', '1',
-        '-b:v', '12000k', '-maxrate', '15000k', '-bufsize', '25000k',
-        '-c:a', 'libfdk_aac', '-vbr', '4', '-b:a', '128k', '-ac', '2',
-        '-af', 'aresample=async=0', '-fps_mode', 'passthrough',
+        '-map', '0:v:0', '-map', '0:a:0?',
         '-f', 'null', '-'
-    ])
+    ]
 
     errors = {
         'err_decode': False,
@@ -455,26 +587,17 @@ def _check_stream_for_critical_errors(url, stream_name, timeout, config):
         'err_timeout': False,
     }
 
+    def handle_line(line):
+        for match in _CRITICAL_ERROR_RE.finditer(line):
+            key = _CRITICAL_ERRORS[match.group()]
+            if not errors[key]:
+                errors[key] = True
+                logging.debug(f"  ✗ Critical error detected: {match.group()}")
+
     try:
-        start_time = time.time()
-        result = subprocess.run(
-            ffmpeg_command,
-            capture_output=True, # Captures both stdout and stderr
-            text=True,
-            timeout=timeout
-        )
-        elapsed = time.time() - start_time
-        stderr_output = result.stderr
-
-        if "decode_slice_header error" in stderr_output:
-            errors['err_decode'] = True
-            logging.debug(f"  ✗ Decode error detected")
-        if "timestamp discontinuity" in stderr_output:
-            errors['err_discontinuity'] = True
-            logging.debug(f"  ✗ Timestamp discontinuity detected")
-        if "Connection timed out" in stderr_output:
-            errors['err_timeout'] = True
-            logging.debug(f"  ✗ Connection timeout detected")
+        start_time = time.monotonic()
+        _scan_stderr(ffmpeg_command, timeout, handle_line)
+        elapsed = time.monotonic() - start_time
         
         if not any(errors.values()):
             logging.debug(f"  ✓ No critical errors detected (elapsed: {elapsed:.2f}s)")
@@ -490,7 +613,34 @@ def _check_stream_for_critical_errors(url, stream_name, timeout, config):
 
     return errors
 
-def _analyze_stream_task(row, ffmpeg_duration, idet_frames, timeout, retries, retry_delay, config, user_agent='VLC/3.0.14'):
+# Values of the analysis fields before a stream has been measured
+_ANALYSIS_DEFAULTS = {
+    'video_codec': 'N/A',
+    'audio_codec': 'N/A',
+    'resolution': '0x0',
+    'fps': 0,
+    'interlaced_status': 'N/A',
+    'bitrate_kbps': 0,
+    'frames_decoded': 'N/A',
+    'frames_dropped': 'N/A',
+    'status': 'N/A',
+}
+
+def _run_overlapped_checks(url, stream_name, ffmpeg_duration, timeout, config, user_agent, realtime):
+    """Runs the ffprobe, bitrate and critical error checks side by side.
+    
+    Each check opens its own connection to the stream, so this is only
+    used when overlap_analysis_steps is enabled for providers that allow
+    several connections at once. Returns the finished futures by step.
+    """
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        return {
+            'info': executor.submit(_get_stream_info, url, timeout, user_agent),
+            'stats': executor.submit(_get_bitrate_and_frame_stats, url, ffmpeg_duration, timeout, user_agent, realtime),
+            'errors': executor.submit(_check_stream_for_critical_errors, url, stream_name, timeout, config),
+        }
+
+def _analyze_stream_task(row, ffmpeg_duration, idet_frames, timeout, retries, retry_delay, config, user_agent='VLC/3.0.14', provider=None):
     url = row.get('stream_url')
     stream_name = row.get('stream_name', 'Unknown')
     stream_id = row.get('stream_id', 'Unknown')
@@ -498,13 +648,26 @@ def _analyze_stream_task(row, ffmpeg_duration, idet_frames, timeout, retries, re
         logging.warning(f"No URL for stream {stream_name} (ID: {stream_id})")
         return row
 
-    provider = _get_provider_from_url(url)
-    with semaphore_lock:
-        if provider not in provider_semaphores:
-            provider_semaphores[provider] = threading.Semaphore(1)
-        provider_semaphore = provider_semaphores[provider]
+    if provider is None:
+        provider = _get_provider_from_url(url)
+    settings = config['script_settings']
+    overlap = settings.getboolean('overlap_analysis_steps', False)
+    realtime = settings.getboolean('ffmpeg_realtime_read', False)
+    # setdefault is atomic, so racing first streams of a provider still
+    # share one semaphore; the get() avoids building one on every call
+    provider_semaphore = provider_semaphores.get(provider)
+    if provider_semaphore is None:
+        provider_semaphore = provider_semaphores.setdefault(provider, threading.Semaphore(1))
 
     with provider_semaphore:
+        # Respect ffmpeg duration to avoid hammering provider. The pause is
+        # taken here rather than after the previous stream, so that worker
+        # was free to move on to other providers in the meantime.
+        wait_time = provider_next_available.get(provider, 0) - time.monotonic()
+        if wait_time > 0:
+            logging.debug(f"  Waiting {wait_time:.2f} seconds before next stream from {provider}")
+            time.sleep(wait_time)
+
         logging.info(f"▶ Processing stream: {stream_name} (ID: {stream_id}, Provider: {provider})")
 
         for attempt in range(retries + 1):
@@ -512,20 +675,14 @@ def _analyze_stream_task(row, ffmpeg_duration, idet_frames, timeout, retries, re
                 logging.info(f"  Retry attempt {attempt}/{retries} for {stream_name}")
                 
             # Initialize fields for each attempt
+            row.update(_ANALYSIS_DEFAULTS)
             row['timestamp'] = datetime.now().isoformat()
-            row['video_codec'] = 'N/A'
-            row['audio_codec'] = 'N/A'
-            row['resolution'] = '0x0'
-            row['fps'] = 0
-            row['interlaced_status'] = 'N/A'
-            row['bitrate_kbps'] = 0
-            row['frames_decoded'] = 'N/A'
-            row['frames_dropped'] = 'N/A'
-            row['status'] = 'N/A'
+
+            checks = _run_overlapped_checks(url, stream_name, ffmpeg_duration, timeout, config, user_agent, realtime) if overlap else None
 
             # 1. Get Codec, Resolution, FPS from ffprobe
             logging.info(f"  [1/4] Fetching codec/resolution/FPS info...")
-            streams_info = _get_stream_info(url, timeout, user_agent)
+            streams_info = checks['info'].result() if checks else _get_stream_info(url, timeout, user_agent)
             video_info = next((s for s in streams_info if 'width' in s), None)
             audio_info = next((s for s in streams_info if 'codec_name' in s and 'width' not in s), None)
 
@@ -550,7 +707,10 @@ def _analyze_stream_task(row, ffmpeg_duration, idet_frames, timeout, retries, re
 
             # 2. Get Bitrate and Frame Drop stats from ffmpeg
             logging.info(f"  [2/4] Analyzing bitrate and frame stats...")
-            bitrate, frames_decoded, frames_dropped, status, elapsed = _get_bitrate_and_frame_stats(url, ffmpeg_duration, timeout, user_agent)
+            if checks:
+                bitrate, frames_decoded, frames_dropped, status, elapsed = checks['stats'].result()
+            else:
+                bitrate, frames_decoded, frames_dropped, status, elapsed = _get_bitrate_and_frame_stats(url, ffmpeg_duration, timeout, user_agent, realtime)
             row['bitrate_kbps'] = bitrate
             row['frames_decoded'] = frames_decoded
             row['frames_dropped'] = frames_dropped
@@ -570,15 +730,20 @@ def _analyze_stream_task(row, ffmpeg_duration, idet_frames, timeout, retries, re
                 logging.info(f"  [3/4] Skipping interlace check due to previous errors")
                 row['interlaced_status'] = "N/A"
 
-            # 4. Perform critical error check
-            logging.info(f"  [4/4] Checking for critical errors...")
-            critical_errors = _check_stream_for_critical_errors(url, stream_name, timeout, config)
-            row.update(critical_errors)
-            error_count = sum(critical_errors.values())
-            if error_count > 0:
-                logging.warning(f"    ✗ Found {error_count} critical error(s): {critical_errors}")
+            # 4. Perform critical error check. It is the longest step, so a
+            # failed attempt that is about to be retried skips it; the last
+            # attempt always records it.
+            if status != "OK" and attempt < retries:
+                logging.info(f"  [4/4] Skipping critical error check before retrying")
             else:
-                logging.info(f"    ✓ No critical errors detected")
+                logging.info(f"  [4/4] Checking for critical errors...")
+                critical_errors = checks['errors'].result() if checks else _check_stream_for_critical_errors(url, stream_name, timeout, config)
+                row.update(critical_errors)
+                error_count = sum(critical_errors.values())
+                if error_count > 0:
+                    logging.warning(f"    ✗ Found {error_count} critical error(s): {critical_errors}")
+                else:
+                    logging.info(f"    ✓ No critical errors detected")
 
             # If the main status is OK, break the retry loop
             if status == "OK":
@@ -590,21 +755,69 @@ def _analyze_stream_task(row, ffmpeg_duration, idet_frames, timeout, retries, re
                 logging.warning(f"  Stream '{stream_name}' failed with status '{status}'. Retrying in {retry_delay} seconds... ({attempt + 1}/{retries})")
                 time.sleep(retry_delay)
 
-        # Respect ffmpeg duration to avoid hammering provider
         if isinstance(elapsed, (int, float)) and elapsed < ffmpeg_duration:
-            wait_time = ffmpeg_duration - elapsed
-            logging.debug(f"  Waiting additional {wait_time:.2f} seconds before next stream from {provider}")
-            time.sleep(wait_time)
+            provider_next_available[provider] = time.monotonic() + ffmpeg_duration - elapsed
 
     return row
 
+def _filter_by_group(df, target_group_ids):
+    """Keeps the rows whose channel_group_id is one of target_group_ids."""
+    df['channel_group_id'] = pd.to_numeric(df['channel_group_id'], errors='coerce')
+    # np.isin on the float values; blank group IDs are NaN and never match
+    group_ids = df['channel_group_id'].to_numpy(dtype=float)
+    return df[np.isin(group_ids, np.fromiter(target_group_ids, dtype=float))]
+
+def _stream_key(row):
+    """Returns a row's stream_id as an int, or None if it is not a number."""
+    try:
+        return int(float(row.get('stream_id')))
+    except (TypeError, ValueError):
+        return None
+
+def _load_latest_rows(path):
+    """Reads a measurements CSV into a dict of the latest row per stream_id."""
+    latest_rows = {}
+    if not os.path.exists(path):
+        return latest_rows
+    with open(path, newline='', encoding='utf-8', buffering=_CSV_BUFFER_SIZE) as f:
+        for row in csv.DictReader(f):
+            key = _stream_key(row)
+            if key is None:
+                continue
+            previous = latest_rows.get(key)
+            if previous is None or (row.get('timestamp') or '') >= (previous.get('timestamp') or ''):
+                latest_rows[key] = row
+    return latest_rows
+
+def _write_latest_rows(path, latest_rows, fieldnames):
+    """Rewrites a measurements CSV with one row per stream, oldest first.
+
+    All rows go through a single writerows() call, as in _write_rows_csv.
+    """
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', newline='', encoding='utf-8', buffering=_CSV_BUFFER_SIZE) as f:
+        writer = csv.writer(f, lineterminator='\n')
+        writer.writerow(fieldnames)
+        writer.writerows(_latest_row_values(latest_rows, fieldnames))
+    os.replace(tmp_path, path)
+
+def _latest_row_values(latest_rows, fieldnames):
+    """Yields the CSV values of each row, oldest first, with blanks as N/A."""
+    id_index = fieldnames.index('stream_id')
+    for key, row in sorted(latest_rows.items(), key=lambda item: item[1].get('timestamp') or ''):
+        values = [row.get(col) for col in fieldnames]
+        values = ['N/A' if v is None or v == '' else v for v in values]
+        values[id_index] = key
+        yield values
+
 def analyze_streams(config, input_csv, output_csv, fails_csv, ffmpeg_duration, idet_frames, timeout, max_workers, retries, retry_delay, user_agent='VLC/3.0.14'):
     """Analyzes streams from a CSV file for various metrics and saves results incrementally."""
     logging.info("="*80)
     logging.info("STARTING STREAM ANALYSIS OPERATION")
     logging.info("="*80)
     
-    analysis_start_time = datetime.now()
+    # Elapsed times only; the row timestamps still use datetime.now()
+    analysis_start_time = time.monotonic()
     
     if not _check_ffmpeg_installed():
         logging.error("ffmpeg/ffprobe not installed. Cannot proceed.")
@@ -616,7 +829,7 @@ def analyze_streams(config, input_csv, output_csv, fails_csv, ffmpeg_duration, i
     # --- Load and Filter Data ---
     logging.info(f"Loading input CSV: {input_csv}")
     try:
-        df = pd.read_csv(input_csv)
+        df = pd.read_csv(input_csv, engine=_CSV_ENGINE, dtype=_STREAM_TEXT_DTYPES)
         logging.info(f"✓ Loaded {len(df)} streams from CSV")
     except FileNotFoundError:
         logging.error(f"Input CSV not found: {input_csv}")
@@ -634,9 +847,8 @@ def analyze_streams(config, input_csv, output_csv, fails_csv, ffmpeg_duration, i
     if group_ids_str.upper() != 'ALL':
         try:
             target_group_ids = {int(gid.strip()) for gid in group_ids_str.split(',')}
-            df['channel_group_id'] = pd.to_numeric(df['channel_group_id'], errors='coerce')
             before_count = len(df)
-            df = df[df['channel_group_id'].isin(target_group_ids)]
+            df = _filter_by_group(df, target_group_ids)
             logging.info(f"Group filter applied: {before_count} → {len(df)} streams")
         except ValueError:
             logging.error(f"Invalid channel_group_ids in config.ini: '{group_ids_str}'. Aborting analyze.")
@@ -662,12 +874,16 @@ def analyze_streams(config, input_csv, output_csv, fails_csv, ffmpeg_duration, i
 
     if days_to_keep > 0 and os.path.exists(output_csv):
         try:
-            df_processed = pd.read_csv(output_csv)
+            # Only the URL and timestamp of past measurements are needed here
+            df_processed = pd.read_csv(
+                output_csv, engine=_CSV_ENGINE, usecols=['stream_url', 'timestamp'],
+                dtype={'stream_url': str, 'timestamp': str}
+            )
             df_processed['timestamp'] = pd.to_datetime(df_processed['timestamp'], errors='coerce')
             last_measured_date = datetime.now() - timedelta(days=days_to_keep)
-            recent_urls = df_processed[df_processed['timestamp'] > last_measured_date]['stream_url'].unique()
+            recent_urls = frozenset(df_processed.loc[df_processed['timestamp'] > last_measured_date, 'stream_url'])
             before_count = len(df)
-            df = df[~df['stream_url'].isin(recent_urls)]
+            df = df[~df['stream_url'].map(recent_urls.__contains__)]
             logging.info(f"Pruned recently analyzed streams: {before_count} → {len(df)} streams to analyze")
         except Exception as e:
             logging.warning(f"Could not read or parse existing measurements file '{output_csv}'. Re-analyzing all streams. Error: {e}")
@@ -693,13 +909,19 @@ def analyze_streams(config, input_csv, output_csv, fails_csv, ffmpeg_duration, i
         logging.info("✓ No duplicate streams found")
 
     # --- Prepare Final List for Analysis ---
-    df.drop_duplicates(subset=['stream_url'], keep='first', inplace=True)
-
-    if df.empty:
+    # The rows are needed as dicts anyway, so duplicates are dropped while
+    # converting rather than through another DataFrame
+    streams_to_analyze = []
+    seen_urls = set()
+    for row in df.to_dict('records'):
+        if row['stream_url'] not in seen_urls:
+            seen_urls.add(row['stream_url'])
+            streams_to_analyze.append(row)
+
+    if not streams_to_analyze:
         logging.info("All filtered streams have been analyzed recently. Nothing to do.")
         return
 
-    streams_to_analyze = df.to_dict('records')
     logging.info(f"FINAL: {len(streams_to_analyze)} streams to analyze")
 
     # Calculate estimated time
@@ -720,9 +942,17 @@ def analyze_streams(config, input_csv, output_csv, fails_csv, ffmpeg_duration, i
     Path(output_csv).parent.mkdir(parents=True, exist_ok=True)
     Path(fails_csv).parent.mkdir(parents=True, exist_ok=True)
 
-    # Check if files exist to determine if we need to write headers
-    output_exists = os.path.exists(output_csv)
-    fails_exists = os.path.exists(fails_csv)
+    # Latest measurement per stream_id. Streams skipped by this run keep
+    # their rows from earlier runs; each result replaces its stream's row.
+    # Both CSVs are written from this dict, so they never hold duplicates.
+    latest_rows = _load_latest_rows(output_csv)
+
+    def save_results():
+        # Rows without a numeric stream_id cannot be deduplicated
+        latest_rows.pop(None, None)
+        _write_latest_rows(output_csv, latest_rows, final_columns)
+        failed_rows = {key: row for key, row in latest_rows.items() if row.get('status') != 'OK'}
+        _write_latest_rows(fails_csv, failed_rows, final_columns)
     
     # Initialize progress tracker
     progress_tracker = StreamCheckProgress()
@@ -741,129 +971,123 @@ def analyze_streams(config, input_csv, output_csv, fails_csv, ffmpeg_duration, i
     logging.info("="*80)
 
     try:
-        with open(output_csv, 'a', newline='', encoding='utf-8') as f_out, \
-             open(fails_csv, 'a', newline='', encoding='utf-8') as f_fails:
-
-            writer_out = csv.DictWriter(f_out, fieldnames=final_columns, extrasaction='ignore', lineterminator='\n')
-            writer_fails = csv.DictWriter(f_fails, fieldnames=final_columns, extrasaction='ignore', lineterminator='\n')
-
-            if not output_exists or os.path.getsize(output_csv) == 0:
-                writer_out.writeheader()
-                logging.info("✓ Created output CSV with headers")
-            if not fails_exists or os.path.getsize(fails_csv) == 0:
-                writer_fails.writeheader()
-                logging.info("✓ Created fails CSV with headers")
-
-            # Initialize progress
-            progress_tracker.update(0, total_streams, 'Starting...')
-            logging.info(f"Starting synchronous analysis of {total_streams} streams...")
-            logging.info("="*80)
-
-            # Process streams synchronously (one at a time)
-            for idx, row in enumerate(streams_to_analyze, 1):
-                stream_start_time = datetime.now()
-                
-                try:
-                    stream_name = row.get('stream_name', 'Unknown')
-                    logging.info(f"\n[{idx}/{total_streams}] ═══ Starting analysis of: {stream_name} ═══")
-                    
-                    result_row = _analyze_stream_task(row, ffmpeg_duration, idet_frames, timeout, retries, retry_delay, config, user_agent)
-                    completed_streams += 1
-                    
-                    stream_elapsed = (datetime.now() - stream_start_time).total_seconds()
-                    
-                    # Update progress
-                    progress_tracker.update(completed_streams, total_streams, stream_name)
-                    
-                    # Log progress in terminal with time estimates
-                    percentage = round((completed_streams / total_streams * 100), 1)
+        # Initialize progress
+        progress_tracker.update(0, total_streams, 'Starting...')
+        workers = max(1, min(total_streams, max_workers))
+        logging.info(f"Starting analysis of {total_streams} streams with {workers} workers...")
+        logging.info("="*80)
+
+        # The per-stream banners are only formatted when DEBUG is on; the
+        # per-stream INFO lines use lazy %-formatting
+        debug_enabled = logging.getLogger().isEnabledFor(logging.DEBUG)
+
+        def _run(idx, row, provider):
+            if debug_enabled:
+                logging.debug("[%d/%d] ═══ Starting analysis of: %s ═══", idx, total_streams, row.get('stream_name', 'Unknown'))
+            start = time.monotonic()
+            try:
+                result_row = _analyze_stream_task(row, ffmpeg_duration, idet_frames, timeout, retries, retry_delay, config, user_agent, provider)
+                return result_row, None, time.monotonic() - start
+            except Exception as exc:
+                return row, exc, time.monotonic() - start
+
+        # Streams from different providers run concurrently; the
+        # per-provider semaphore in _analyze_stream_task still keeps
+        # each provider to one stream at a time. Submitting streams
+        # round-robin across providers keeps the workers from all
+        # queueing behind the same provider. Each stream's provider is
+        # resolved once here and handed to the task.
+        by_provider = defaultdict(list)
+        for row in streams_to_analyze:
+            provider = _get_provider_from_url(row.get('stream_url') or '')
+            by_provider[provider].append((row, provider))
+        ordered_rows = [item for batch in zip_longest(*by_provider.values()) for item in batch if item is not None]
+
+        executor = ThreadPoolExecutor(max_workers=workers)
+        try:
+            futures = [executor.submit(_run, idx, row, provider) for idx, (row, provider) in enumerate(ordered_rows, 1)]
+
+            # Results are collected from this thread only, as they complete
+            unsaved = 0
+            last_checkpoint = time.monotonic()
+            for idx, future in enumerate(as_completed(futures), 1):
+                result_row, exc, stream_elapsed = future.result()
+                completed_streams += 1
+                stream_name = result_row.get('stream_name', 'Unknown')
+
+                # Update progress
+                progress_tracker.update(completed_streams, total_streams, stream_name)
+                percentage = round((completed_streams / total_streams * 100), 1)
+
+                if exc is None:
                     status = result_row.get('status', 'Unknown')
-                    
+
                     # Calculate ETA
-                    elapsed_total = (datetime.now() - analysis_start_time).total_seconds()
+                    elapsed_total = time.monotonic() - analysis_start_time
                     avg_time_per_stream = elapsed_total / completed_streams
                     remaining_streams = total_streams - completed_streams
                     eta_seconds = avg_time_per_stream * remaining_streams
                     eta_hours = eta_seconds / 3600
-                    
-                    logging.info(f"[{idx}/{total_streams}] Progress: {percentage}% - {stream_name} → Status: {status}")
-                    logging.info(f"  Time: {stream_elapsed:.1f}s this stream, ETA: {eta_hours:.1f}h remaining")
-                    
-                    # Write to the main measurements file
-                    writer_out.writerow(result_row)
-                    f_out.flush()  # Flush buffer to disk
-                    
-                    # If the stream failed, write to the fails file
-                    if result_row.get('status') != 'OK':
-                        writer_fails.writerow(result_row)
-                        f_fails.flush() # Flush buffer to disk
-                        logging.warning(f"  ⚠ Stream failed and saved to fails CSV")
-                    
-                    logging.info(f"[{idx}/{total_streams}] ═══ Completed: {stream_name} ═══\n")
-                        
-                except KeyboardInterrupt:
-                    logging.warning("\n\n⚠️  INTERRUPTED BY USER - Saving progress...")
-                    progress_tracker.clear()
-                    logging.warning(f"Analysis interrupted at {completed_streams}/{total_streams} streams")
-                    logging.warning("Partial results have been saved. You can resume by running the command again.")
-                    return
-                    
-                except Exception as exc:
-                    completed_streams += 1
-                    stream_name = row.get('stream_name', 'Unknown')
-                    
-                    stream_elapsed = (datetime.now() - stream_start_time).total_seconds()
-                    
-                    # Update progress
-                    progress_tracker.update(completed_streams, total_streams, stream_name)
-                    
-                    # Log progress in terminal
-                    percentage = round((completed_streams / total_streams * 100), 1)
-                    logging.error(f'[{idx}/{total_streams}] Progress: {percentage}% - Stream {stream_name} generated an exception: {exc}')
-                    logging.error(f'  Exception occurred after {stream_elapsed:.1f}s')
-                    
-                    # Update row with error info and write to both files
-                    row.update({'timestamp': datetime.now().isoformat(), 'status': "Exception"})
+
+                    logging.info(
+                        "[%d/%d] Progress: %s%% - %s → Status: %s (%.1fs, ETA %.1fh)",
+                        idx, total_streams, percentage, stream_name, status, stream_elapsed, eta_hours
+                    )
+
+                    # Failed streams also end up in the fails file
+                    latest_rows[_stream_key(result_row)] = result_row
+                    if status != 'OK':
+                        logging.warning("  ⚠ Stream failed and will be saved to fails CSV")
+
+                    if debug_enabled:
+                        logging.debug("[%d/%d] ═══ Completed: %s ═══", idx, total_streams, stream_name)
+                else:
+                    logging.error(
+                        "[%d/%d] Progress: %s%% - Stream %s generated an exception after %.1fs: %s",
+                        idx, total_streams, percentage, stream_name, stream_elapsed, exc
+                    )
+
+                    # Update row with error info; it is saved to both files
+                    result_row.update({'timestamp': datetime.now().isoformat(), 'status': "Exception"})
                     default_errors = {'err_decode': False, 'err_discontinuity': False, 'err_timeout': True}
-                    row.update(default_errors)
-                    
-                    writer_out.writerow(row)
-                    writer_fails.writerow(row)
-                    f_out.flush()
-                    f_fails.flush()
-            
-            # Clear progress when complete
+                    result_row.update(default_errors)
+
+                    latest_rows[_stream_key(result_row)] = result_row
+
+                # Checkpoint in batches; the final save writes the rest
+                unsaved += 1
+                if unsaved >= _CHECKPOINT_EVERY_ROWS or time.monotonic() - last_checkpoint >= _CHECKPOINT_INTERVAL:
+                    save_results()
+                    unsaved = 0
+                    last_checkpoint = time.monotonic()
+
+        except KeyboardInterrupt:
+            logging.warning("\n\n⚠️  INTERRUPTED BY USER - Saving progress...")
+            save_results()
             progress_tracker.clear()
+            logging.warning(f"Analysis interrupted at {completed_streams}/{total_streams} streams")
+            logging.warning("Partial results have been saved. You can resume by running the command again.")
+            return
+        finally:
+            # Every future is done on a normal exit; otherwise drop the queued ones
+            executor.shutdown(wait=False, cancel_futures=True)
 
-        total_elapsed = (datetime.now() - analysis_start_time).total_seconds()
+        # Clear progress when complete
+        progress_tracker.clear()
+
+        total_elapsed = time.monotonic() - analysis_start_time
         total_hours = total_elapsed / 3600
         
         logging.info("="*80)
-        logging.info(f"✓ Incremental analysis complete. Results saved to {output_csv} and {fails_csv}")
+        logging.info("✓ Incremental analysis complete.")
         logging.info(f"  Total time: {total_hours:.2f} hours ({total_elapsed:.0f} seconds)")
         logging.info(f"  Average time per stream: {total_elapsed/completed_streams:.1f}s")
         logging.info("="*80)
 
-        # --- Final Cleanup: Deduplicate the results file ---
-        logging.info(f"Deduplicating final results in {output_csv}...")
-        df_final = pd.read_csv(output_csv)
-        
-        # Ensure consistent data types before dropping duplicates
-        df_final['stream_id'] = pd.to_numeric(df_final['stream_id'], errors='coerce')
-        df_final.dropna(subset=['stream_id'], inplace=True)
-        df_final['stream_id'] = df_final['stream_id'].astype(int)
-        
-        # Keep the latest entry for each stream_id
-        df_final.sort_values(by='timestamp', ascending=True, inplace=True)
-        before_dedup = len(df_final)
-        df_final.drop_duplicates(subset=['stream_id'], keep='last', inplace=True)
-        logging.info(f"Deduplication: {before_dedup} → {len(df_final)} entries")
-        
-        # Reorder columns to the desired final order
-        df_final = df_final.reindex(columns=final_columns)
-
-        df_final.to_csv(output_csv, index=False, na_rep='N/A')
-        logging.info(f"✓ Successfully deduplicated and saved final results to {output_csv}")
+        # --- Final Save: one deduplicated row per stream ---
+        logging.info(f"Saving final results to {output_csv}...")
+        save_results()
+        logging.info(f"✓ Saved {len(latest_rows)} deduplicated entries to {output_csv}")
         
         logging.info("="*80)
         logging.info("STREAM ANALYSIS COMPLETE")
@@ -875,7 +1099,7 @@ def analyze_streams(config, input_csv, output_csv, fails_csv, ffmpeg_duration, i
         logging.warning("Analysis interrupted. Partial results have been saved.")
         raise
     except Exception as e:
-        logging.error(f"An error occurred during incremental writing or final deduplication: {e}")
+        logging.error(f"An error occurred during analysis or while saving results: {e}")
         import traceback
         logging.error(traceback.format_exc())
         progress_tracker.clear()
@@ -893,7 +1117,8 @@ def score_streams(config, input_csv, output_csv, update_stats=False):
     # Use a DataFrame for easier manipulation
     logging.info(f"Loading input CSV: {input_csv}")
     try:
-        df = pd.read_csv(input_csv)
+        # Columns missing from the file are filled in before writing
+        df = pd.read_csv(input_csv, usecols=_SCORE_INPUT_COLUMNS.__contains__, dtype=_SCORE_TEXT_DTYPES)
         logging.info(f"✓ Loaded {len(df)} stream measurements")
     except FileNotFoundError:
         logging.error(f"Input CSV not found: {input_csv}")
@@ -916,9 +1141,8 @@ def score_streams(config, input_csv, output_csv, update_stats=False):
     if group_ids_str.upper() != 'ALL':
         try:
             target_group_ids = {int(gid.strip()) for gid in group_ids_str.split(',')}
-            df['channel_group_id'] = pd.to_numeric(df['channel_group_id'], errors='coerce')
             before_count = len(df)
-            df = df[df['channel_group_id'].isin(target_group_ids)]
+            df = _filter_by_group(df, target_group_ids)
             logging.info(f"Group filter applied: {before_count} → {len(df)} streams")
         except ValueError:
             logging.error(f"Invalid channel_group_ids in config.ini: '{group_ids_str}'. Aborting score.")
@@ -938,9 +1162,8 @@ def score_streams(config, input_csv, output_csv, update_stats=False):
 
     # Convert types, handling potential errors
     logging.info("Converting data types for scoring...")
-    df['bitrate_kbps'] = pd.to_numeric(df['bitrate_kbps'], errors='coerce')
-    df['frames_decoded'] = pd.to_numeric(df['frames_decoded'], errors='coerce')
-    df['frames_dropped'] = pd.to_numeric(df['frames_dropped'], errors='coerce')
+    for col in ('bitrate_kbps', 'frames_decoded', 'frames_dropped'):
+        df[col] = pd.to_numeric(df[col], errors='coerce')
 
     # Group by stream_id and calculate averages
     logging.info("Calculating averages per stream...")
@@ -960,44 +1183,53 @@ def score_streams(config, input_csv, output_csv, update_stats=False):
     logging.info("Calculating dropped frame percentages...")
     summary['dropped_frame_percentage'] = (summary['avg_frames_dropped'] / summary['avg_frames_decoded'] * 100).fillna(0)
 
-    # Score and Sort
+    # Score and Sort. The score terms are computed on NumPy arrays and only
+    # the columns written to the output are assigned back to the frame.
+    # FPS and the error flags are coerced once here; the frame keeps the
+    # original values for the output.
+    error_columns = ['err_decode', 'err_discontinuity', 'err_timeout']
+    numeric = {
+        col: pd.to_numeric(summary[col], errors='coerce').fillna(0).to_numpy()
+        for col in ['fps', *error_columns]
+    }
+
     logging.info("Calculating scores based on resolution, FPS, bitrate, and errors...")
     RESOLUTION_SCORES = {
         '3840x2160': 100, '1920x1080': 80, '1280x720': 50,
         '960x540': 20, 'Unknown': 0, '': 0
     }
-    summary['resolution_score'] = summary['resolution'].astype(str).str.strip().map(RESOLUTION_SCORES).fillna(0)
+    # Codes of a categorical over the known resolutions index straight into
+    # a score table; unknown resolutions get code -1 and score 0
+    resolutions = pd.Categorical(summary['resolution'].astype(str).str.strip(), categories=list(RESOLUTION_SCORES))
+    resolution_score_table = np.array(list(RESOLUTION_SCORES.values()), dtype=float)
+    resolution_score = np.where(resolutions.codes >= 0, resolution_score_table[resolutions.codes], 0)
     logging.info(f"  Resolution scoring applied")
     
     fps_bonus_points = settings.getint("fps_bonus_points", 55)
-    summary['fps_bonus'] = 0
-    summary.loc[pd.to_numeric(summary['fps'], errors='coerce').fillna(0) >= 50, 'fps_bonus'] = fps_bonus_points
-    high_fps_count = (summary['fps_bonus'] == fps_bonus_points).sum()
-    logging.info(f"  FPS bonus ({fps_bonus_points} pts) applied to {high_fps_count} streams with FPS >= 50")
+    fps = numeric['fps'].astype(float)
+    is_high_fps = fps >= 50
+    fps_bonus = np.where(is_high_fps, fps_bonus_points, 0)
+    logging.info(f"  FPS bonus ({fps_bonus_points} pts) applied to {is_high_fps.sum()} streams with FPS >= 50")
     
-    summary['max_bitrate_for_channel'] = summary.groupby('channel_id')['avg_bitrate_kbps'].transform('max')
-    summary['bitrate_score'] = (summary['avg_bitrate_kbps'] / (summary['max_bitrate_for_channel'] * 0.01)).fillna(0)
+    avg_bitrate = summary['avg_bitrate_kbps'].to_numpy(dtype=float)
+    channel_max_bitrate = summary.groupby('channel_id')['avg_bitrate_kbps'].max()
+    max_bitrate_for_channel = summary['channel_id'].map(channel_max_bitrate).to_numpy(dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        bitrate_score = avg_bitrate / (max_bitrate_for_channel * 0.01)
+    bitrate_score[np.isnan(bitrate_score)] = 0
     logging.info(f"  Bitrate scoring applied (relative to channel max)")
     
-    summary['dropped_frames_penalty'] = summary['dropped_frame_percentage'] * 1
+    dropped_frames_penalty = summary['dropped_frame_percentage'].to_numpy(dtype=float)
     logging.info(f"  Dropped frames penalty calculated")
 
     # Calculate penalty for critical errors
-    error_columns = ['err_decode', 'err_discontinuity', 'err_timeout']
-    for col in error_columns:
-        summary[col] = pd.to_numeric(summary[col], errors='coerce').fillna(0)
-    summary['error_penalty'] = summary[error_columns].sum(axis=1) * 25
-    streams_with_errors = (summary['error_penalty'] > 0).sum()
-    logging.info(f"  Error penalties applied (25 pts each, {streams_with_errors} streams affected)")
-
-    summary['score'] = (
-        summary['bitrate_score'] +
-        summary['resolution_score'] +
-        summary['fps_bonus'] -
-        summary['dropped_frames_penalty'] -
-        summary['error_penalty']
-    )
-    summary.loc[summary['avg_bitrate_kbps'].isna(), 'score'] = -1
+    error_flags = np.column_stack([numeric[col] for col in error_columns])
+    error_penalty = error_flags.sum(axis=1) * 25
+    logging.info(f"  Error penalties applied (25 pts each, {(error_penalty > 0).sum()} streams affected)")
+
+    score = bitrate_score + resolution_score + fps_bonus - dropped_frames_penalty - error_penalty
+    summary['error_penalty'] = error_penalty
+    summary['score'] = np.where(np.isnan(avg_bitrate), -1, score)
     
     logging.info("Sorting streams by channel and score...")
     df_sorted = summary.sort_values(by=['channel_number', 'score'], ascending=[True, False])
@@ -1028,23 +1260,27 @@ def score_streams(config, input_csv, output_csv, update_stats=False):
     logging.info("="*80)
 
 
-def update_stream_stats(csv_path):
-    """Updates stream stats on the server from a CSV file."""
+def update_stream_stats(csv_path, parallelism=8):
+    """Updates stream stats on the server from a CSV file.
+    
+    Each stream needs a GET and a PATCH; up to `parallelism` streams are
+    updated at the same time.
+    """
     base_url = _get_base_url()
     if not base_url:
         logging.error("DISPATCHARR_BASE_URL not set in .env file.")
         return
 
     try:
-        df = pd.read_csv(csv_path)
+        df = pd.read_csv(csv_path, usecols=set(_STREAM_STATS_COLUMNS).__contains__)
     except FileNotFoundError:
         logging.error(f"CSV file not found at: {csv_path}")
         return
 
-    for _, row in df.iterrows():
+    def update_one(row):
         stream_id = row.get("stream_id")
         if not stream_id:
-            continue
+            return
 
         # Construct the stream stats payload from the CSV row
         stream_stats_payload = {
@@ -1060,19 +1296,19 @@ def update_stream_stats(csv_path):
 
         if not stream_stats_payload:
             logging.info(f"No data to update for stream {stream_id}. Skipping.")
-            continue
-
-        # Construct the URL for the specific stream
-        stream_url = f"{base_url}/api/channels/streams/{int(stream_id)}/"
+            return
 
         try:
+            # Construct the URL for the specific stream
+            stream_url = f"{base_url}/api/channels/streams/{int(stream_id)}/"
+
             # Fetch the existing stream data to get the current stream_stats
             existing_stream_data = fetch_data_from_url(stream_url)
             if not existing_stream_data:
                 logging.warning(
                     f"Could not fetch existing data for stream {stream_id}. Skipping."
                 )
-                continue
+                return
 
             # Get the existing stream_stats or an empty dict
             existing_stats = existing_stream_data.get("stream_stats") or {}
@@ -1093,6 +1329,13 @@ def update_stream_stats(csv_path):
         except Exception as e:
             logging.error(f"An error occurred while updating stream {stream_id}: {e}")
 
+    # Plain dicts, built in one pass, instead of a Series per row
+    rows = df.reindex(columns=_STREAM_STATS_COLUMNS).to_dict('records')
+    with ThreadPoolExecutor(max_workers=parallelism) as executor:
+        # Failures are logged per stream, so the results are just drained
+        for _ in executor.map(update_one, rows):
+            pass
+
 
 # --- Reordering Streams ---
 
@@ -1108,14 +1351,15 @@ def reorder_streams(config, input_csv):
         start_range = settings.getint('start_channel', 1)
         end_range = settings.getint('end_channel', 999)
         group_ids_str = settings.get('channel_group_ids', 'ALL').strip()
+        parallelism = max(1, settings.getint('fetch_parallelism', 8))
         logging.info(f"Filter settings - Groups: {group_ids_str}, Channel range: {start_range}-{end_range}")
     except ValueError:
-        logging.error("Invalid start_channel or end_channel in config.ini. Aborting reorder.")
+        logging.error("Invalid start_channel, end_channel or fetch_parallelism in config.ini. Aborting reorder.")
         return
 
     logging.info(f"Loading scored CSV: {input_csv}")
     try:
-        df = pd.read_csv(input_csv)
+        df = pd.read_csv(input_csv, engine=_CSV_ENGINE, usecols=_REORDER_INPUT_COLUMNS)
         logging.info(f"✓ Loaded {len(df)} scored streams")
     except FileNotFoundError:
         logging.error(f"Error: {input_csv} not found. Please run the 'score' command first.")
@@ -1125,9 +1369,8 @@ def reorder_streams(config, input_csv):
     if group_ids_str.upper() != 'ALL':
         try:
             target_group_ids = {int(gid.strip()) for gid in group_ids_str.split(',')}
-            df['channel_group_id'] = pd.to_numeric(df['channel_group_id'], errors='coerce')
             before_count = len(df)
-            df = df[df['channel_group_id'].isin(target_group_ids)]
+            df = _filter_by_group(df, target_group_ids)
             logging.info(f"Group filter applied: {before_count} → {len(df)} streams")
         except ValueError:
             logging.error(f"Invalid channel_group_ids in config.ini: '{group_ids_str}'. Aborting reorder.")
@@ -1151,48 +1394,79 @@ def reorder_streams(config, input_csv):
     df['channel_id'] = df['channel_id'].astype(int)
 
     grouped = df.groupby("channel_id")
-    logging.info(f"Reordering streams for {len(grouped)} channels...")
+    total_channels = len(grouped)
+
+    # Channel objects list their current stream IDs, so one request for the
+    # channel list replaces a request per channel. Channels missing from it,
+    # or listed without stream IDs, are still fetched on their own.
+    current_ids_by_channel = {}
+    all_channels = fetch_data_from_url(f"{_get_base_url()}/api/channels/channels/", etag_file=_HTTP_CACHE_DIR / 'channels.json')
+    for channel in all_channels or []:
+        if isinstance(channel.get('streams'), list):
+            current_ids_by_channel[channel.get('id')] = [
+                s['id'] if isinstance(s, dict) else s for s in channel['streams']
+            ]
+    logging.info(f"Loaded current streams of {len(current_ids_by_channel)} channels from the channel list")
+
+    logging.info(f"Reordering streams for {total_channels} channels...")
     logging.info("="*80)
 
-    success_count = 0
-    skip_count = 0
-    error_count = 0
-
-    for idx, (channel_id, group) in enumerate(grouped, 1):
+    def reorder_one(idx, channel_id, group):
+        """Reorders one channel; returns 'success', 'skip' or 'error'."""
         sorted_stream_ids_from_csv = group["stream_id"].tolist()
         channel_number = group["channel_number"].iloc[0]
         
-        logging.info(f"[{idx}/{len(grouped)}] Processing channel {channel_number} (ID: {channel_id})...")
+        logging.info(f"[{idx}/{total_channels}] Processing channel {channel_number} (ID: {channel_id})...")
         logging.info(f"  CSV has {len(sorted_stream_ids_from_csv)} sorted streams")
         
-        current_streams_from_api = fetch_channel_streams(channel_id)
-        if current_streams_from_api is None:
-            logging.warning(f"  ✗ Could not fetch current streams for channel ID {channel_id}. Skipping reorder.")
-            skip_count += 1
-            continue
-
-        logging.info(f"  API has {len(current_streams_from_api)} current streams")
+        current_stream_ids = current_ids_by_channel.get(channel_id)
+        if current_stream_ids is None:
+            current_streams_from_api = fetch_channel_streams(channel_id)
+            if current_streams_from_api is None:
+                logging.warning(f"  ✗ Could not fetch current streams for channel ID {channel_id}. Skipping reorder.")
+                return 'skip'
+            current_stream_ids = [s['id'] for s in current_streams_from_api]
+
+        logging.info(f"  API has {len(current_stream_ids)} current streams")
         
-        current_stream_ids_set = {s['id'] for s in current_streams_from_api}
-        validated_sorted_ids = [sid for sid in sorted_stream_ids_from_csv if sid in current_stream_ids_set]
+        # One pass over the API streams collects the current IDs and the
+        # ones the CSV has no score for, in the order the API lists them
         csv_ids_set = set(sorted_stream_ids_from_csv)
-        new_unscored_ids = [sid for sid in current_stream_ids_set if sid not in csv_ids_set]
+        current_stream_ids_set = set()
+        new_unscored_ids = []
+        for sid in current_stream_ids:
+            if sid not in current_stream_ids_set:
+                current_stream_ids_set.add(sid)
+                if sid not in csv_ids_set:
+                    new_unscored_ids.append(sid)
+        validated_sorted_ids = [sid for sid in sorted_stream_ids_from_csv if sid in current_stream_ids_set]
         final_stream_id_list = validated_sorted_ids + new_unscored_ids
         
         if not final_stream_id_list:
             logging.warning(f"  ✗ No valid streams to reorder for channel ID {channel_id}. Skipping.")
-            skip_count += 1
-            continue
+            return 'skip'
         
         logging.info(f"  Final order: {len(validated_sorted_ids)} scored + {len(new_unscored_ids)} unscored = {len(final_stream_id_list)} total")
         
         try:
             update_channel_streams(channel_id, final_stream_id_list)
             logging.info(f"  ✓ Successfully reordered streams for channel {channel_number} (ID: {channel_id})")
-            success_count += 1
+            return 'success'
         except Exception as e:
             logging.error(f"  ✗ Exception while reordering streams for channel ID {channel_id}: {e}")
-            error_count += 1
+            return 'error'
+
+    # Channels are independent, so their fetch + update round trips overlap;
+    # the counters are only touched by this thread as results come in
+    outcomes = {'success': 0, 'skip': 0, 'error': 0}
+    with ThreadPoolExecutor(max_workers=parallelism) as executor:
+        futures = [
+            executor.submit(reorder_one, idx, channel_id, group)
+            for idx, (channel_id, group) in enumerate(grouped, 1)
+        ]
+        for future in as_completed(futures):
+            outcomes[future.result()] += 1
+    success_count, skip_count, error_count = outcomes['success'], outcomes['skip'], outcomes['error']
 
     logging.info("="*80)
     logging.info(f"REORDER COMPLETE")
@@ -1238,33 +1512,51 @@ def retry_failed_streams(config, input_csv, fails_csv, ffmpeg_duration, idet_fra
     completed_streams = 0
     progress_tracker.update(0, total_streams, 'Starting retry...')
 
-    # Process streams synchronously (one at a time)
-    for row in failed_streams:
+    def _run(row):
         try:
-            result_row = _analyze_stream_task(row, ffmpeg_duration, idet_frames, timeout, 0, 0, config, user_agent)
-            completed_streams += 1
-            stream_id = result_row.get('stream_id')
-            stream_name = result_row.get('stream_name', 'Unknown')
-            
-            # Update progress
-            progress_tracker.update(completed_streams, total_streams, stream_name)
-            percentage = round((completed_streams / total_streams * 100), 1)
-            logging.info(f"Retry Progress: {completed_streams}/{total_streams} ({percentage}%) - {stream_name}")
-            
-            if stream_id:
-                updated_rows[stream_id] = result_row
+            return row, _analyze_stream_task(row, ffmpeg_duration, idet_frames, timeout, 0, 0, config, user_agent), None
         except Exception as exc:
+            return row, None, exc
+
+    # Failed streams are usually the slow ones, so they are retried
+    # concurrently; the per-provider semaphore in _analyze_stream_task
+    # still serializes streams from the same provider. Results are
+    # merged from this thread only, so updated_rows needs no lock.
+    workers = max(1, min(total_streams, max_workers))
+    executor = ThreadPoolExecutor(max_workers=workers)
+    try:
+        futures = [executor.submit(_run, row) for row in failed_streams]
+        for future in as_completed(futures):
+            row, result_row, exc = future.result()
             completed_streams += 1
-            stream_name = row.get('stream_name', 'Unknown')
-            
-            # Update progress
-            progress_tracker.update(completed_streams, total_streams, stream_name)
-            percentage = round((completed_streams / total_streams * 100), 1)
-            logging.error(f'Retry Progress: {completed_streams}/{total_streams} ({percentage}%) - Stream {stream_name} generated an exception during retry: {exc}')
-            
-            row.update({'timestamp': datetime.now().isoformat(), 'status': "Retry Exception"})
-            updated_rows[row['stream_id']] = row
-    
+
+            if exc is None:
+                stream_id = result_row.get('stream_id')
+                stream_name = result_row.get('stream_name', 'Unknown')
+
+                # Update progress
+                progress_tracker.update(completed_streams, total_streams, stream_name)
+                percentage = round((completed_streams / total_streams * 100), 1)
+                logging.info(f"Retry Progress: {completed_streams}/{total_streams} ({percentage}%) - {stream_name}")
+
+                if stream_id:
+                    updated_rows[stream_id] = result_row
+            else:
+                stream_name = row.get('stream_name', 'Unknown')
+
+                # Update progress
+                progress_tracker.update(completed_streams, total_streams, stream_name)
+                percentage = round((completed_streams / total_streams * 100), 1)
+                logging.error(f'Retry Progress: {completed_streams}/{total_streams} ({percentage}%) - Stream {stream_name} generated an exception during retry: {exc}')
+
+                row.update({'timestamp': datetime.now().isoformat(), 'status': "Retry Exception"})
+                updated_rows[row['stream_id']] = row
+    except KeyboardInterrupt:
+        logging.warning(f"\n\n⚠️  INTERRUPTED BY USER - Saving the {completed_streams}/{total_streams} retries completed so far...")
+    finally:
+        # Every future is done on a normal exit; otherwise drop the queued ones
+        executor.shutdown(wait=False, cancel_futures=True)
+
     # Clear progress when complete
     progress_tracker.clear()
 
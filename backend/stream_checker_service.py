@@ -20,9 +20,12 @@ integrates with the dispatcharr-stream-sorter.py module for actual
 stream analysis.
 """
 
+import atexit
 import json
 import logging
 import os
+import re
+import tempfile
 import threading
 import time
 from collections import defaultdict, deque
@@ -31,6 +34,8 @@ from pathlib import Path
 from typing import Dict, List, Optional, Set, Tuple, Any
 import queue
 
+import orjson
+
 from api_utils import (
     fetch_channel_streams,
     fetch_data_from_url,
@@ -47,25 +52,21 @@ except ImportError:
     CHANGELOG_AVAILABLE = False
     logging.warning("ChangelogManager not available. Stream check changelog will be disabled.")
 
+# HTTP request/response indicators, matched in a single case-insensitive scan
+_HTTP_LOG_RE = re.compile(
+    r'http request|http response|status code'
+    r'|(?:get|post|put|delete|patch) /'
+    r'|" with'
+    r'|- - \['  # Common HTTP access log format
+    r'|werkzeug',
+    re.IGNORECASE
+)
+
 # Custom logging filter to exclude HTTP-related logs
 class HTTPLogFilter(logging.Filter):
     """Filter out HTTP-related log messages."""
     def filter(self, record):
-        message = record.getMessage().lower()
-        http_indicators = [
-            'http request',
-            'http response',
-            'status code',
-            'get /',
-            'post /',
-            'put /',
-            'delete /',
-            'patch /',
-            '" with',
-            '- - [',
-            'werkzeug',
-        ]
-        return not any(indicator in message for indicator in http_indicators)
+        return _HTTP_LOG_RE.search(record.getMessage()) is None
 
 # Setup logging
 logging.basicConfig(
@@ -79,6 +80,11 @@ for handler in logging.root.handlers:
 # Configuration directory
 CONFIG_DIR = Path(os.environ.get('CONFIG_DIR', '/app/data'))
 
+# The channel update log is compacted once it holds this many times more
+# lines than there are channels (with a floor for small setups)
+_TRACKER_COMPACT_FACTOR = 4
+_TRACKER_MIN_COMPACT_CHANNELS = 25
+
 
 class StreamCheckConfig:
     """Configuration for stream checking service."""
@@ -229,35 +235,210 @@ class StreamCheckConfig:
 
 
 class ChannelUpdateTracker:
-    """Tracks which channels have received M3U updates."""
+    """Tracks which channels have received M3U updates.
+    
+    The data is persisted as JSON Lines: one record per channel plus one
+    for the last global check, where later records replace earlier ones.
+    Mutations only flag the changed channels as dirty; a background thread
+    appends their records at most once per second and compacts the file
+    once it has grown well beyond the number of channels.
+    """
     
     def __init__(self, tracker_file=None):
         if tracker_file is None:
-            tracker_file = CONFIG_DIR / 'channel_updates.json'
+            tracker_file = CONFIG_DIR / 'channel_updates.jsonl'
         self.tracker_file = Path(tracker_file)
+        self._legacy_file = None
+        self._log_lines = 0
+        self._needs_compaction = False
         self.updates = self._load_updates()
         self.lock = threading.Lock()
-        # Ensure the file is created on initialization
-        self._save_updates()
+        self._publish_force_checks()
+        # Serializes writers so an older snapshot never replaces a newer one
+        self._write_lock = threading.Lock()
+        self._dirty_channels: Set[str] = set()
+        self._global_dirty = False
+        # Ensure the file is created on initialization; an existing log
+        # already holds what was just loaded, so it is not rewritten
+        if not self.tracker_file.exists():
+            self._needs_compaction = True
+        if self._needs_compaction:
+            self.tracker_file.parent.mkdir(parents=True, exist_ok=True)
+            self._flush()
+        
+        self._dirty = threading.Event()
+        self._stop = threading.Event()
+        self._flusher = threading.Thread(target=self._flush_loop, daemon=True)
+        self._flusher.start()
+        # The writer is a daemon thread, so pending changes are written on
+        # interpreter exit even if close() is never called
+        atexit.register(self.close)
     
     def _load_updates(self) -> Dict:
-        """Load update tracking data."""
-        if self.tracker_file.exists():
+        """Load update tracking data by replaying the record log.
+        
+        A tracker saved as a single JSON object, either in the tracker
+        file itself or in a legacy ``.json`` file next to it, is loaded
+        as-is and converted on the first write.
+        """
+        updates = {'channels': {}, 'last_global_check': None}
+        source = self.tracker_file
+        if not source.exists() and source.suffix == '.jsonl':
+            source = source.with_suffix('.json')
+        if not source.exists():
+            return updates
+        
+        try:
+            raw = source.read_bytes()
+        except FileNotFoundError:
+            return updates
+        
+        try:
+            legacy = orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            legacy = None
+        if isinstance(legacy, dict) and 'channels' in legacy:
+            updates.update(legacy)
+            self._needs_compaction = True
+            if source != self.tracker_file:
+                self._legacy_file = source
+            logging.info(f"Converting channel updates in {source} to {self.tracker_file}")
+            return updates
+        
+        skipped = 0
+        for line in raw.splitlines():
+            if not line.strip():
+                continue
             try:
-                with open(self.tracker_file, 'r') as f:
-                    return json.load(f)
-            except (json.JSONDecodeError, FileNotFoundError):
-                logging.warning(f"Could not load updates from {self.tracker_file}, creating new")
-        return {'channels': {}, 'last_global_check': None}
+                record = orjson.loads(line)
+            except orjson.JSONDecodeError:
+                skipped += 1
+                continue
+            self._log_lines += 1
+            if 'channel' in record:
+                updates['channels'][record['channel']] = record['info']
+            elif 'last_global_check' in record:
+                updates['last_global_check'] = record['last_global_check']
+        
+        if skipped:
+            logging.warning(f"Skipped {skipped} malformed lines in {self.tracker_file}")
+            self._needs_compaction = True
+        return updates
     
-    def _save_updates(self):
-        """Save update tracking data."""
+    def _publish_force_checks(self):
+        """Rebuild the set of channels flagged for a force check.
+        
+        Called with the lock held after any mutation that can change a
+        force_check flag. The set is replaced, never mutated, so
+        should_force_check() can read it without locking.
+        """
+        self._force_checks = frozenset(
+            key for key, info in self.updates.get('channels', {}).items()
+            if info.get('force_check', False)
+        )
+    
+    def _mark_dirty(self, channel_keys=()):
+        """Queue records for the background writer. Called with the lock held."""
+        self._dirty_channels.update(channel_keys)
+        self._dirty.set()
+    
+    def _flush(self):
+        """Append records for the channels changed since the last write.
+        
+        The log is rewritten as one record per channel instead once it
+        holds several times more lines than there are channels, or after a
+        failed write. Records are serialized under the lock but written
+        outside it, so readers never wait on disk I/O.
+        """
+        with self._write_lock:
+            with self.lock:
+                channels = self.updates.get('channels', {})
+                dirty_channels, self._dirty_channels = self._dirty_channels, set()
+                global_dirty, self._global_dirty = self._global_dirty, False
+                
+                limit = _TRACKER_COMPACT_FACTOR * max(len(channels), _TRACKER_MIN_COMPACT_CHANNELS)
+                compact = (self._needs_compaction
+                           or self._log_lines + len(dirty_channels) + global_dirty > limit)
+                if compact:
+                    dirty_channels = channels.keys()
+                    global_dirty = True
+                
+                records = []
+                if global_dirty:
+                    records.append(orjson.dumps({'last_global_check': self.updates.get('last_global_check')}))
+                for key in dirty_channels:
+                    if key in channels:
+                        records.append(orjson.dumps({'channel': key, 'info': channels[key]}))
+            
+            if not records:
+                return
+            data = b'\n'.join(records) + b'\n'
+            
+            try:
+                if compact:
+                    self._replace_file(data)
+                    self._log_lines = len(records)
+                    self._needs_compaction = False
+                    if self._legacy_file is not None:
+                        self._legacy_file.unlink(missing_ok=True)
+                        self._legacy_file = None
+                else:
+                    with open(self.tracker_file, 'ab') as f:
+                        f.write(data)
+                        f.flush()
+                        os.fsync(f.fileno())
+                    self._log_lines += len(records)
+            except Exception as e:
+                # A partial append may have been left behind; rewrite it all next time
+                self._needs_compaction = True
+                logging.error(f"Failed to save channel updates: {e}")
+    
+    def _replace_file(self, data: bytes):
+        """Write data to a temp file and move it into place.
+        
+        A crash mid-write leaves the previous file intact instead of a
+        truncated one.
+        """
+        fd, temp_path = tempfile.mkstemp(
+            prefix=self.tracker_file.name + '.',
+            suffix='.tmp',
+            dir=str(self.tracker_file.parent)
+        )
         try:
-            self.tracker_file.parent.mkdir(parents=True, exist_ok=True)
-            with open(self.tracker_file, 'w') as f:
-                json.dump(self.updates, f, indent=2)
-        except Exception as e:
-            logging.error(f"Failed to save channel updates: {e}")
+            try:
+                os.write(fd, data)
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+            os.replace(temp_path, self.tracker_file)
+        except BaseException:
+            Path(temp_path).unlink(missing_ok=True)
+            raise
+    
+    def _flush_loop(self):
+        """Write pending changes until close() is called."""
+        while not self._stop.is_set():
+            if self._dirty.wait(timeout=1.0):
+                self._dirty.clear()
+                self._flush()
+    
+    def flush(self):
+        """Write pending changes now, waiting for any write in progress.
+        
+        Unlike close(), the background writer keeps running afterwards.
+        """
+        self._dirty.clear()
+        self._flush()
+    
+    def close(self):
+        """Stop the background writer and write any pending changes."""
+        atexit.unregister(self.close)
+        self._stop.set()
+        self._dirty.set()
+        self._flusher.join(timeout=5)
+        if self._dirty.is_set():
+            self._dirty.clear()
+            self._flush()
     
     def mark_channel_updated(self, channel_id: int, timestamp: str = None, stream_count: int = None):
         """Mark a channel as having received an update.
@@ -271,32 +452,21 @@ class ChannelUpdateTracker:
             timestamp = datetime.now().isoformat()
         
         with self.lock:
-            if 'channels' not in self.updates:
-                self.updates['channels'] = {}
-            
+            channels = self.updates.setdefault('channels', {})
             channel_key = str(channel_id)
             
             # Always mark channel as needing check if stream count changed
             # This ensures new streams are analyzed even during invulnerability period
-            if channel_key in self.updates['channels']:
-                channel_info = self.updates['channels'][channel_key]
+            channel_info = channels.get(channel_key)
+            channels[channel_key] = {
+                'last_update': timestamp,
+                'needs_check': True,
+                'stream_count': stream_count,
                 # Preserve checked_stream_ids if they exist
-                checked_stream_ids = channel_info.get('checked_stream_ids', [])
-                
-                self.updates['channels'][channel_key] = {
-                    'last_update': timestamp,
-                    'needs_check': True,
-                    'stream_count': stream_count,
-                    'checked_stream_ids': checked_stream_ids
-                }
-            else:
-                self.updates['channels'][channel_key] = {
-                    'last_update': timestamp,
-                    'needs_check': True,
-                    'stream_count': stream_count,
-                    'checked_stream_ids': []
-                }
-            self._save_updates()
+                'checked_stream_ids': channel_info.get('checked_stream_ids', []) if channel_info is not None else []
+            }
+            self._publish_force_checks()
+            self._mark_dirty([channel_key])
     
     def mark_channels_updated(self, channel_ids: List[int], timestamp: str = None, stream_counts: Dict[int, int] = None):
         """Mark multiple channels as updated.
@@ -315,36 +485,25 @@ class ChannelUpdateTracker:
         marked_count = 0
         
         with self.lock:
-            if 'channels' not in self.updates:
-                self.updates['channels'] = {}
+            channels = self.updates.setdefault('channels', {})
             
             for channel_id in channel_ids:
                 channel_key = str(channel_id)
-                stream_count = stream_counts.get(channel_id)
                 
                 # Always mark channel if stream count changed (new streams added)
-                # Preserve checked_stream_ids if they exist
-                if channel_key in self.updates['channels']:
-                    channel_info = self.updates['channels'][channel_key]
-                    checked_stream_ids = channel_info.get('checked_stream_ids', [])
-                    
-                    self.updates['channels'][channel_key] = {
-                        'last_update': timestamp,
-                        'needs_check': True,
-                        'stream_count': stream_count,
-                        'checked_stream_ids': checked_stream_ids
-                    }
-                else:
-                    self.updates['channels'][channel_key] = {
-                        'last_update': timestamp,
-                        'needs_check': True,
-                        'stream_count': stream_count,
-                        'checked_stream_ids': []
-                    }
+                channel_info = channels.get(channel_key)
+                channels[channel_key] = {
+                    'last_update': timestamp,
+                    'needs_check': True,
+                    'stream_count': stream_counts.get(channel_id),
+                    # Preserve checked_stream_ids if they exist
+                    'checked_stream_ids': channel_info.get('checked_stream_ids', []) if channel_info is not None else []
+                }
                 marked_count += 1
             
             if marked_count > 0:
-                self._save_updates()
+                self._publish_force_checks()
+                self._mark_dirty(str(channel_id) for channel_id in channel_ids)
         
         logging.info(f"Marked {marked_count} channels as updated")
     
@@ -388,7 +547,7 @@ class ChannelUpdateTracker:
                         break
             
             if channels:
-                self._save_updates()
+                self._mark_dirty(str(channel_id) for channel_id in channels)
                 logging.debug(f"Atomically retrieved and cleared {len(channels)} channels needing check")
             
             return channels
@@ -406,27 +565,26 @@ class ChannelUpdateTracker:
             timestamp = datetime.now().isoformat()
         
         with self.lock:
-            if 'channels' not in self.updates:
-                self.updates['channels'] = {}
-            
+            channels = self.updates.setdefault('channels', {})
             channel_key = str(channel_id)
-            if channel_key in self.updates['channels']:
+            channel_info = channels.get(channel_key)
+            if channel_info is not None:
                 # Update existing entry
-                self.updates['channels'][channel_key]['needs_check'] = False
-                self.updates['channels'][channel_key]['last_check'] = timestamp
+                channel_info['needs_check'] = False
+                channel_info['last_check'] = timestamp
                 if stream_count is not None:
-                    self.updates['channels'][channel_key]['stream_count'] = stream_count
+                    channel_info['stream_count'] = stream_count
                 if checked_stream_ids is not None:
-                    self.updates['channels'][channel_key]['checked_stream_ids'] = checked_stream_ids
+                    channel_info['checked_stream_ids'] = checked_stream_ids
             else:
                 # Create new entry
-                self.updates['channels'][channel_key] = {
+                channels[channel_key] = {
                     'needs_check': False,
                     'last_check': timestamp,
                     'stream_count': stream_count,
                     'checked_stream_ids': checked_stream_ids if checked_stream_ids is not None else []
                 }
-            self._save_updates()
+            self._mark_dirty([channel_key])
     
     def get_checked_stream_ids(self, channel_id: int) -> List[int]:
         """Get the list of stream IDs that have been checked for a channel.
@@ -437,11 +595,11 @@ class ChannelUpdateTracker:
         Returns:
             List of stream IDs that have been checked (empty list if none or channel not tracked)
         """
-        with self.lock:
-            channel_key = str(channel_id)
-            if channel_key in self.updates.get('channels', {}):
-                return self.updates['channels'][channel_key].get('checked_stream_ids', [])
-            return []
+        # Single dict lookups are atomic, so no lock is needed to read
+        channel_info = self.updates.get('channels', {}).get(str(channel_id))
+        if channel_info is not None:
+            return channel_info.get('checked_stream_ids', [])
+        return []
     
     def mark_channel_for_force_check(self, channel_id: int):
         """Mark a channel for force checking (bypasses 2-hour immunity).
@@ -449,16 +607,24 @@ class ChannelUpdateTracker:
         Args:
             channel_id: The channel ID to mark for force check
         """
+        self.mark_channels_for_force_check([channel_id])
+    
+    def mark_channels_for_force_check(self, channel_ids: List[int]):
+        """Mark multiple channels for force checking in a single update.
+        
+        Args:
+            channel_ids: List of channel IDs to mark for force check
+        """
+        if not channel_ids:
+            return
+        
         with self.lock:
-            if 'channels' not in self.updates:
-                self.updates['channels'] = {}
-            
-            channel_key = str(channel_id)
-            if channel_key not in self.updates['channels']:
-                self.updates['channels'][channel_key] = {}
-            
-            self.updates['channels'][channel_key]['force_check'] = True
-            self._save_updates()
+            channels = self.updates.setdefault('channels', {})
+            channel_keys = [str(channel_id) for channel_id in channel_ids]
+            for channel_key in channel_keys:
+                channels.setdefault(channel_key, {})['force_check'] = True
+            self._publish_force_checks()
+            self._mark_dirty(channel_keys)
     
     def should_force_check(self, channel_id: int) -> bool:
         """Check if a channel should be force checked (bypassing immunity).
@@ -469,11 +635,7 @@ class ChannelUpdateTracker:
         Returns:
             True if force check is enabled for this channel
         """
-        with self.lock:
-            channel_key = str(channel_id)
-            if channel_key in self.updates.get('channels', {}):
-                return self.updates['channels'][channel_key].get('force_check', False)
-            return False
+        return str(channel_id) in self._force_checks
     
     def clear_force_check(self, channel_id: int):
         """Clear the force check flag for a channel.
@@ -483,9 +645,11 @@ class ChannelUpdateTracker:
         """
         with self.lock:
             channel_key = str(channel_id)
-            if channel_key in self.updates.get('channels', {}):
-                self.updates['channels'][channel_key]['force_check'] = False
-                self._save_updates()
+            channel_info = self.updates.get('channels', {}).get(channel_key)
+            if channel_info is not None:
+                channel_info['force_check'] = False
+                self._publish_force_checks()
+                self._mark_dirty([channel_key])
     
     def mark_global_check(self, timestamp: str = None):
         """Mark that a global check was initiated.
@@ -499,7 +663,8 @@ class ChannelUpdateTracker:
         
         with self.lock:
             self.updates['last_global_check'] = timestamp
-            self._save_updates()
+            self._global_dirty = True
+            self._mark_dirty()
     
     def get_last_global_check(self) -> Optional[str]:
         """Get timestamp of last global check."""
@@ -720,7 +885,7 @@ class StreamCheckerService:
         self.changelog = None
         if CHANGELOG_AVAILABLE:
             try:
-                self.changelog = ChangelogManager(changelog_file=CONFIG_DIR / "stream_checker_changelog.json")
+                self.changelog = ChangelogManager(changelog_file=CONFIG_DIR / "stream_checker_changelog.jsonl")
                 logging.info("Stream checker changelog manager initialized")
             except Exception as e:
                 logging.warning(f"Failed to initialize changelog manager: {e}")
@@ -775,6 +940,9 @@ class StreamCheckerService:
         if self.scheduler_thread and self.scheduler_thread.is_alive():
             self.scheduler_thread.join(timeout=5)
         
+        # Persist tracker changes still waiting for the background writer
+        self.update_tracker.flush()
+        
         self.progress.clear()
         logging.info("Stream checker service stopped")
     
@@ -1023,8 +1191,7 @@ class StreamCheckerService:
                 
                 if force_check:
                     # Mark all channels for force check (bypasses immunity)
-                    for channel_id in channel_ids:
-                        self.update_tracker.mark_channel_for_force_check(channel_id)
+                    self.update_tracker.mark_channels_for_force_check(channel_ids)
                 
                 # Remove channels from completed set to allow re-queueing
                 # This is necessary for global checks to re-check all channels
@@ -1188,6 +1355,31 @@ class StreamCheckerService:
             
             # Load sorter configuration
             sorter_config = load_sorter_config()
+            analysis_params = self.config.get('stream_analysis', {})
+            
+            # Streams sharing a URL are the same feed, so each URL is only
+            # probed once per channel check
+            analyzed_by_url = {}
+            
+            def analyze_stream(stream_row):
+                url = stream_row['stream_url']
+                previous = analyzed_by_url.get(url) if url else None
+                if previous is not None:
+                    logging.info(f"Stream {stream_row['stream_id']} has the same URL as stream {previous['stream_id']}, reusing its analysis")
+                    return {**previous, **stream_row}
+                analyzed = _analyze_stream_task(
+                    stream_row,
+                    ffmpeg_duration=analysis_params.get('ffmpeg_duration', 20),
+                    idet_frames=analysis_params.get('idet_frames', 500),
+                    timeout=analysis_params.get('timeout', 30),
+                    retries=analysis_params.get('retries', 1),
+                    retry_delay=analysis_params.get('retry_delay', 10),
+                    config=sorter_config,
+                    user_agent=analysis_params.get('user_agent', 'VLC/3.0.14')
+                )
+                if url:
+                    analyzed_by_url[url] = analyzed
+                return analyzed
             
             # Analyze new/unchecked streams
             analyzed_streams = []
@@ -1215,17 +1407,7 @@ class StreamCheckerService:
                 }
                 
                 # Analyze stream
-                analysis_params = self.config.get('stream_analysis', {})
-                analyzed = _analyze_stream_task(
-                    stream_row,
-                    ffmpeg_duration=analysis_params.get('ffmpeg_duration', 20),
-                    idet_frames=analysis_params.get('idet_frames', 500),
-                    timeout=analysis_params.get('timeout', 30),
-                    retries=analysis_params.get('retries', 1),
-                    retry_delay=analysis_params.get('retry_delay', 10),
-                    config=sorter_config,
-                    user_agent=analysis_params.get('user_agent', 'VLC/3.0.14')
-                )
+                analyzed = analyze_stream(stream_row)
                 
                 # Update stream stats on dispatcharr with ffmpeg-extracted data
                 self._update_stream_stats(analyzed)
@@ -1285,17 +1467,7 @@ class StreamCheckerService:
                         'stream_name': stream.get('name', 'Unknown'),
                         'stream_url': stream.get('url', '')
                     }
-                    analysis_params = self.config.get('stream_analysis', {})
-                    analyzed = _analyze_stream_task(
-                        stream_row,
-                        ffmpeg_duration=analysis_params.get('ffmpeg_duration', 20),
-                        idet_frames=analysis_params.get('idet_frames', 500),
-                        timeout=analysis_params.get('timeout', 30),
-                        retries=analysis_params.get('retries', 1),
-                        retry_delay=analysis_params.get('retry_delay', 10),
-                        config=sorter_config,
-                        user_agent=analysis_params.get('user_agent', 'VLC/3.0.14')
-                    )
+                    analyzed = analyze_stream(stream_row)
                     self._update_stream_stats(analyzed)
                     score = self._calculate_stream_score(analyzed)
                     analyzed['score'] = score
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Unit tests for AutomatedStreamManager.get_status().
+
+This module tests that the reported playlist update times follow changes
+to the last update and to the configured interval.
+"""
+
+import unittest
+import tempfile
+from datetime import datetime
+from pathlib import Path
+from unittest.mock import patch
+import sys
+import os
+
+# Add backend to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from automated_stream_manager import AutomatedStreamManager
+
+
+class TestAutomationStatus(unittest.TestCase):
+    """Test the playlist update times in the automation status."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        with patch('automated_stream_manager.CONFIG_DIR', Path(self.temp_dir)):
+            self.manager = AutomatedStreamManager()
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        import shutil
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_no_update_yet(self):
+        """Test that the next update is immediate before the first refresh."""
+        status = self.manager.get_status()
+
+        self.assertIsNone(status['last_playlist_update'])
+        self.assertEqual(status['next_playlist_update'], 'immediate')
+
+    def test_times_follow_last_update(self):
+        """Test that a new refresh time is reflected in the status."""
+        self.manager.last_playlist_update = datetime(2024, 1, 1, 12, 0)
+        status = self.manager.get_status()
+        self.assertEqual(status['last_playlist_update'], '2024-01-01T12:00:00')
+        self.assertEqual(status['next_playlist_update'], '2024-01-01T12:05:00')
+
+        self.manager.last_playlist_update = datetime(2024, 1, 1, 13, 0)
+        status = self.manager.get_status()
+        self.assertEqual(status['next_playlist_update'], '2024-01-01T13:05:00')
+
+    def test_times_follow_interval_changes(self):
+        """Test that changing the interval updates the next update time."""
+        self.manager.last_playlist_update = datetime(2024, 1, 1, 12, 0)
+        self.manager.get_status()
+
+        self.manager.update_config({'playlist_update_interval_minutes': 30})
+
+        self.assertEqual(self.manager.get_status()['next_playlist_update'], '2024-01-01T12:30:00')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -68,6 +68,19 @@ class TestAutostartConfiguration(unittest.TestCase):
             manager2 = AutomatedStreamManager()
             self.assertEqual(manager2.config['autostart_automation'], False)
 
+    def test_failed_save_keeps_previous_config(self):
+        """Test that an interrupted save leaves the previous config file intact."""
+        with patch('automated_stream_manager.CONFIG_DIR', Path(self.temp_dir)):
+            manager = AutomatedStreamManager()
+            manager.update_config({'autostart_automation': True})
+            
+            with patch('automated_stream_manager.json.dump', side_effect=OSError("disk full")):
+                with self.assertRaises(OSError):
+                    manager._save_config({'autostart_automation': False})
+            
+            with open(manager.config_file) as f:
+                self.assertTrue(json.load(f)['autostart_automation'])
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the concurrent bulk channel update helpers.
+
+This module tests that bulk_update_channels() and
+bulk_add_streams_to_channels() update every channel and isolate
+per-channel failures.
+"""
+
+import unittest
+from unittest.mock import patch
+import sys
+import os
+
+# Add backend to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class TestBulkChannelUpdates(unittest.TestCase):
+    """Test the bulk channel update helpers."""
+
+    @patch('api_utils.update_channel_streams')
+    def test_bulk_update_reports_each_channel(self, mock_update):
+        """Test that every channel is updated and failures are reported as False."""
+        from api_utils import bulk_update_channels
+
+        def fake_update(channel_id, stream_ids):
+            if channel_id == 2:
+                raise RuntimeError("boom")
+            return True
+
+        mock_update.side_effect = fake_update
+
+        results = bulk_update_channels({1: [10], 2: [20], 3: [30]}, concurrency=2)
+
+        self.assertEqual(results, {1: True, 2: False, 3: True})
+        self.assertEqual(mock_update.call_count, 3)
+
+    @patch('api_utils.add_streams_to_channel')
+    def test_bulk_add_omits_failed_channels(self, mock_add):
+        """Test that added counts are returned and failed channels are left out."""
+        from api_utils import bulk_add_streams_to_channels
+
+        def fake_add(channel_id, stream_ids):
+            if channel_id == 2:
+                raise ValueError("Could not fetch current streams")
+            return len(stream_ids)
+
+        mock_add.side_effect = fake_add
+
+        results = bulk_add_streams_to_channels({1: [10, 11], 2: [20], 3: [30]})
+
+        self.assertEqual(results, {1: 2, 3: 1})
+
+    def test_empty_mapping_makes_no_requests(self):
+        """Test that an empty mapping returns immediately."""
+        from api_utils import bulk_update_channels
+
+        self.assertEqual(bulk_update_channels({}), {})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the JSON Lines changelog storage.
+
+This module tests that ChangelogManager appends one line per entry,
+migrates changelogs saved as a single JSON array, tolerates malformed
+lines, and bounds the retained history.
+"""
+
+import json
+import unittest
+import tempfile
+from datetime import datetime, timedelta
+from pathlib import Path
+import sys
+import os
+
+# Add backend to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from automated_stream_manager import ChangelogManager
+
+
+def _entry(action='stream_check', age_days=0):
+    return {
+        'timestamp': (datetime.now() - timedelta(days=age_days)).isoformat(),
+        'action': action,
+        'details': {'success': True}
+    }
+
+
+class TestChangelogJsonl(unittest.TestCase):
+    """Test JSON Lines changelog storage."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.changelog_file = self.temp_dir / "changelog.jsonl"
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        import shutil
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_add_entry_appends_one_line(self):
+        """Test that each entry is appended as its own line."""
+        manager = ChangelogManager(self.changelog_file)
+        manager.add_entry('stream_check', {'success': True})
+        manager.add_entry('stream_check', {'success': True})
+
+        lines = self.changelog_file.read_text().splitlines()
+        self.assertEqual(len(lines), 2)
+        self.assertEqual(json.loads(lines[1])['action'], 'stream_check')
+        self.assertEqual(len(ChangelogManager(self.changelog_file).get_recent_entries()), 2)
+
+    def test_entries_added_after_first_read_are_returned(self):
+        """Test that the in-memory entries stay in sync with appends."""
+        manager = ChangelogManager(self.changelog_file)
+        self.assertEqual(manager.get_recent_entries(), [])
+
+        manager.add_entry('stream_check', {'success': True})
+
+        self.assertEqual(len(manager.get_recent_entries()), 1)
+
+    def test_migrates_legacy_json_file(self):
+        """Test that a legacy changelog.json is converted and removed."""
+        legacy_file = self.temp_dir / "changelog.json"
+        legacy_file.write_text(json.dumps([_entry(), _entry()], indent=2))
+
+        manager = ChangelogManager(self.changelog_file)
+
+        self.assertFalse(legacy_file.exists())
+        self.assertEqual(len(self.changelog_file.read_text().splitlines()), 2)
+        self.assertEqual(len(manager.get_recent_entries()), 2)
+
+    def test_migrates_json_array_in_place(self):
+        """Test that a changelog file holding a JSON array is rewritten as lines."""
+        self.changelog_file.write_text(json.dumps([_entry()], indent=2))
+
+        manager = ChangelogManager(self.changelog_file)
+        manager.add_entry('stream_check', {'success': True})
+
+        self.assertEqual(len(self.changelog_file.read_text().splitlines()), 2)
+        self.assertEqual(len(manager.get_recent_entries()), 2)
+
+    def test_skips_malformed_lines(self):
+        """Test that a truncated line does not discard the rest of the history."""
+        self.changelog_file.write_text(
+            json.dumps(_entry()) + "\n" + '{"timestamp": "20' + "\n" + json.dumps(_entry()) + "\n"
+        )
+
+        manager = ChangelogManager(self.changelog_file)
+
+        self.assertEqual(len(manager.get_recent_entries()), 2)
+
+    def test_expired_entries_dropped_and_file_compacted(self):
+        """Test that entries past the retention period are dropped on load."""
+        self.changelog_file.write_text(
+            json.dumps(_entry(age_days=120)) + "\n" + json.dumps(_entry()) + "\n"
+        )
+
+        manager = ChangelogManager(self.changelog_file)
+
+        self.assertEqual(len(manager.get_recent_entries(days=365)), 1)
+        self.assertEqual(len(self.changelog_file.read_text().splitlines()), 1)
+
+    def test_retained_entries_are_bounded(self):
+        """Test that only the newest max_entries entries are kept."""
+        manager = ChangelogManager(self.changelog_file, max_entries=3)
+        for i in range(5):
+            manager.add_entry('stream_check', {'success': True, 'n': i})
+
+        reloaded = ChangelogManager(self.changelog_file, max_entries=3)
+        kept = sorted(e['details']['n'] for e in reloaded.get_recent_entries())
+
+        self.assertEqual(kept, [2, 3, 4])
+        self.assertEqual(len(self.changelog_file.read_text().splitlines()), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""
+Unit tests for how ChannelUpdateTracker persists its data.
+
+This module tests that mutations are appended by the background writer,
+that bursts of marks are coalesced, that the log is compacted, and that
+rewrites never leave a partial file behind.
+"""
+
+import unittest
+import tempfile
+import json
+from pathlib import Path
+from unittest.mock import patch
+import sys
+import os
+
+# Add backend to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from stream_checker_service import ChannelUpdateTracker
+
+
+class TestChannelUpdateTrackerPersistence(unittest.TestCase):
+    """Test batched, append-only writes of the channel update tracker."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.tracker_file = Path(self.temp_dir) / 'channel_updates.jsonl'
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        import shutil
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _read_lines(self):
+        with open(self.tracker_file) as f:
+            return [json.loads(line) for line in f]
+
+    def _reload(self):
+        tracker = ChannelUpdateTracker(self.tracker_file)
+        tracker.close()
+        return tracker
+
+    def test_file_created_on_init(self):
+        """Test that the tracker file exists right after construction."""
+        tracker = ChannelUpdateTracker(self.tracker_file)
+        tracker.close()
+
+        self.assertEqual(self._read_lines(), [{'last_global_check': None}])
+
+    def test_close_writes_pending_changes(self):
+        """Test that close() persists marks made since the last write."""
+        tracker = ChannelUpdateTracker(self.tracker_file)
+        tracker.mark_channel_updated(1, stream_count=3)
+        tracker.mark_global_check('2024-01-01T00:00:00')
+        tracker.close()
+
+        reloaded = self._reload()
+        self.assertEqual(reloaded.get_channels_needing_check(), [1])
+        self.assertEqual(reloaded.get_last_global_check(), '2024-01-01T00:00:00')
+        self.assertEqual(list(Path(self.temp_dir).glob('*.tmp')), [])
+
+    def test_existing_file_not_rewritten_on_init(self):
+        """Test that constructing a tracker over an existing file does not write it."""
+        ChannelUpdateTracker(self.tracker_file).close()
+
+        with patch.object(ChannelUpdateTracker, '_flush') as mock_flush:
+            tracker = ChannelUpdateTracker(self.tracker_file)
+
+        mock_flush.assert_not_called()
+        tracker.close()
+
+    def test_flush_writes_immediately(self):
+        """Test that flush() persists changes without stopping the writer."""
+        tracker = ChannelUpdateTracker(self.tracker_file)
+        tracker.mark_channel_updated(7, stream_count=2)
+        tracker.flush()
+
+        self.assertIn({'channel': '7', 'info': tracker.updates['channels']['7']}, self._read_lines())
+        self.assertTrue(tracker._flusher.is_alive())
+        tracker.close()
+
+    def test_burst_of_marks_coalesces(self):
+        """Test that many rapid marks result in far fewer writes."""
+        tracker = ChannelUpdateTracker(self.tracker_file)
+        with patch.object(tracker, '_flush', wraps=tracker._flush) as mock_flush:
+            for channel_id in range(100):
+                tracker.mark_channel_for_force_check(channel_id)
+            tracker.close()
+
+        self.assertLessEqual(mock_flush.call_count, 3)
+        self.assertEqual(len(self._reload().updates['channels']), 100)
+
+    def test_single_mark_appends_one_line(self):
+        """Test that changing one channel appends only that channel's record."""
+        tracker = ChannelUpdateTracker(self.tracker_file)
+        tracker.mark_channels_updated(list(range(30)))
+        tracker.flush()
+        lines_before = len(self._read_lines())
+
+        tracker.mark_channel_checked(3, checked_stream_ids=[1, 2])
+        tracker.close()
+
+        lines = self._read_lines()
+        self.assertEqual(len(lines), lines_before + 1)
+        self.assertEqual(lines[-1]['channel'], '3')
+        self.assertEqual(self._reload().get_checked_stream_ids(3), [1, 2])
+
+    def test_log_is_compacted(self):
+        """Test that repeated changes do not grow the file without bound."""
+        tracker = ChannelUpdateTracker(self.tracker_file)
+        for i in range(250):
+            tracker.mark_channel_checked(1, stream_count=i)
+            tracker.flush()
+        tracker.close()
+
+        self.assertLessEqual(len(self._read_lines()), 100)
+        self.assertEqual(self._reload().updates['channels']['1']['stream_count'], 249)
+
+    def test_failed_append_is_rewritten_on_next_write(self):
+        """Test that a failed append makes the next write compact the log."""
+        tracker = ChannelUpdateTracker(self.tracker_file)
+        tracker.mark_channel_updated(1)
+        tracker.flush()
+
+        tracker.mark_channel_updated(2)
+        with patch('stream_checker_service.os.fsync', side_effect=OSError("disk full")):
+            tracker.flush()
+        tracker.mark_channel_checked(3)
+        tracker.close()
+
+        channels = [line['channel'] for line in self._read_lines() if 'channel' in line]
+        self.assertEqual(sorted(channels), ['1', '2', '3'])
+
+    def test_failed_compaction_keeps_previous_file(self):
+        """Test that an error while rewriting leaves the old file and no temp file."""
+        tracker = ChannelUpdateTracker(self.tracker_file)
+        tracker.mark_channel_updated(1)
+        tracker.close()
+        before = self.tracker_file.read_text()
+
+        tracker.mark_channel_updated(2)
+        tracker._needs_compaction = True
+        with patch('stream_checker_service.os.fsync', side_effect=OSError("disk full")):
+            tracker._flush()
+
+        self.assertEqual(self.tracker_file.read_text(), before)
+        self.assertEqual(list(Path(self.temp_dir).glob('*.tmp')), [])
+
+    def test_pending_changes_written_on_interpreter_exit(self):
+        """Test that marks are on disk after a process exits without close()."""
+        import subprocess
+        import textwrap
+
+        backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        script = textwrap.dedent(f"""
+            import sys
+            sys.path.insert(0, {backend_dir!r})
+            from stream_checker_service import ChannelUpdateTracker
+            tracker = ChannelUpdateTracker({str(self.tracker_file)!r})
+            tracker.mark_channels_updated([4, 5])
+            tracker.mark_channel_for_force_check(6)
+        """)
+        subprocess.run([sys.executable, '-c', script], check=True, timeout=30)
+
+        reloaded = self._reload()
+        self.assertEqual(sorted(reloaded.get_channels_needing_check()), [4, 5])
+        self.assertTrue(reloaded.should_force_check(6))
+
+    def test_legacy_json_is_converted(self):
+        """Test that a tracker saved as one JSON object is migrated to the log."""
+        legacy_file = self.tracker_file.with_suffix('.json')
+        with open(legacy_file, 'w') as f:
+            json.dump({
+                'channels': {'5': {'needs_check': True, 'checked_stream_ids': [9]}},
+                'last_global_check': '2024-01-01T00:00:00'
+            }, f, indent=2)
+
+        tracker = self._reload()
+
+        self.assertEqual(tracker.get_channels_needing_check(), [5])
+        self.assertEqual(tracker.get_last_global_check(), '2024-01-01T00:00:00')
+        self.assertFalse(legacy_file.exists())
+        self.assertEqual(self._reload().get_checked_stream_ids(5), [9])
+
+
+class TestChannelUpdateTrackerForceCheck(unittest.TestCase):
+    """Test the lock-free force check lookups."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.tracker_file = Path(self.temp_dir) / 'channel_updates.json'
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        import shutil
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_force_check_follows_mutations(self):
+        """Test that marking, clearing and updating a channel are reflected."""
+        tracker = ChannelUpdateTracker(self.tracker_file)
+        self.assertFalse(tracker.should_force_check(1))
+
+        tracker.mark_channel_for_force_check(1)
+        tracker.mark_channel_for_force_check(2)
+        self.assertTrue(tracker.should_force_check(1))
+
+        tracker.clear_force_check(1)
+        self.assertFalse(tracker.should_force_check(1))
+
+        # An M3U update replaces the channel record, dropping the flag
+        tracker.mark_channels_updated([2])
+        self.assertFalse(tracker.should_force_check(2))
+        tracker.close()
+
+    def test_batch_force_check(self):
+        """Test that several channels can be flagged in one call."""
+        tracker = ChannelUpdateTracker(self.tracker_file)
+        tracker.mark_channel_checked(1, checked_stream_ids=[10])
+        tracker.mark_channels_for_force_check([1, 2, 3])
+        tracker.close()
+
+        for channel_id in (1, 2, 3):
+            self.assertTrue(tracker.should_force_check(channel_id))
+        self.assertEqual(tracker.get_checked_stream_ids(1), [10])
+
+    def test_force_check_survives_reload(self):
+        """Test that force check flags are read back from disk."""
+        tracker = ChannelUpdateTracker(self.tracker_file)
+        tracker.mark_channel_for_force_check(5)
+        tracker.close()
+
+        reloaded = ChannelUpdateTracker(self.tracker_file)
+        reloaded.close()
+        self.assertTrue(reloaded.should_force_check(5))
+
+
+if __name__ == '__main__':
+    unittest.main()
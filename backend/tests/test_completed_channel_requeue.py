@@ -119,6 +119,8 @@ class TestCompletedChannelRequeue(unittest.TestCase):
             status = queue.get_status()
             self.assertEqual(status['queued'], 1, "Channel should be in queue again")
             self.assertEqual(status['completed'], 0, "Channel should no longer be in completed set")
+            
+            tracker.close()
     
     def test_integration_without_fix_channels_cannot_be_requeued(self):
         """Integration test showing the problem WITHOUT the fix (remove_from_completed not called)."""
@@ -146,6 +148,8 @@ class TestCompletedChannelRequeue(unittest.TestCase):
             status = queue.get_status()
             self.assertEqual(status['completed'], 1, "Channel still in completed set")
             self.assertEqual(status['queued'], 0, "Channel not re-queued (bug behavior)")
+            
+            tracker.close()
 
 
 if __name__ == '__main__':
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the concurrent channel stream fetches in stream discovery.
+
+This module tests that discover_and_assign_streams() fetches every
+channel's current streams, skips streams already assigned, and reuses one
+post-assignment fetch for the optional verification. It also covers the
+automation cycle that runs discovery.
+"""
+
+import unittest
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+import sys
+import os
+
+# Add backend to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from automated_stream_manager import AutomatedStreamManager
+
+
+class TestDiscoveryChannelFetch(unittest.TestCase):
+    """Test channel stream fetching during discovery."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        import shutil
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _run_discovery(self, verify_assignments, extra_streams=()):
+        """Run discovery against two channels and return (result, bulk mock, fetched URLs)."""
+        fetched = []
+
+        def fake_fetch(url):
+            fetched.append(url)
+            if url.endswith('/channels/channels/'):
+                return [{'id': 10, 'name': 'CNN'}, {'id': 20, 'name': 'ESPN'}]
+            if url.endswith('/channels/10/streams/'):
+                return [{'id': 1}] if len(fetched) <= 3 else [{'id': 1}, {'id': 2}]
+            return []
+
+        streams = [
+            {'id': 1, 'name': 'CNN HD'},
+            {'id': 2, 'name': 'CNN FHD'},
+            {'id': 3, 'name': 'ESPN'},
+        ] + list(extra_streams)
+
+        with patch('automated_stream_manager.CONFIG_DIR', Path(self.temp_dir)), \
+             patch('automated_stream_manager._get_base_url', return_value='http://test.com'), \
+             patch('automated_stream_manager.get_m3u_accounts', return_value=None), \
+             patch('automated_stream_manager.get_streams', return_value=streams), \
+             patch('automated_stream_manager.fetch_data_from_url', side_effect=fake_fetch), \
+             patch('automated_stream_manager.bulk_add_streams_to_channels') as mock_bulk_add:
+            mock_bulk_add.side_effect = lambda mapping: {cid: len(ids) for cid, ids in mapping.items()}
+
+            manager = AutomatedStreamManager()
+            manager.config['verify_assignments'] = verify_assignments
+            manager.regex_matcher.add_channel_pattern('10', 'CNN', ['CNN'])
+            manager.regex_matcher.add_channel_pattern('20', 'ESPN', ['ESPN'])
+
+            result = manager.discover_and_assign_streams()
+
+        return result, mock_bulk_add, fetched
+
+    def test_fetches_each_channel_and_skips_existing(self):
+        """Test that existing channel streams are fetched and not reassigned."""
+        result, mock_bulk_add, fetched = self._run_discovery(verify_assignments=False)
+
+        mock_bulk_add.assert_called_once_with({10: [2], 20: [3]})
+        self.assertEqual(result, {'10': 1, '20': 1})
+        # One channel list and two stream lists; no verification requests
+        self.assertEqual(len(fetched), 3)
+
+    def test_duplicate_streams_assigned_once(self):
+        """Test that a stream listed twice is only sent once per channel."""
+        result, mock_bulk_add, _ = self._run_discovery(
+            verify_assignments=False, extra_streams=[{'id': 3, 'name': 'ESPN'}]
+        )
+
+        mock_bulk_add.assert_called_once_with({10: [2], 20: [3]})
+        self.assertEqual(result, {'10': 1, '20': 1})
+
+    def test_verification_refetches_changed_channels(self):
+        """Test that enabling verification re-fetches each changed channel once."""
+        result, _, fetched = self._run_discovery(verify_assignments=True)
+
+        self.assertEqual(result, {'10': 1, '20': 1})
+        self.assertEqual(len(fetched), 5)
+
+    def test_no_enabled_patterns_makes_no_requests(self):
+        """Test that discovery returns before any API call without enabled patterns."""
+        with patch('automated_stream_manager.CONFIG_DIR', Path(self.temp_dir)), \
+             patch('automated_stream_manager.get_streams') as mock_streams, \
+             patch('automated_stream_manager.fetch_data_from_url') as mock_fetch:
+            manager = AutomatedStreamManager()
+            manager.regex_matcher.add_channel_pattern('10', 'CNN', ['CNN'], enabled=False)
+
+            self.assertEqual(manager.discover_and_assign_streams(), {})
+
+        mock_streams.assert_not_called()
+        mock_fetch.assert_not_called()
+
+    def test_cycle_passes_one_timestamp_to_both_phases(self):
+        """Test that refresh and discovery share the cycle start time."""
+        with patch('automated_stream_manager.CONFIG_DIR', Path(self.temp_dir)):
+            manager = AutomatedStreamManager()
+            with patch.object(manager._stop_event, 'wait', return_value=False), \
+                 patch.object(manager, 'refresh_playlists', return_value=True) as mock_refresh, \
+                 patch.object(manager, 'discover_and_assign_streams', return_value={}) as mock_discover:
+                manager.run_automation_cycle()
+
+        now = mock_refresh.call_args[1]['now']
+        self.assertIsNotNone(now)
+        self.assertIs(mock_discover.call_args[1]['now'], now)
+
+    def test_cycle_marks_channels_once(self):
+        """Test that channels from both phases are merged into one stream checker notification."""
+        def fake_refresh(now=None, channel_marks=None):
+            channel_marks.update({1: 3, 2: None})
+            return True
+
+        def fake_discover(now=None, channel_marks=None):
+            channel_marks.update({1: 5})
+            return {'1': 2}
+
+        with patch('automated_stream_manager.CONFIG_DIR', Path(self.temp_dir)):
+            manager = AutomatedStreamManager()
+            with patch.object(manager._stop_event, 'wait', return_value=False), \
+                 patch.object(manager, 'refresh_playlists', side_effect=fake_refresh), \
+                 patch.object(manager, 'discover_and_assign_streams', side_effect=fake_discover), \
+                 patch.object(manager, '_mark_channels_for_checking') as mock_mark:
+                manager.run_automation_cycle()
+
+        mock_mark.assert_called_once_with({1: 5, 2: None})
+
+    def test_stop_during_wait_still_marks_refreshed_channels(self):
+        """Test that channels collected by the refresh are marked when a stop cuts the cycle short."""
+        def fake_refresh(now=None, channel_marks=None):
+            channel_marks.update({1: 3})
+            return True
+
+        with patch('automated_stream_manager.CONFIG_DIR', Path(self.temp_dir)):
+            manager = AutomatedStreamManager()
+            manager._stop_event.set()
+            with patch.object(manager, 'refresh_playlists', side_effect=fake_refresh), \
+                 patch.object(manager, 'discover_and_assign_streams') as mock_discover, \
+                 patch.object(manager, '_mark_channels_for_checking') as mock_mark:
+                manager.run_automation_cycle()
+
+        mock_discover.assert_not_called()
+        mock_mark.assert_called_once_with({1: 3})
+
+    def test_stop_wakes_automation_loop(self):
+        """Test that stopping automation does not wait out the loop's sleep."""
+        import time
+
+        with patch('automated_stream_manager.CONFIG_DIR', Path(self.temp_dir)):
+            manager = AutomatedStreamManager()
+            with patch.object(manager, 'run_automation_cycle'):
+                manager.start_automation()
+                start = time.monotonic()
+                manager.stop_automation()
+
+        self.assertLess(time.monotonic() - start, 2)
+        self.assertFalse(manager.automation_thread.is_alive())
+
+    def test_failing_cycles_back_off(self):
+        """Test that consecutive failing cycles wait exponentially longer, capped at 15 minutes."""
+        waits = []
+
+        with patch('automated_stream_manager.CONFIG_DIR', Path(self.temp_dir)):
+            manager = AutomatedStreamManager()
+
+            def fake_wait(timeout):
+                waits.append(timeout)
+                return len(waits) >= 6
+
+            with patch.object(manager, 'run_automation_cycle', side_effect=RuntimeError("boom")), \
+                 patch.object(manager._stop_event, 'wait', side_effect=fake_wait):
+                manager.start_automation()
+                manager.automation_thread.join(timeout=5)
+
+        self.assertEqual(waits, [120, 240, 480, 900, 900, 900])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Unit tests for fetch_streams_by_ids() in api_utils.
+
+This module tests that stream IDs are posted to the by-ids endpoint in
+chunks and that a failed request reports the lookup as unavailable.
+"""
+
+import unittest
+from unittest.mock import Mock, patch
+import sys
+import os
+
+import requests
+
+# Add backend to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class TestFetchStreamsByIds(unittest.TestCase):
+    """Test the batched stream lookup."""
+
+    @patch('api_utils._get_base_url', return_value='http://test.com')
+    @patch('api_utils.post_request')
+    def test_ids_are_posted_in_chunks(self, mock_post, mock_base):
+        """Test that IDs are split into chunks and results are concatenated."""
+        from api_utils import fetch_streams_by_ids
+        import orjson
+
+        mock_post.side_effect = lambda url, payload: Mock(
+            content=orjson.dumps([{'id': i} for i in payload['ids']])
+        )
+
+        streams = fetch_streams_by_ids(list(range(5)), chunk_size=2)
+
+        self.assertEqual([s['id'] for s in streams], [0, 1, 2, 3, 4])
+        self.assertEqual(mock_post.call_count, 3)
+        self.assertEqual(mock_post.call_args_list[0][0],
+                         ('http://test.com/api/channels/streams/by-ids/', {'ids': [0, 1]}))
+
+    @patch('api_utils._get_base_url', return_value='http://test.com')
+    @patch('api_utils.post_request')
+    def test_missing_endpoint_returns_none(self, mock_post, mock_base):
+        """Test that an HTTP error (e.g. 404 on older versions) returns None."""
+        from api_utils import fetch_streams_by_ids
+
+        mock_post.side_effect = requests.exceptions.HTTPError("404 Not Found")
+
+        self.assertIsNone(fetch_streams_by_ids([1, 2]))
+
+
+if __name__ == '__main__':
+    unittest.main()
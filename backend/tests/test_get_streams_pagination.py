@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the parallel pagination in get_streams().
+
+This module tests that get_streams() fetches the remaining pages
+concurrently once the total count is known, and falls back to following
+the ``next`` links when it is not.
+"""
+
+import unittest
+from unittest.mock import patch
+import sys
+import os
+
+# Add backend to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class TestGetStreamsPagination(unittest.TestCase):
+    """Test the pagination strategies of get_streams()."""
+
+    @patch('api_utils._get_base_url', return_value='http://test.com')
+    @patch('api_utils.fetch_data_from_url')
+    def test_fetches_remaining_pages_by_number_in_order(self, mock_fetch, mock_base):
+        """Test that pages 2..N are requested by number and results keep page order."""
+        from api_utils import get_streams
+
+        def fake_fetch(url):
+            if 'page=' not in url:
+                return {'count': 250, 'next': url + '&page=2',
+                        'results': [{'id': i} for i in range(100)]}
+            page = int(url.rsplit('page=', 1)[1])
+            start = (page - 1) * 100
+            end = min(start + 100, 250)
+            return {'count': 250, 'results': [{'id': i} for i in range(start, end)]}
+
+        mock_fetch.side_effect = fake_fetch
+
+        streams = get_streams(log_result=False)
+
+        self.assertEqual([s['id'] for s in streams], list(range(250)))
+        self.assertEqual(mock_fetch.call_count, 3)
+        requested = sorted(c[0][0] for c in mock_fetch.call_args_list)
+        self.assertTrue(requested[1].endswith('&page=2'))
+        self.assertTrue(requested[2].endswith('&page=3'))
+
+    @patch('api_utils._get_base_url', return_value='http://test.com')
+    @patch('api_utils.fetch_data_from_url')
+    def test_follows_next_links_without_count(self, mock_fetch, mock_base):
+        """Test that next links are followed serially when count is missing."""
+        from api_utils import get_streams
+
+        mock_fetch.side_effect = [
+            {'results': [{'id': 1}], 'next': 'http://test.com/next-page'},
+            {'results': [{'id': 2}], 'next': None},
+        ]
+
+        streams = get_streams(log_result=False)
+
+        self.assertEqual([s['id'] for s in streams], [1, 2])
+        self.assertEqual(mock_fetch.call_args_list[1][0][0], 'http://test.com/next-page')
+
+    @patch('api_utils._get_base_url', return_value='http://test.com')
+    @patch('api_utils.fetch_data_from_url')
+    def test_single_page_makes_one_request(self, mock_fetch, mock_base):
+        """Test that a single page response does not trigger further requests."""
+        from api_utils import get_streams
+
+        mock_fetch.return_value = {'count': 2, 'next': None,
+                                   'results': [{'id': 1}, {'id': 2}]}
+
+        streams = get_streams(log_result=False)
+
+        self.assertEqual(len(streams), 2)
+        self.assertEqual(mock_fetch.call_count, 1)
+
+    @patch('api_utils._get_base_url', return_value='http://test.com')
+    @patch('api_utils.fetch_data_from_url')
+    def test_follows_next_links_when_server_caps_page_size(self, mock_fetch, mock_base):
+        """Test that a first page smaller than requested falls back to next links."""
+        from api_utils import get_streams
+
+        mock_fetch.side_effect = [
+            {'count': 120, 'next': 'http://test.com/p2',
+             'results': [{'id': i} for i in range(50)]},
+            {'count': 120, 'next': 'http://test.com/p3',
+             'results': [{'id': i} for i in range(50, 100)]},
+            {'count': 120, 'next': None,
+             'results': [{'id': i} for i in range(100, 120)]},
+        ]
+
+        streams = get_streams(log_result=False)
+
+        self.assertEqual([s['id'] for s in streams], list(range(120)))
+        self.assertEqual(mock_fetch.call_args_list[1][0][0], 'http://test.com/p2')
+        self.assertEqual(mock_fetch.call_args_list[2][0][0], 'http://test.com/p3')
+
+    @patch('api_utils._get_base_url', return_value='http://test.com')
+    @patch('api_utils.fetch_data_from_url')
+    def test_failed_middle_page_raises(self, mock_fetch, mock_base):
+        """Test that a page failing to fetch raises instead of returning a partial list."""
+        from api_utils import get_streams
+
+        def fake_fetch(url):
+            if 'page=' not in url:
+                return {'count': 300, 'next': url + '&page=2',
+                        'results': [{'id': i} for i in range(100)]}
+            page = int(url.rsplit('page=', 1)[1])
+            if page == 2:
+                return None
+            start = (page - 1) * 100
+            return {'count': 300, 'results': [{'id': i} for i in range(start, start + 100)]}
+
+        mock_fetch.side_effect = fake_fetch
+
+        with self.assertRaises(ValueError):
+            get_streams(log_result=False)
+
+    @patch('api_utils._get_base_url', return_value='http://test.com')
+    @patch('api_utils.fetch_data_from_url')
+    def test_failed_next_link_raises(self, mock_fetch, mock_base):
+        """Test that a next link failing to fetch raises instead of stopping early."""
+        from api_utils import get_streams
+
+        mock_fetch.side_effect = [
+            {'results': [{'id': 1}], 'next': 'http://test.com/next-page'},
+            None,
+        ]
+
+        with self.assertRaises(ValueError):
+            get_streams(log_result=False)
+
+
+if __name__ == '__main__':
+    unittest.main()
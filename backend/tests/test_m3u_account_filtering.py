@@ -161,6 +161,55 @@ class TestM3UAccountConfiguration(unittest.TestCase):
             # Empty list should be stored correctly
             self.assertEqual(manager.config['enabled_m3u_accounts'], [])
 
+    @patch('automated_stream_manager.refresh_m3u_playlists')
+    @patch('automated_stream_manager.get_m3u_accounts', return_value=None)
+    @patch('api_utils.iter_streams')
+    def test_refresh_records_added_and_removed_streams(self, mock_iter, mock_get_accounts, mock_refresh):
+        """Test that the changelog entry lists streams added and removed by the refresh."""
+        mock_iter.side_effect = [
+            iter([{'id': 1, 'name': 'Kept'}, {'id': 2, 'name': 'Gone'}]),
+            iter([{'id': 1, 'name': 'Kept'}, {'id': 3, 'name': 'New'}]),
+        ]
+        
+        with patch('automated_stream_manager.CONFIG_DIR', Path(self.temp_dir)):
+            manager = AutomatedStreamManager()
+            with patch.object(manager.changelog, 'add_entry') as mock_add_entry, \
+                 patch('automated_stream_manager.fetch_data_from_url', return_value=None):
+                self.assertTrue(manager.refresh_playlists())
+            
+            details = mock_add_entry.call_args[0][1]
+            self.assertEqual(details['added_streams'], [{'id': 3, 'name': 'New'}])
+            self.assertEqual(details['removed_streams'], [{'id': 2, 'name': 'Gone'}])
+            self.assertEqual(details['total_streams'], 2)
+
+    @patch('automated_stream_manager.refresh_m3u_playlists')
+    @patch('automated_stream_manager.get_streams')
+    @patch('automated_stream_manager.get_m3u_accounts')
+    def test_failed_account_does_not_stop_others(self, mock_get_accounts, mock_get_streams, mock_refresh):
+        """Test that one account failing to refresh does not skip the remaining accounts."""
+        mock_get_accounts.return_value = [
+            {'id': 1, 'name': 'Account 1'},
+            {'id': 2, 'name': 'Account 2'},
+            {'id': 3, 'name': 'Account 3'}
+        ]
+        
+        def fake_refresh(account_id=None):
+            if account_id == 1:
+                raise RuntimeError("provider down")
+        
+        mock_refresh.side_effect = fake_refresh
+        
+        with patch('automated_stream_manager.CONFIG_DIR', Path(self.temp_dir)):
+            manager = AutomatedStreamManager()
+            manager.config['enabled_features']['changelog_tracking'] = False
+            
+            self.assertTrue(manager.refresh_playlists())
+            self.assertEqual(mock_refresh.call_count, 3)
+            
+            # Every account failing still fails the refresh
+            mock_refresh.side_effect = RuntimeError("network down")
+            self.assertFalse(manager.refresh_playlists())
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the request rate limiter in api_utils.
+
+This module tests that the token bucket spaces out requests beyond its
+burst, that a rate of 0 disables it, and that every request sent through
+_request() waits on the shared bucket.
+"""
+
+import time
+import unittest
+from unittest.mock import Mock, call, patch
+import sys
+import os
+
+# Add backend to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class TestTokenBucket(unittest.TestCase):
+    """Test the token bucket itself."""
+
+    def test_requests_beyond_burst_wait(self):
+        """Test that requests beyond the burst are spaced at the configured rate."""
+        from api_utils import _TokenBucket
+
+        bucket = _TokenBucket(20)
+        start = time.monotonic()
+        for _ in range(22):
+            bucket.acquire()
+
+        self.assertGreaterEqual(time.monotonic() - start, 0.08)
+
+    def test_zero_rate_never_waits(self):
+        """Test that a rate of 0 disables limiting."""
+        from api_utils import _TokenBucket
+
+        bucket = _TokenBucket(0)
+        with patch('api_utils.time.sleep') as mock_sleep:
+            for _ in range(100):
+                bucket.acquire()
+
+        mock_sleep.assert_not_called()
+
+
+class TestRequestRateLimit(unittest.TestCase):
+    """Test that _request() goes through the shared limiter."""
+
+    @patch('api_utils._get_auth_headers', return_value={'Authorization': 'Bearer t'})
+    @patch('api_utils._SESSION.request')
+    def test_request_acquires_before_sending(self, mock_request, mock_headers):
+        """Test that a token is taken before the request is sent."""
+        import api_utils
+
+        events = []
+        limiter = Mock()
+        limiter.acquire.side_effect = lambda: events.append('acquire')
+        mock_request.side_effect = lambda *a, **k: events.append('send') or Mock(status_code=200)
+
+        with patch.object(api_utils, '_RATE_LIMITER', limiter):
+            api_utils._request('GET', 'http://test.com/a')
+
+        self.assertEqual(events, ['acquire', 'send'])
+
+    @patch('api_utils._refresh_token', return_value='new')
+    @patch('api_utils._get_auth_headers', return_value={'Authorization': 'Bearer old'})
+    @patch('api_utils._SESSION.request')
+    def test_token_retry_acquires_again(self, mock_request, mock_headers, mock_refresh):
+        """Test that the retry after a 401 also waits on the bucket."""
+        import api_utils
+
+        limiter = Mock()
+        mock_request.side_effect = [Mock(status_code=401), Mock(status_code=200)]
+
+        with patch.object(api_utils, '_RATE_LIMITER', limiter):
+            api_utils._request('PATCH', 'http://test.com/a', json={})
+
+        self.assertEqual(limiter.acquire.call_args_list, [call(), call()])
+
+    @patch('api_utils._get_auth_headers', return_value={'Authorization': 'Bearer t'})
+    @patch('api_utils._SESSION.request')
+    def test_requests_are_throttled(self, mock_request, mock_headers):
+        """Test that requests beyond the burst are delayed by the real bucket."""
+        import api_utils
+
+        mock_request.return_value = Mock(status_code=200)
+
+        with patch.object(api_utils, '_RATE_LIMITER', api_utils._TokenBucket(20)):
+            start = time.monotonic()
+            for _ in range(22):
+                api_utils._request('GET', 'http://test.com/a')
+
+        self.assertGreaterEqual(time.monotonic() - start, 0.08)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+"""Test the literal prefilter used before running channel regexes."""
+import unittest
+import sys
+from pathlib import Path
+
+# Add backend directory to path
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from automated_stream_manager import RegexChannelMatcher, _extract_literals
+import tempfile
+import json
+
+
+class TestExtractLiterals(unittest.TestCase):
+    """Test extraction of literals every match must contain."""
+
+    def test_wildcard_wrapped_literal(self):
+        """Test that .*LITERAL.* yields the literal."""
+        self.assertEqual(_extract_literals(".*CNN.*"), ["CNN"])
+
+    def test_runs_split_on_regex_syntax(self):
+        """Test that character classes and repeats end a literal run."""
+        self.assertEqual(_extract_literals(r"^PL:\s+TVP\s+1"), ["PL:", "TVP"])
+        self.assertEqual(_extract_literals("ABC?DEF"), ["DEF"])
+
+    def test_alternation_yields_nothing(self):
+        """Test that top-level alternatives are not treated as required."""
+        self.assertEqual(_extract_literals("CNN|FOX"), [])
+
+    def test_invalid_pattern_yields_nothing(self):
+        """Test that invalid patterns are ignored."""
+        self.assertEqual(_extract_literals("[invalid"), [])
+
+
+class TestRegexLiteralPrefilter(unittest.TestCase):
+    """Test that prefiltering never changes which channels match."""
+
+    def _make_matcher(self, patterns, case_sensitive=False):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        config_file = Path(temp_dir.name) / "test_regex_config.json"
+        with open(config_file, 'w') as f:
+            json.dump({
+                "patterns": patterns,
+                "global_settings": {"case_sensitive": case_sensitive}
+            }, f)
+        return RegexChannelMatcher(config_file=config_file)
+
+    def test_matches_with_and_without_literals(self):
+        """Test channels with and without usable literals both match."""
+        matcher = self._make_matcher({
+            "1": {"name": "CNN", "regex": [".*CNN.*"], "enabled": True},
+            "2": {"name": "News", "regex": ["CNN|FOX"], "enabled": True},
+            "3": {"name": "ESPN", "regex": ["ESPN 2"], "enabled": True},
+        })
+
+        self.assertEqual(matcher.match_stream_to_channels("US: cnn HD"), ["1", "2"])
+        self.assertEqual(matcher.match_stream_to_channels("FOX"), ["2"])
+        self.assertEqual(matcher.match_stream_to_channels("espn 2"), ["3"])
+        self.assertEqual(matcher.match_stream_to_channels("BBC One"), [])
+
+    def test_case_insensitive_special_characters(self):
+        """Test that characters IGNORECASE folds onto ASCII still pass the prefilter."""
+        matcher = self._make_matcher({
+            "1": {"name": "TIVI", "regex": ["TIVI"], "enabled": True},
+        })
+
+        self.assertEqual(matcher.match_stream_to_channels("tıvı"), ["1"])
+
+    def test_case_sensitive_still_checked_by_regex(self):
+        """Test that a folded literal hit does not bypass case-sensitive matching."""
+        matcher = self._make_matcher({
+            "1": {"name": "CNN", "regex": ["CNN"], "enabled": True},
+        }, case_sensitive=True)
+
+        self.assertEqual(matcher.match_stream_to_channels("CNN HD"), ["1"])
+        self.assertEqual(matcher.match_stream_to_channels("cnn HD"), [])
+
+    def test_disabled_channels_never_match(self):
+        """Test that disabled channels are left out of matching entirely."""
+        matcher = self._make_matcher({
+            "1": {"name": "CNN", "regex": ["CNN"], "enabled": False},
+            "2": {"name": "CNN HD", "regex": ["CNN HD"], "enabled": True},
+        })
+
+        self.assertEqual(matcher.match_stream_to_channels("CNN HD"), ["2"])
+
+        matcher.add_channel_pattern("1", "CNN", ["CNN"], enabled=True)
+
+        self.assertEqual(matcher.match_stream_to_channels("CNN HD"), ["1", "2"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -283,6 +283,46 @@ class TestRegexWhitespaceMatching(unittest.TestCase):
                 matches = matcher.match_stream_to_channels(stream_name)
                 self.assertIn("4", matches, 
                              f"Stream '{stream_name}' should match channel 4")
+    
+    def test_uppercase_escape_classes_case_insensitive(self):
+        """Test that escapes like \\D keep their meaning in case-insensitive mode."""
+        patterns = self.matcher.get_patterns()
+        patterns["patterns"]["5"] = {
+            "name": "Non-digit suffix",
+            "regex": [r"^NEWS\D"],
+            "enabled": True
+        }
+        self.matcher._save_patterns(patterns)
+        
+        self.assertIn("5", self.matcher.match_stream_to_channels("news HD"))
+        self.assertNotIn("5", self.matcher.match_stream_to_channels("news24"))
+    
+    def test_saved_pattern_changes_apply_to_matching(self):
+        """Test that patterns edited and saved in place are used for matching."""
+        self.assertIn("1", self.matcher.match_stream_to_channels("PL: TVP 1 HD"))
+        
+        patterns = self.matcher.get_patterns()
+        del patterns["patterns"]["1"]
+        self.matcher._save_patterns(patterns)
+        
+        self.assertNotIn("1", self.matcher.match_stream_to_channels("PL: TVP 1 HD"))
+
+    
+    def test_multiple_patterns_per_channel_are_joined(self):
+        """Test that any of a channel's patterns matches and backreferences still work."""
+        patterns = self.matcher.get_patterns()
+        patterns["patterns"]["6"] = {
+            "name": "Joined",
+            "regex": [r"^(A)B\1$", r"^SPORT 1", r"[invalid", r"^MOVIES$"],
+            "enabled": True
+        }
+        self.matcher._save_patterns(patterns)
+        
+        for stream_name in ["aba", "Sport  1 HD", "movies"]:
+            with self.subTest(stream_name=stream_name):
+                self.assertIn("6", self.matcher.match_stream_to_channels(stream_name))
+        self.assertNotIn("6", self.matcher.match_stream_to_channels("abb"))
+        self.assertNotIn("6", self.matcher.match_stream_to_channels("movies 2"))
 
 
 if __name__ == '__main__':
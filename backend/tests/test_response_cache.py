@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the read-only response cache in api_utils.
+
+This module tests that repeated and concurrent reads of the same URL are
+collapsed into a single request and that mutating helpers evict stale
+entries.
+"""
+
+import threading
+import time
+import unittest
+from unittest.mock import patch
+import sys
+import os
+
+# Add backend to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class TestResponseCache(unittest.TestCase):
+    """Test memoization of read-only endpoints."""
+
+    def setUp(self):
+        """Start every test with an empty cache."""
+        from api_utils import cache_clear
+        cache_clear()
+
+    def tearDown(self):
+        """Leave no cached responses behind for other tests."""
+        from api_utils import cache_clear
+        cache_clear()
+
+    @patch('api_utils._get_base_url', return_value='http://test.com')
+    @patch('api_utils.fetch_data_from_url')
+    def test_repeated_reads_hit_cache(self, mock_fetch, mock_base):
+        """Test that a second read within the TTL makes no request."""
+        from api_utils import get_m3u_accounts
+
+        mock_fetch.return_value = [{'id': 1}]
+
+        self.assertEqual(get_m3u_accounts(), [{'id': 1}])
+        self.assertEqual(get_m3u_accounts(), [{'id': 1}])
+        self.assertEqual(mock_fetch.call_count, 1)
+
+    @patch('api_utils._get_base_url', return_value='http://test.com')
+    @patch('api_utils.fetch_data_from_url')
+    def test_failed_reads_are_not_cached(self, mock_fetch, mock_base):
+        """Test that a None response is retried on the next call."""
+        from api_utils import get_m3u_accounts
+
+        mock_fetch.side_effect = [None, [{'id': 1}]]
+
+        self.assertIsNone(get_m3u_accounts())
+        self.assertEqual(get_m3u_accounts(), [{'id': 1}])
+        self.assertEqual(mock_fetch.call_count, 2)
+
+    @patch('api_utils._get_base_url', return_value='http://test.com')
+    @patch('api_utils.fetch_data_from_url')
+    def test_concurrent_reads_share_one_request(self, mock_fetch, mock_base):
+        """Test that concurrent callers of the same URL share one in-flight request."""
+        from api_utils import fetch_channel_streams
+
+        def slow_fetch(url, **kwargs):
+            time.sleep(0.2)
+            return [{'id': 7}]
+
+        mock_fetch.side_effect = slow_fetch
+        results = []
+
+        threads = [
+            threading.Thread(target=lambda: results.append(fetch_channel_streams(5)))
+            for _ in range(5)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(results, [[{'id': 7}]] * 5)
+        self.assertEqual(mock_fetch.call_count, 1)
+
+    @patch('api_utils._get_base_url', return_value='http://test.com')
+    @patch('api_utils.patch_request')
+    @patch('api_utils.fetch_data_from_url')
+    def test_update_evicts_channel_streams(self, mock_fetch, mock_patch, mock_base):
+        """Test that updating a channel evicts its cached stream list."""
+        from api_utils import fetch_channel_streams, update_channel_streams
+
+        mock_fetch.side_effect = [[{'id': 1}], [{'id': 1}, {'id': 2}]]
+        mock_patch.return_value.status_code = 200
+
+        self.assertEqual(len(fetch_channel_streams(5)), 1)
+        update_channel_streams(5, [1, 2])
+        self.assertEqual(len(fetch_channel_streams(5)), 2)
+        self.assertEqual(mock_fetch.call_count, 2)
+
+
+class TestConditionalGet(unittest.TestCase):
+    """Test ETag-based conditional GETs in fetch_data_from_url."""
+
+    def setUp(self):
+        """Start every test without stored ETags."""
+        import api_utils
+        api_utils._ETAG_CACHE.clear()
+
+    def tearDown(self):
+        """Leave no stored ETags behind for other tests."""
+        import api_utils
+        api_utils._ETAG_CACHE.clear()
+
+    @patch('api_utils._get_auth_headers', return_value={'Authorization': 'Bearer t'})
+    @patch('api_utils._SESSION.request')
+    def test_not_modified_reuses_stored_body(self, mock_get, mock_headers):
+        """Test that a 304 response returns the body stored with the ETag."""
+        from unittest.mock import Mock
+        from api_utils import fetch_data_from_url
+
+        first = Mock(status_code=200, content=b'[{"id": 1}]', headers={'ETag': '"v1"'})
+        second = Mock(status_code=304, content=b'', headers={})
+        mock_get.side_effect = [first, second]
+
+        self.assertEqual(fetch_data_from_url('http://test.com/a', use_etag=True), [{'id': 1}])
+        self.assertEqual(fetch_data_from_url('http://test.com/a', use_etag=True), [{'id': 1}])
+
+        sent_headers = mock_get.call_args_list[1][1]['headers']
+        self.assertEqual(sent_headers['If-None-Match'], '"v1"')
+
+    @patch('api_utils._get_auth_headers', return_value={'Authorization': 'Bearer t'})
+    @patch('api_utils._SESSION.request')
+    def test_plain_fetch_sends_no_etag(self, mock_get, mock_headers):
+        """Test that ETags are only used when requested."""
+        from unittest.mock import Mock
+        from api_utils import fetch_data_from_url
+
+        mock_get.return_value = Mock(status_code=200, content=b'[]', headers={'ETag': '"v1"'})
+
+        fetch_data_from_url('http://test.com/b')
+        fetch_data_from_url('http://test.com/b')
+
+        self.assertNotIn('If-None-Match', mock_get.call_args_list[1][1]['headers'])
+
+    @patch('api_utils._get_auth_headers', return_value={'Authorization': 'Bearer t'})
+    @patch('api_utils._SESSION.request')
+    def test_etag_file_survives_process_restart(self, mock_get, mock_headers):
+        """Test that an ETag saved to a file is revalidated after the memory cache is gone."""
+        import tempfile
+        import shutil
+        from pathlib import Path
+        from unittest.mock import Mock
+        import api_utils
+
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir, ignore_errors=True)
+        etag_file = Path(temp_dir) / 'cache' / 'channels.json'
+
+        first = Mock(status_code=200, content=b'[{"id": 1}]', headers={'ETag': '"v1"'})
+        second = Mock(status_code=304, content=b'', headers={})
+        mock_get.side_effect = [first, second]
+
+        self.assertEqual(api_utils.fetch_data_from_url('http://test.com/c', etag_file=etag_file), [{'id': 1}])
+        api_utils._ETAG_CACHE.clear()
+        self.assertEqual(api_utils.fetch_data_from_url('http://test.com/c', etag_file=etag_file), [{'id': 1}])
+
+        sent_headers = mock_get.call_args_list[1][1]['headers']
+        self.assertEqual(sent_headers['If-None-Match'], '"v1"')
+        self.assertEqual(list(etag_file.parent.glob('*.tmp')), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -230,5 +230,43 @@ class TestProgressTracking(unittest.TestCase):
                                 raise
 
 
+    @patch('stream_checker_service.update_channel_streams')
+    @patch('stream_checker_service.fetch_channel_streams')
+    @patch('stream_checker_service.fetch_data_from_url')
+    @patch('stream_checker_service._get_base_url')
+    def test_shared_url_analyzed_once(self, mock_base_url, mock_fetch_data, mock_fetch_streams, mock_update):
+        """Test that streams with the same URL are only probed once per channel."""
+        mock_base_url.return_value = "http://test:8000"
+        mock_fetch_data.return_value = {'id': 1, 'name': 'Test Channel'}
+        mock_fetch_streams.return_value = [
+            {'id': 1, 'name': 'Stream 1', 'url': 'http://test1'},
+            {'id': 2, 'name': 'Stream 2', 'url': 'http://test1'},
+            {'id': 3, 'name': 'Stream 3', 'url': 'http://test3'},
+        ]
+
+        def fake_analyze(row, **kwargs):
+            row.update({'resolution': '1920x1080', 'fps': 30, 'bitrate_kbps': 5000, 'status': 'OK'})
+            return row
+
+        with patch('stream_checker_service.CONFIG_DIR', Path(self.temp_dir)):
+            service = StreamCheckerService()
+
+            with patch('importlib.util.spec_from_file_location') as mock_spec:
+                mock_module = MagicMock()
+                mock_module._analyze_stream_task = MagicMock(side_effect=fake_analyze)
+                mock_module.load_config = MagicMock(return_value={})
+                mock_spec.return_value.loader.exec_module = MagicMock()
+
+                with patch('importlib.util.module_from_spec', return_value=mock_module):
+                    with patch.object(service, '_update_stream_stats', return_value=True) as mock_stats:
+                        service._check_channel(1)
+
+        self.assertEqual(mock_module._analyze_stream_task.call_count, 2)
+        updated = [call[0][0] for call in mock_stats.call_args_list]
+        self.assertEqual(sorted(row['stream_id'] for row in updated), [1, 2, 3])
+        self.assertEqual(next(row for row in updated if row['stream_id'] == 2)['resolution'], '1920x1080')
+        self.assertEqual(sorted(mock_update.call_args_list[0][0][1]), [1, 2, 3])
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -17,19 +17,32 @@ import sys
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 
+def _make_jwt(exp):
+    """Build an unsigned JWT-shaped token carrying the given exp claim."""
+    import base64
+    import json
+    claims = json.dumps({'exp': int(exp)}).encode()
+    payload = base64.urlsafe_b64encode(claims).decode().rstrip('=')
+    return f"header.{payload}.signature"
+
+
 class TestTokenValidation(unittest.TestCase):
     """Test token validation and caching functionality."""
     
     def setUp(self):
         """Set up test fixtures."""
         self.temp_dir = tempfile.mkdtemp()
+        from api_utils import _invalidate_auth_cache
+        _invalidate_auth_cache()
         
     def tearDown(self):
         """Clean up test fixtures."""
         import shutil
         shutil.rmtree(self.temp_dir, ignore_errors=True)
+        from api_utils import _invalidate_auth_cache
+        _invalidate_auth_cache()
     
-    @patch('api_utils.requests.get')
+    @patch('api_utils._SESSION.get')
     @patch('api_utils.os.getenv')
     def test_validate_token_with_valid_token(self, mock_getenv, mock_get):
         """Test that _validate_token returns True for valid tokens."""
@@ -55,7 +68,7 @@ class TestTokenValidation(unittest.TestCase):
         self.assertIn('Authorization', call_args[1]['headers'])
         self.assertEqual(call_args[1]['headers']['Authorization'], 'Bearer valid_token_123')
     
-    @patch('api_utils.requests.get')
+    @patch('api_utils._SESSION.get')
     @patch('api_utils.os.getenv')
     def test_validate_token_with_invalid_token(self, mock_getenv, mock_get):
         """Test that _validate_token returns False for invalid tokens."""
@@ -74,7 +87,7 @@ class TestTokenValidation(unittest.TestCase):
         result = _validate_token('invalid_token')
         self.assertFalse(result)
     
-    @patch('api_utils.requests.get')
+    @patch('api_utils._SESSION.get')
     @patch('api_utils.os.getenv')
     def test_validate_token_with_connection_error(self, mock_getenv, mock_get):
         """Test that _validate_token returns False on connection error."""
@@ -146,7 +159,144 @@ class TestTokenValidation(unittest.TestCase):
         
         # Verify new token is used
         self.assertEqual(headers['Authorization'], 'Bearer new_valid_token')
+    
+    @patch('api_utils._validate_token')
+    @patch('api_utils.login')
+    @patch('api_utils.os.getenv')
+    def test_get_auth_headers_caches_validated_token(self, mock_getenv, mock_login, mock_validate):
+        """Test that repeated calls reuse cached headers without re-validating."""
+        from api_utils import _get_auth_headers
+        
+        mock_getenv.return_value = 'valid_token_123'
+        mock_validate.return_value = True
+        
+        first = _get_auth_headers()
+        second = _get_auth_headers()
+        
+        self.assertEqual(first, second)
+        mock_validate.assert_called_once_with('valid_token_123')
+        mock_login.assert_not_called()
+    
+    @patch('api_utils._validate_token')
+    @patch('api_utils.login')
+    @patch('api_utils.os.getenv')
+    def test_get_auth_headers_trusts_unexpired_jwt(self, mock_getenv, mock_login, mock_validate):
+        """Test that an unexpired JWT is used without a validation request."""
+        import time
+        from api_utils import _get_auth_headers
+        
+        token = _make_jwt(time.time() + 3600)
+        mock_getenv.return_value = token
+        
+        headers = _get_auth_headers()
+        
+        self.assertEqual(headers['Authorization'], f'Bearer {token}')
+        mock_validate.assert_not_called()
+        mock_login.assert_not_called()
+    
+    @patch('api_utils._refresh_token')
+    @patch('api_utils.os.getenv')
+    def test_get_auth_headers_refreshes_jwt_before_expiry(self, mock_getenv, mock_refresh):
+        """Test that a JWT about to expire is refreshed before it is used."""
+        import time
+        import api_utils
+        
+        old_token = _make_jwt(time.time() + 10)
+        new_token = _make_jwt(time.time() + 3600)
+        mock_getenv.return_value = old_token
+        
+        mock_refresh.return_value = new_token
+        
+        headers = api_utils._get_auth_headers()
+        
+        mock_refresh.assert_called_once()
+        self.assertEqual(headers['Authorization'], f'Bearer {new_token}')
+    
+    @patch('api_utils._refresh_token')
+    @patch('api_utils.os.getenv')
+    def test_get_auth_headers_keeps_token_when_proactive_refresh_fails(self, mock_getenv, mock_refresh):
+        """Test that a still-valid JWT is used if the proactive refresh fails."""
+        import time
+        from api_utils import _get_auth_headers
+        
+        token = _make_jwt(time.time() + 10)
+        mock_getenv.return_value = token
+        mock_refresh.return_value = None
+        
+        headers = _get_auth_headers()
+        
+        self.assertEqual(headers['Authorization'], f'Bearer {token}')
 
+    
+    @patch('api_utils.login')
+    def test_concurrent_refreshes_log_in_once(self, mock_login):
+        """Test that simultaneous 401 refreshes are coalesced into one login."""
+        import threading
+        import time
+        import api_utils
+        
+        def slow_login():
+            time.sleep(0.2)
+            os.environ['DISPATCHARR_TOKEN'] = 'refreshed_token'
+            api_utils._cache_auth_headers('refreshed_token')
+            return True
+        mock_login.side_effect = slow_login
+        
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(api_utils._refresh_token()))
+            for _ in range(4)
+        ]
+        try:
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+        finally:
+            os.environ.pop('DISPATCHARR_TOKEN', None)
+        
+        self.assertEqual(results, ['refreshed_token'] * 4)
+        mock_login.assert_called_once()
+    
+    @patch('api_utils.set_key')
+    @patch('api_utils.env_path')
+    @patch('api_utils._SESSION.post')
+    def test_login_skips_env_write_for_unchanged_token(self, mock_post, mock_env_path, mock_set_key):
+        """Test that .env is only rewritten when the token value changes."""
+        from api_utils import login
+        
+        mock_env_path.exists.return_value = True
+        mock_post.return_value.content = b'{"access": "same_token"}'
+        env = {
+            'DISPATCHARR_USER': 'user',
+            'DISPATCHARR_PASS': 'pass',
+            'DISPATCHARR_BASE_URL': 'http://test.com',
+            'DISPATCHARR_TOKEN': 'same_token',
+        }
+        with patch.dict(os.environ, env):
+            self.assertTrue(login())
+        
+        mock_set_key.assert_not_called()
+    
+    @patch('api_utils._refresh_token')
+    @patch('api_utils._get_auth_headers')
+    @patch('api_utils._SESSION.request')
+    def test_request_retries_once_with_refreshed_token(self, mock_request, mock_headers, mock_refresh):
+        """Test that a 401 triggers one refresh and a retry with the new token."""
+        from api_utils import _request
+        
+        mock_headers.return_value = {'Authorization': 'Bearer old_token'}
+        mock_refresh.return_value = 'new_token'
+        unauthorized = Mock(status_code=401)
+        ok = Mock(status_code=200)
+        mock_request.side_effect = [unauthorized, ok]
+        
+        resp = _request('PATCH', 'http://test.com/api/x/', data=b'{}')
+        
+        self.assertIs(resp, ok)
+        mock_refresh.assert_called_once()
+        retry_headers = mock_request.call_args_list[1][1]['headers']
+        self.assertEqual(retry_headers['Authorization'], 'Bearer new_token')
 
 class TestProgressTracking(unittest.TestCase):
     """Test detailed progress tracking functionality."""
@@ -9,6 +9,9 @@ the automated stream management system.
 import json
 import logging
 import os
+import re
+import signal
+import sys
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, Any
@@ -22,26 +25,21 @@ from stream_checker_service import get_stream_checker_service
 
 
 
+# HTTP request/response indicators, matched in a single case-insensitive scan
+_HTTP_LOG_RE = re.compile(
+    r'http request|http response|status code'
+    r'|(?:get|post|put|delete|patch) /'
+    r'|" with'
+    r'|- - \['  # Common HTTP access log format
+    r'|werkzeug',
+    re.IGNORECASE
+)
+
 # Custom logging filter to exclude HTTP-related logs
 class HTTPLogFilter(logging.Filter):
     """Filter out HTTP-related log messages."""
     def filter(self, record):
-        # Exclude messages containing HTTP request/response indicators
-        message = record.getMessage().lower()
-        http_indicators = [
-            'http request',
-            'http response',
-            'status code',
-            'get /',
-            'post /',
-            'put /',
-            'delete /',
-            'patch /',
-            '" with',
-            '- - [',  # Common HTTP access log format
-            'werkzeug',
-        ]
-        return not any(indicator in message for indicator in http_indicators)
+        return _HTTP_LOG_RE.search(record.getMessage()) is None
 
 # Setup logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -1153,4 +1151,19 @@ if __name__ == '__main__':
     except Exception as e:
         logging.error(f"Failed to auto-start automation service: {e}")
     
+    def handle_sigterm(signum, frame):
+        """Stop the services and exit so pending state is written."""
+        # atexit handlers do not run when SIGTERM kills the process, so it
+        # is turned into a normal exit after stopping the stream checker
+        logging.info("Received SIGTERM, shutting down...")
+        try:
+            service = get_stream_checker_service()
+            if service.running:
+                service.stop()
+        except Exception as e:
+            logging.error(f"Failed to stop stream checker service on shutdown: {e}")
+        sys.exit(0)
+    
+    signal.signal(signal.SIGTERM, handle_sigterm)
+    
     app.run(host=args.host, port=args.port, debug=args.debug)
\ No newline at end of file